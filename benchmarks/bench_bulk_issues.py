@@ -0,0 +1,82 @@
+"""Import a backlog of issues: one create_issue call each vs create_issues_bulk.
+
+Each run imports into a fresh repository of the fake API. The bulk tool is
+then run again on the same backlog to show that nothing is duplicated, and
+once more from a CSV file with half of the issues already there.
+
+    python -m benchmarks.bench_bulk_issues --issues 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import csv
+import os
+import tempfile
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+
+def report(label, elapsed, created, requests):
+    print(f"{label:<34}{elapsed:8.2f} s{created / elapsed if elapsed else 0:10.1f}/s{created:>9}{requests:>10}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    parser.add_argument("--write-interval", default="0", help="GITHUB_WRITE_INTERVAL (GitHub suggests 1s)")
+    args = parser.parse_args()
+    os.environ["GITHUB_WRITE_INTERVAL"] = args.write_interval
+
+    backlog = [{"title": f"Backlog item {i}", "body": f"Imported item {i}"} for i in range(args.issues)]
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeGitHubServer(latency=args.latency, repo_count=6, issues_per_repo=0) as fake:
+        use_fake_github(fake.url)
+        from src.mcp_server import GitHubMCPServer
+        with quiet():
+            # The CSV run names a local file, which only the local CLI may do
+            server = GitHubMCPServer(local_files=True)
+            server.github_client.login
+
+        async def timed(label, repo, coro_fn):
+            before = fake.state.request_count
+            start = time.perf_counter()
+            created = await coro_fn()
+            report(label, time.perf_counter() - start, created, fake.state.request_count - before)
+
+        async def one_by_one():
+            results = await asyncio.gather(*(
+                server.call_tool("create_issue", {"repo_name": "repo-0", **issue}) for issue in backlog
+            ))
+            return sum(1 for result in results if result["success"])
+
+        def bulk(repo, **source):
+            async def run():
+                result = await server.call_tool("create_issues_bulk", {"repo_name": repo, **source})
+                assert result["failed"] == 0, result.get("error")
+                return result["created"]
+            return run
+
+        print(f"{args.issues} issues, {args.latency * 1000:.0f} ms fake API latency, "
+              f"write interval {args.write_interval}s\n")
+        print(f"{'run':<34}{'time':>10}{'rate':>12}{'created':>9}{'requests':>10}")
+        await timed("create_issue x N (before)", "repo-0", one_by_one)
+        await timed("create_issues_bulk", "repo-1", bulk("repo-1", issues=backlog))
+        await timed("same import again", "repo-1", bulk("repo-1", issues=backlog))
+
+        path = os.path.join(tmp, "backlog.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["title", "body"])
+            writer.writeheader()
+            writer.writerows(backlog)
+        with quiet():
+            await server.call_tool("create_issues_bulk", {"repo_name": "repo-4", "issues": backlog[: args.issues // 2]})
+        await timed("from CSV, half already created", "repo-4", bulk("repo-4", path=path))
+        titles = [issue["title"] for issue in fake.state.issues["repo-4"]]
+        print(f"\nrepo-4 holds {len(titles)} issues, {len(titles) - len(set(titles))} duplicates")
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
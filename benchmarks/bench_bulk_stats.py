@@ -0,0 +1,72 @@
+"""Stats for every repository: get_bulk_repository_stats vs one get_repository_stats per repo.
+
+The per-repo path lists the repositories and then requests each one's stats
+concurrently through the tool pool. The bulk tool is measured over GraphQL
+(listing all repos and by name) and with GraphQL disabled, i.e. its REST
+fallback.
+
+    python -m benchmarks.bench_bulk_stats --repos 500 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+
+async def per_repo(server, names):
+    listing = await server.call_tool("list_repositories", {"limit": len(names), "per_page": 100})
+    results = await asyncio.gather(*(
+        server.call_tool("get_repository_stats", {"repo_name": repo["name"]})
+        for repo in listing["repositories"]
+    ))
+    return len(results)
+
+
+async def bulk_all(server, names):
+    return (await server.call_tool("get_bulk_repository_stats", {}))["count"]
+
+
+async def bulk_named(server, names):
+    return (await server.call_tool("get_bulk_repository_stats", {"repo_names": names}))["count"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repos", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    args = parser.parse_args()
+
+    with FakeGitHubServer(latency=args.latency, repo_count=args.repos, issues_per_repo=0) as fake:
+        use_fake_github(fake.url)
+        from src.mcp_server import GitHubMCPServer
+
+        with quiet():
+            server = GitHubMCPServer()
+            server.github_client.login
+        names = sorted(fake.state.repos)
+
+        print(f"{args.repos} repositories, {args.latency * 1000:.0f} ms fake API latency")
+        runs = [
+            ("per-repo REST (before)", per_repo, True),
+            ("bulk, GraphQL", bulk_all, True),
+            ("bulk by name, GraphQL", bulk_named, True),
+            ("bulk, REST fallback", bulk_all, False),
+            ("bulk by name, REST fallback", bulk_named, False),
+        ]
+        for label, runner, graphql in runs:
+            fake.state.graphql_enabled = graphql
+            server.github_client.repo_cache.clear()
+            before = fake.state.request_count
+            with quiet():
+                start = time.perf_counter()
+                count = await runner(server, names)
+                elapsed = time.perf_counter() - start
+            requests = fake.state.request_count - before
+            print(f"{label:<30} {elapsed:7.2f} s   {requests:5d} GitHub requests   {count} repos")
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Upstream GitHub requests for bursts of identical concurrent calls, with and without coalescing.
+
+Every burst runs on a fresh server, so no cache is warm and the calls really
+are concurrent first requests. The last burst mixes create_issue calls into
+the reads to check that writes are never coalesced.
+
+    python -m benchmarks.bench_coalescing --calls 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+
+def bursts(calls):
+    return {
+        "same repo stats": [("get_repository_stats", {"repo_name": "repo-1"})] * calls,
+        "same listing": [("list_repositories", {})] * calls,
+        # Compared after validation: defaults filled in, whitespace stripped
+        "equivalent arguments": [
+            ("list_issues", {"repo_name": "repo-2"}),
+            ("list_issues", {"repo_name": " repo-2 ", "limit": 30}),
+        ] * (calls // 2),
+        "5 distinct reads": [
+            ("get_repository_stats", {"repo_name": f"repo-{i % 5}"}) for i in range(calls)
+        ],
+        "reads + writes": [
+            ("list_issues", {"repo_name": "repo-3"}) if i % 5 else
+            ("create_issue", {"repo_name": "repo-3", "title": f"Coalescing check {i}"})
+            for i in range(calls)
+        ],
+    }
+
+
+async def run_burst(calls, coalesce, fake):
+    os.environ["MCP_COALESCE_READS"] = "true" if coalesce else "false"
+    from src.mcp_server import GitHubMCPServer
+    with quiet():
+        server = GitHubMCPServer()
+        server.github_client.login
+    issues_before = sum(len(issues) for issues in fake.state.issues.values())
+    requests_before = fake.state.request_count
+    start = time.perf_counter()
+    results = await asyncio.gather(*(server.call_tool(name, arguments) for name, arguments in calls))
+    elapsed = time.perf_counter() - start
+    assert all(result["success"] for result in results), [r for r in results if not r["success"]][:1]
+    created = sum(len(issues) for issues in fake.state.issues.values()) - issues_before
+    stats = dict(server.coalesce_stats)
+    server.close()
+    return fake.state.request_count - requests_before, elapsed, created, stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50, help="concurrent calls per burst")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    args = parser.parse_args()
+
+    with FakeGitHubServer(latency=args.latency) as fake:
+        use_fake_github(fake.url)
+        print(f"{args.calls} concurrent calls per burst, {args.latency * 1000:.0f} ms fake API latency\n")
+        print(f"{'burst':<22}{'requests off':>14}{'requests on':>13}{'time off':>10}{'time on':>9}{'coalesced':>11}{'issues':>8}")
+        for label, calls in bursts(args.calls).items():
+            off_requests, off_time, off_created, _ = await run_burst(calls, False, fake)
+            on_requests, on_time, on_created, stats = await run_burst(calls, True, fake)
+            print(
+                f"{label:<22}{off_requests:>14}{on_requests:>13}{off_time:>9.2f}s{on_time:>8.2f}s"
+                f"{stats['coalesced']:>11}{f'{off_created}/{on_created}':>8}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Putting N files on a branch and opening a pull request: contents API vs commit_files_and_open_pr.
+
+The contents API baseline is what the existing tools allow: create_branch,
+one PUT /contents commit per file (they must run one after another, each
+moves the branch), then create_pull_request. commit_files_and_open_pr is run
+with small text files inlined into the tree request (the default) and with
+every file uploaded as a blob (GITHUB_COMMIT_INLINE_BYTES=0). Every tenth
+file is binary, so it always needs a blob. Each run checks that the branch
+ends up with exactly the committed files.
+
+    python -m benchmarks.bench_commit_files --sizes 1,50,500 --latency 0.05
+"""
+import argparse
+import asyncio
+import base64
+import os
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+
+def make_files(count):
+    files = []
+    for i in range(count):
+        if i % 10 == 9:
+            data = bytes(range(256)) * 4
+            files.append({"path": f"assets/image-{i}.bin", "content": base64.b64encode(data).decode(), "encoding": "base64"})
+        else:
+            files.append({"path": f"src/module_{i}.py", "content": f"# module {i}\n" + "VALUE = 1\n" * 20})
+    return files
+
+
+def expected_contents(files):
+    return {
+        file["path"]: base64.b64decode(file["content"]) if file.get("encoding") == "base64" else file["content"].encode()
+        for file in files
+    }
+
+
+async def contents_api(server, repo, branch, files):
+    await server.call_tool("create_branch", {"repo_name": repo, "branch_name": branch})
+    requester = server.github_client.github.requester
+    for file in files:
+        content = file["content"] if file.get("encoding") == "base64" else base64.b64encode(file["content"].encode()).decode()
+        await asyncio.to_thread(
+            requester.requestJsonAndCheck, "PUT", f"/repos/bench-user/{repo}/contents/{file['path']}",
+            input={"message": f"Add {file['path']}", "content": content, "branch": branch}
+        )
+    return await server.call_tool(
+        "create_pull_request", {"repo_name": repo, "title": "Add files", "head": branch, "base": "main"}
+    )
+
+
+async def commit_tool(server, repo, branch, files):
+    return await server.call_tool(
+        "commit_files_and_open_pr", {"repo_name": repo, "branch": branch, "title": "Add files", "files": files}
+    )
+
+
+async def run(fake, method, label, size, inline_bytes):
+    os.environ["GITHUB_COMMIT_INLINE_BYTES"] = str(inline_bytes)
+    from src.mcp_server import GitHubMCPServer
+    with quiet():
+        server = GitHubMCPServer()
+        server.github_client.login
+    files = make_files(size)
+    branch = f"{label.replace(' ', '-')}-{size}"
+    requests_before = fake.state.request_count
+    start = time.perf_counter()
+    result = await method(server, "repo-0", branch, files)
+    elapsed = time.perf_counter() - start
+    assert result["success"], result
+    assert fake.state.files_at("repo-0", branch) == expected_contents(files), f"{label}: wrong files on {branch}"
+    server.close()
+    return fake.state.request_count - requests_before, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,50,500")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    args = parser.parse_args()
+
+    methods = [
+        ("contents api", contents_api, 16384),
+        ("commit tool", commit_tool, 16384),
+        ("commit tool, all blobs", commit_tool, 0),
+    ]
+    with FakeGitHubServer(latency=args.latency) as fake:
+        use_fake_github(fake.url)
+        print(f"{args.latency * 1000:.0f} ms fake API latency\n")
+        print(f"{'files':>5}  {'method':<24}{'requests':>10}{'time':>9}{'time / latency':>16}")
+        for size in (int(size) for size in args.sizes.split(",")):
+            for label, method, inline_bytes in methods:
+                requests, elapsed = await run(fake, method, label, size, inline_bytes)
+                # time / latency: sequential round trips, estimated from wall time
+                print(f"{size:>5}  {label:<24}{requests:>10}{elapsed:>8.2f}s{elapsed / args.latency:>16.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
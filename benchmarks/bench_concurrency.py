@@ -0,0 +1,81 @@
+"""Concurrent tools/call throughput against a local fake GitHub API.
+
+Compares the old behaviour (tools run inline on the event loop, one after
+another) with the worker-pool dispatch in GitHubMCPServer.call_tool. Read
+coalescing is off, so every call does its own work; bench_coalescing
+measures that separately.
+
+    python -m benchmarks.bench_concurrency --requests 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import quiet, summarize, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+
+def make_requests(count):
+    tools = [
+        ("get_repository_info", {"repo_name": "repo-0"}),
+        ("get_repository_stats", {"repo_name": "repo-1"}),
+        ("list_issues", {"repo_name": "repo-2"}),
+        ("list_repositories", {}),
+    ]
+    return [
+        {"jsonrpc": "2.0", "id": i, "method": "tools/call",
+         "params": {"name": tools[i % len(tools)][0], "arguments": tools[i % len(tools)][1]}}
+        for i in range(count)
+    ]
+
+
+async def run_inline(server, requests):
+    """Baseline: execute each tool synchronously inside the coroutine"""
+    start = time.perf_counter()
+
+    async def one(request):
+        params = request["params"]
+        server.registry.get(params["name"]).run(server.github_client, params["arguments"])
+        return time.perf_counter() - start
+    return await asyncio.gather(*(one(r) for r in requests))
+
+
+async def run_pooled(server, requests):
+    start = time.perf_counter()
+
+    async def one(request):
+        await server.handle_mcp_request(request)
+        return time.perf_counter() - start
+    return await asyncio.gather(*(one(r) for r in requests))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    # The repeated calls are identical; measure dispatch, not coalescing
+    os.environ["MCP_COALESCE_READS"] = "false"
+    with FakeGitHubServer(latency=args.latency) as fake:
+        use_fake_github(fake.url)
+        from src.mcp_server import GitHubMCPServer
+
+        with quiet():
+            server = GitHubMCPServer(max_workers=args.workers)
+        requests = make_requests(args.requests)
+
+        print(f"{args.requests} concurrent tools/call, {args.latency * 1000:.0f} ms fake API latency")
+        for label, runner in [("inline (before)", run_inline), (f"pool x{args.workers} (after)", run_pooled)]:
+            with quiet():
+                start = time.perf_counter()
+                latencies = await runner(server, requests)
+                elapsed = time.perf_counter() - start
+            summarize(label, latencies, elapsed)
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
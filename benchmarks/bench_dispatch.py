@@ -0,0 +1,98 @@
+"""Micro-benchmarks of tool dispatch and argument validation, without any I/O.
+
+Tools run against a no-op client, so the numbers are the cost the registry
+adds per call: lookup + pydantic validation, the full async call_tool path
+through the worker pool, rejecting invalid arguments, and tools/list served
+from the cached payload versus rebuilding it.
+
+    python -m benchmarks.bench_dispatch --calls 20000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from src.tools import InvalidArguments, ToolRegistry, registry
+
+CALLS = [
+    ("list_repositories", {"limit": 10}),
+    ("list_issues", {"repo_name": "repo-1", "limit": "5", "cursor": 10}),
+    ("create_issue", {"repo_name": "repo-1", "title": "Bug", "body": "Fix needed"}),
+    ("create_pull_request", {"repo_name": "repo-1", "title": "PR", "head": "feature", "base": "main"}),
+    ("get_repository_stats", {"repo_name": "repo-1"}),
+]
+
+
+class NoopClient:
+    """Answers every GitHubClient method instantly"""
+
+    mirror = None
+    http_cache = None
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: {"success": True}
+
+    def get_repo_object(self, repo_name):
+        return object()
+
+
+def per_call(label, count, fn):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed / count * 1e6:8.2f} µs/call")
+
+
+def rebuild_list_payload(i):
+    fresh = ToolRegistry()
+    fresh.tools = registry.tools
+    return fresh.list_payload()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    client = NoopClient()
+
+    def dispatch(i):
+        name, parameters = CALLS[i % len(CALLS)]
+        registry.get(name).run(client, parameters)
+
+    def reject(i):
+        try:
+            registry.get("list_issues").bind({"limit": "many"})
+        except InvalidArguments:
+            pass
+
+    per_call("lookup + validate + handler", args.calls, dispatch)
+    per_call("reject invalid arguments", args.calls, reject)
+    per_call("tools/list (cached)", args.calls, lambda i: registry.list_payload())
+    per_call("tools/list (rebuilt)", args.calls, rebuild_list_payload)
+
+    use_fake_github("http://127.0.0.1:9")
+    from src.mcp_server import GitHubMCPServer
+    with quiet():
+        server = GitHubMCPServer()
+    server.github_client = client
+    # Rejected calls are logged as warnings; keep them out of the output
+    logging.getLogger("src.mcp_server").setLevel(logging.ERROR)
+    count = args.calls // 10
+    start = time.perf_counter()
+    for i in range(count):
+        name, parameters = CALLS[i % len(CALLS)]
+        await server.call_tool(name, parameters)
+    elapsed = time.perf_counter() - start
+    print(f"{'call_tool (pool hop, sequential)':<34} {elapsed / count * 1e6:8.2f} µs/call")
+    start = time.perf_counter()
+    for i in range(count):
+        await server.call_tool("list_issues", {"limit": "many"})
+    elapsed = time.perf_counter() - start
+    print(f"{'call_tool rejecting before the pool':<34} {elapsed / count * 1e6:8.2f} µs/call")
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
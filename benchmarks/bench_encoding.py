@@ -0,0 +1,81 @@
+"""Compare tools/call response encodings and reply-prompt sizes on a large list_issues result.
+
+The result of one list_issues call against the fake GitHub API is encoded
+the old way (indent=2 text block inside an ASCII-escaped envelope) and with
+each ResultEncoder style/content combination, then the reply prompt is
+built from the full result and from its projection. Prompt tokens are
+estimated at 4 characters per token.
+
+    python -m benchmarks.bench_encoding --issues 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+from src.encoding import ResultEncoder, orjson
+
+
+def old_message(result):
+    """The response as serialized before ResultEncoder"""
+    envelope = {"jsonrpc": "2.0", "id": 1, "result": {
+        "content": [{"type": "text", "text": json.dumps(result, indent=2)}],
+        "isError": not result.get("success", False)
+    }}
+    return json.dumps(envelope).encode()
+
+
+def per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with FakeGitHubServer(latency=0, repo_count=1, issues_per_repo=args.issues) as fake:
+        use_fake_github(fake.url)
+        from src.llm_interface import LLMInterface
+        from src.mcp_server import GitHubMCPServer
+        with quiet():
+            server = GitHubMCPServer()
+            result = await server.call_tool("list_issues", {"repo_name": "repo-0", "limit": args.issues})
+        server.close()
+    print(f"list_issues returned {result.get('returned')} issues\n")
+
+    baseline = old_message(result)
+    print(f"{'encoding':<26}{'bytes':>10}{'saved':>9}{'encode ms':>12}")
+    print(f"{'pretty text (before)':<26}{len(baseline):>10}{'':>9}{per_call_ms(lambda: old_message(result), args.repeat):>12.3f}")
+    styles = ["compact", "orjson"] if orjson else ["compact"]
+    for style in styles:
+        for content in ("both", "text", "structured"):
+            encoder = ResultEncoder(style=style, content=content)
+
+            def encode():
+                return encoder.encode_message({"jsonrpc": "2.0", "id": 1, "result": encoder.tool_result(result)})
+
+            size = len(encode())
+            saved = f"{(1 - size / len(baseline)) * 100:.0f}%"
+            print(f"{style + ' / ' + content:<26}{size:>10}{saved:>9}{per_call_ms(encode, args.repeat):>12.3f}")
+
+    with quiet():
+        interface = LLMInterface(backend=object())
+    full_prompt = interface._response_prompt(result, "list issues in repo-0").replace(
+        interface._prompt_result(result), json.dumps(result, indent=2)
+    )
+    projected_prompt = interface._response_prompt(result, "list issues in repo-0")
+    print(f"\n{'reply prompt':<26}{'chars':>10}{'~tokens':>9}")
+    for label, prompt in (("full result (before)", full_prompt), ("projected", projected_prompt)):
+        print(f"{label:<26}{len(prompt):>10}{len(prompt) // 4:>9}")
+    print(f"~{(len(full_prompt) - len(projected_prompt)) // 4} prompt tokens saved per reply")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""Repeated reads with the conditional HTTP cache off, in memory and on disk.
+
+Each round lists the repositories and, per repository, its info, stats, open
+issues and main branch, the way a session keeps asking about the same
+projects. Nothing changes between rounds, so with the cache on every
+repeated GET comes back as a 304 that GitHub doesn't count against the rate
+limit. The repo metadata cache is disabled to isolate the HTTP cache.
+
+    python -m benchmarks.bench_http_cache --repos 20 --issues 100 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+
+async def session_round(server, names):
+    await server.call_tool("list_repositories", {"limit": len(names), "per_page": 100})
+    for name in names:
+        await asyncio.gather(
+            server.call_tool("get_repository_info", {"repo_name": name}),
+            server.call_tool("list_issues", {"repo_name": name, "limit": 100, "per_page": 100}),
+        )
+    await asyncio.gather(*(
+        asyncio.get_running_loop().run_in_executor(None, server.github_client.get_repo_object, name)
+        for name in names
+    ))
+
+
+async def run(mode, fake, args, names):
+    os.environ["GITHUB_HTTP_CACHE"] = mode
+    from src.mcp_server import GitHubMCPServer
+    from src.metrics import metrics
+    with quiet():
+        server = GitHubMCPServer()
+        server.github_client.login
+    metrics.reset()
+    requests_before, not_modified_before = fake.state.request_count, fake.state.not_modified
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        await session_round(server, names)
+    elapsed = time.perf_counter() - start
+    wire_bytes = sum(value for (metric, _), value in metrics.counters.items() if metric == "github_response_bytes_total")
+    requests = fake.state.request_count - requests_before
+    not_modified = fake.state.not_modified - not_modified_before
+    cache = server.github_client.http_cache
+    stats = cache.snapshot() if cache else {"hit_rate": 0.0, "bytes_saved": 0}
+    print(f"{mode:<8}{elapsed:8.2f} s{requests:>10}{requests - not_modified:>10}{not_modified:>8}"
+          f"{wire_bytes / 1024:>12.0f}{stats['hit_rate'] * 100:>9.0f}%{stats['bytes_saved'] / 1024:>12.0f}")
+    server.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repos", type=int, default=20)
+    parser.add_argument("--issues", type=int, default=100, help="open issues per repository")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02, help="fake API latency in seconds")
+    args = parser.parse_args()
+
+    os.environ["GITHUB_REPO_CACHE_TTL"] = "0"
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeGitHubServer(latency=args.latency, repo_count=args.repos, issues_per_repo=args.issues) as fake:
+        use_fake_github(fake.url)
+        os.environ["GITHUB_HTTP_CACHE_PATH"] = os.path.join(tmp, "http-cache.sqlite")
+        names = sorted(fake.state.repos)
+        print(f"{args.repos} repositories x {args.issues} issues, {args.rounds} rounds, "
+              f"{args.latency * 1000:.0f} ms fake API latency\n")
+        print(f"{'cache':<8}{'time':>10}{'requests':>10}{'counted':>10}{'304s':>8}{'wire KB':>12}"
+              f"{'hit rate':>10}{'saved KB':>12}")
+        for mode in ("off", "memory", "disk"):
+            await run(mode, fake, args, names)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
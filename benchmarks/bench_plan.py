@@ -0,0 +1,60 @@
+"""Wall-clock of a multi-step plan: GitHubMCPServer.execute_plan vs running the steps serially.
+
+    python -m benchmarks.bench_plan --latency 0.1
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+PLAN = [
+    {"id": "i1", "action": "create_issue", "parameters": {"repo_name": "repo-0", "title": "A"}},
+    {"id": "i2", "action": "create_issue", "parameters": {"repo_name": "repo-0", "title": "B"}},
+    {"id": "i3", "action": "create_issue", "parameters": {"repo_name": "repo-0", "title": "C"}},
+    {"id": "s1", "action": "get_repository_stats", "parameters": {"repo_name": "repo-1"}},
+    {"id": "s2", "action": "get_repository_stats", "parameters": {"repo_name": "repo-2"}},
+    {"id": "b1", "action": "create_branch", "parameters": {"repo_name": "repo-3", "branch_name": "feature"}},
+    {"id": "p1", "action": "create_pull_request",
+     "parameters": {"repo_name": "repo-3", "title": "Feature", "head": "feature", "base": "main"},
+     "depends_on": ["b1"]},
+]
+
+
+async def run_serial(server):
+    for step in PLAN:
+        await server.call_tool(step["action"], step["parameters"])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.1, help="fake API latency in seconds")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with FakeGitHubServer(latency=args.latency) as fake:
+        use_fake_github(fake.url)
+        from src.mcp_server import GitHubMCPServer
+
+        with quiet():
+            server = GitHubMCPServer()
+
+        print(f"{len(PLAN)}-step plan, {args.latency * 1000:.0f} ms fake API latency")
+        for label, runner in [("serial", run_serial), ("execute_plan", server.execute_plan)]:
+            timings = []
+            for _ in range(args.rounds):
+                server.github_client.repo_cache.clear()
+                before = fake.state.request_count
+                with quiet():
+                    start = time.perf_counter()
+                    await (runner(server) if runner is run_serial else runner(PLAN))
+                    timings.append(time.perf_counter() - start)
+                requests = fake.state.request_count - before
+            print(f"{label:<14} best {min(timings):6.2f} s   mean {sum(timings) / len(timings):6.2f} s   "
+                  f"{requests} GitHub requests")
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""A user typing commands into the interactive mode, one blocking REPL vs the async one.
+
+The old REPL read the next line only after the previous request had finished.
+The async REPL takes the next command while earlier ones still run, so the
+session takes about as long as the typing plus the slowest request. Also
+times how quickly Ctrl-C cancels a running request.
+
+    python -m benchmarks.bench_repl --commands 6 --typing 1.0 --llm-latency 0.8
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+from benchmarks.stub_llm import StubBackend, allow_stub_llm, install_stub_backend
+
+COMMANDS = [
+    "show stats for repo-1",
+    "list issues in repo-2",
+    "get info about repo-3",
+    "list my repos",
+    "show stats for repo-4",
+    "list issues in repo-5",
+]
+
+
+async def blocking_repl(interface, commands, typing):
+    """What run_interactive_mode used to do: type, wait for the result, type the next"""
+    for command in commands:
+        await asyncio.sleep(typing)
+        await interface._run_command(command)
+
+
+async def async_repl(interface, commands, typing):
+    lines = asyncio.Queue()
+
+    async def type_commands():
+        for command in commands + ["quit"]:
+            await asyncio.sleep(typing)
+            lines.put_nowait(command)
+
+    await asyncio.gather(type_commands(), interface.run_interactive_mode(lines))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=6)
+    parser.add_argument("--typing", type=float, default=1.0, help="seconds the user takes to type each command")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="stub LLM latency per call")
+    parser.add_argument("--github-latency", type=float, default=0.05)
+    args = parser.parse_args()
+    commands = [COMMANDS[i % len(COMMANDS)] for i in range(args.commands)]
+
+    with FakeGitHubServer(latency=args.github_latency) as fake:
+        use_fake_github(fake.url)
+        allow_stub_llm()
+        from src.main import GitHubInterface
+        with quiet():
+            interface = GitHubInterface()
+            interface.warm_up()
+        install_stub_backend(interface, StubBackend(first_token_latency=args.llm_latency))
+
+        print(f"{args.commands} commands, {args.typing:.1f} s typing each, "
+              f"stub LLM {args.llm_latency * 1000:.0f} ms per call, RESPONSE_MODE={interface.response_mode}\n")
+        for label, repl in (("blocking REPL (before)", blocking_repl), ("async REPL", async_repl)):
+            start = time.perf_counter()
+            with quiet():
+                await repl(interface, commands, args.typing)
+            print(f"{label:<24}{time.perf_counter() - start:8.2f} s until the last result")
+
+        # Ctrl-C while a request is running
+        lines = asyncio.Queue()
+        with quiet():
+            repl = asyncio.create_task(interface.run_interactive_mode(lines))
+            lines.put_nowait("show stats for repo-1")
+            await asyncio.sleep(0.1)
+            start = time.perf_counter()
+            running = list(interface.running.values())
+            interface._cancel_latest(lines)
+            await asyncio.wait(running)
+            cancelled = time.perf_counter() - start
+            lines.put_nowait("quit")
+            await repl
+        print(f"{'Ctrl-C to cancelled':<24}{cancelled * 1000:8.1f} ms")
+        interface.mcp_server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
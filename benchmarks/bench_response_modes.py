@@ -0,0 +1,63 @@
+"""Time-to-first-output of each RESPONSE_MODE with a stub LLM and fake GitHub API.
+
+    python -m benchmarks.bench_response_modes --llm-latency 0.8
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import percentile, quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+from benchmarks.stub_llm import StubBackend, allow_stub_llm, install_stub_backend
+
+COMMANDS = [
+    "list my repos",
+    "show stats for repo-1",
+    "get info about repo-2",
+    "list issues in repo-3",
+]
+
+
+async def run_mode(interface, mode, raw_first, rounds):
+    interface.response_mode = mode
+    interface.raw_first = raw_first
+    first_outputs, totals = [], []
+    for _ in range(rounds):
+        for command in COMMANDS:
+            with quiet():
+                result = await interface.process_natural_language_request(command)
+                await interface.display_result(result)
+            first_outputs.append(result["time_to_first_output"])
+            totals.append(time.perf_counter() - result["started_at"])
+    return first_outputs, totals
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="stub LLM time to first token")
+    parser.add_argument("--github-latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args()
+
+    with FakeGitHubServer(latency=args.github_latency) as fake:
+        use_fake_github(fake.url)
+        allow_stub_llm()
+        from src.main import GitHubInterface
+
+        with quiet():
+            interface = GitHubInterface()
+        install_stub_backend(interface, StubBackend(first_token_latency=args.llm_latency))
+
+        print(f"stub LLM first token {args.llm_latency * 1000:.0f} ms, GitHub {args.github_latency * 1000:.0f} ms")
+        for mode, raw_first in [("llm", False), ("stream", False), ("stream", True), ("template", False)]:
+            first_outputs, totals = await run_mode(interface, mode, raw_first, args.rounds)
+            label = f"{mode}{' + raw first' if raw_first else ''}"
+            print(
+                f"{label:<20} first output p50 {percentile(first_outputs, 50) * 1000:7.1f} ms   "
+                f"complete p50 {percentile(totals, 50) * 1000:7.1f} ms"
+            )
+        interface.mcp_server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
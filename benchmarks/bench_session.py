@@ -0,0 +1,90 @@
+"""A conversation of follow-ups, with and without session context.
+
+Each turn refers to the repository or branch of earlier turns ("there",
+"that branch"). With SESSION_CONTEXT the references are filled in locally so
+the rule tier answers them; what's left goes to the LLM with a one-line
+context. Without it every follow-up is an LLM parse that can't know which
+repository is meant. Prints per-turn parse tier, parse prompt tokens (stub
+estimate, 4 characters per token) and latency against the fake APIs.
+
+    python -m benchmarks.bench_session --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+from benchmarks.stub_llm import StubBackend, allow_stub_llm, install_stub_backend
+from benchmarks.suite import DEFAULT_FIXTURE
+
+# (utterance, expected action, expected repo_name)
+CONVERSATION = [
+    ("list issues in api-gateway", "list_issues", "api-gateway"),
+    ("create an issue there titled 'Flaky login tests'", "create_issue", "api-gateway"),
+    ("create a branch called fix-login in that repo", "create_branch", "api-gateway"),
+    ("open a pr in that repo from that branch into main titled 'Fix login'", "create_pull_request", "api-gateway"),
+    ("show stats for it", "get_repository_stats", "api-gateway"),
+    ("how many stars does the repo of that pr have?", "get_repository_stats", "api-gateway"),
+]
+
+# What the LLM answers when it is given the session context
+CONTEXT_PARSES = {
+    "how many stars does the repo of that pr have?":
+        {"action": "get_repository_stats", "parameters": {"repo_name": "api-gateway"}},
+}
+
+
+def prompt_tokens():
+    from src.metrics import metrics
+    return sum(value for (metric, _), value in metrics.counters.items() if metric == "llm_prompt_tokens_total")
+
+
+async def run(session_context, args):
+    os.environ["SESSION_CONTEXT"] = "true" if session_context else "false"
+    with FakeGitHubServer(latency=args.github_latency, repo_count=0, fixture=args.fixture) as fake:
+        use_fake_github(fake.url)
+        allow_stub_llm()
+        os.environ["INTENT_CACHE_PATH"] = ""
+        from src.main import GitHubInterface
+        with quiet():
+            interface = GitHubInterface()
+            interface.response_mode = "template"
+            interface.mcp_server.github_client.login
+        install_stub_backend(interface, StubBackend(
+            first_token_latency=args.llm_latency, chunks=1, chunk_interval=0, parse_replies=CONTEXT_PARSES
+        ))
+        print(f"\nSESSION_CONTEXT={'on' if session_context else 'off'}")
+        print(f"{'turn':<72}{'tier':>7}{'tokens':>8}{'ms':>8}  ok")
+        total_tokens = total_seconds = correct = 0
+        for utterance, action, repo in CONVERSATION:
+            tokens_before = prompt_tokens()
+            start = time.perf_counter()
+            with quiet():
+                result = await interface.process_natural_language_request(utterance)
+            elapsed = time.perf_counter() - start
+            tokens = prompt_tokens() - tokens_before
+            intent = result.get("parsed_intent") or {}
+            ok = intent.get("action") == action and intent.get("parameters", {}).get("repo_name") == repo
+            tier = "llm" if tokens else "local"
+            print(f"{utterance[:70]:<72}{tier:>7}{tokens:>8}{elapsed * 1000:>8.0f}  {'✓' if ok else '✗'}")
+            total_tokens += tokens
+            total_seconds += elapsed
+            correct += ok
+        print(f"{'total':<72}{'':>7}{total_tokens:>8}{total_seconds * 1000:>8.0f}  {correct}/{len(CONVERSATION)}")
+        interface.mcp_server.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--github-latency", type=float, default=0.02)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub LLM latency per call")
+    args = parser.parse_args()
+    for session_context in (False, True):
+        await run(session_context, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""Parse prompt size and latency as the tool registry grows, with and without tool pruning.
+
+The registry is padded with synthetic tools (webhooks, releases, labels, ...)
+up to each size. Every utterance goes to the stub LLM (rules and intent cache
+off), once with every tool in the prompt (PARSE_TOOLS_TOP_K=0) and once with
+the top-k from the local TF-IDF index. Prompt tokens are the stub's estimate
+(4 characters per token); its time to first token grows with the prompt
+(--prefill), the way a real model's does. recall@k is how often the tool the
+utterance needs is among the k selected.
+
+    python -m benchmarks.bench_tool_pruning --top-k 6 --llm-latency 0.3 --prefill 0.2
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import quiet
+from benchmarks.stub_llm import StubBackend, allow_stub_llm
+from src.tools import RepoArgs, Tool, ToolArguments, ToolRegistry, registry
+
+# (utterance, tool it needs); phrasings the rule tier doesn't match
+UTTERANCES = [
+    ("what bugs are open in api-gateway right now?", "list_issues"),
+    ("how popular is the docs repo these days", "get_repository_stats"),
+    ("spin up a new repository for my notes", "create_repository"),
+    ("file a ticket in api about the login crash", "create_issue"),
+    ("open a pull request in docs from fix-typo into main", "create_pull_request"),
+    ("branch off main in api as feature-x", "create_branch"),
+    ("tell me about Face-Recognition-CNN", "get_repository_info"),
+    ("which of my repositories have the most stars", "get_bulk_repository_stats"),
+    ("import backlog.csv as issues into my-project", "create_issues_bulk"),
+    ("how much api quota is left", "get_rate_limit_status"),
+]
+
+RESOURCES = [
+    "webhook", "release", "milestone", "label", "collaborator", "deploy key", "workflow run", "secret",
+    "deployment", "team", "project board", "discussion", "package", "environment", "self-hosted runner",
+    "tag", "commit comment", "review comment", "check run", "artifact",
+]
+VERBS = ["List", "Create", "Delete", "Update", "Get"]
+
+
+def synthetic_tools(count):
+    tools = []
+    for verb in VERBS:
+        for resource in RESOURCES:
+            name = f"{verb.lower()}_{resource.replace(' ', '_').replace('-', '_')}"
+            arguments = RepoArgs if verb != "List" else ToolArguments
+            tools.append(Tool(name, f"{verb} a {resource} of a repository", arguments, lambda client, args: {}))
+    return tools[:count]
+
+
+def registry_of(size):
+    tools = ToolRegistry()
+    real = list(registry)[:size]
+    for tool in real + synthetic_tools(size - len(real)):
+        tools.tools[tool.name] = tool
+    return tools
+
+
+async def parse_all(tools, top_k, args):
+    from src.llm_interface import LLMInterface
+    from src.metrics import metrics
+    os.environ["PARSE_TOOLS_TOP_K"] = str(top_k)
+    replies = {utterance: {"action": action, "parameters": {}} for utterance, action in UTTERANCES}
+    with quiet():
+        interface = LLMInterface(
+            backend=StubBackend(first_token_latency=args.llm_latency, chunks=1, chunk_interval=0,
+                                parse_replies=replies, prefill_per_1k_tokens=args.prefill),
+            tools=tools
+        )
+    utterances = [utterance for utterance, action in UTTERANCES if action in tools]
+    tokens_before = metrics.counters.get(("llm_prompt_tokens_total", (("operation", "parse"),)), 0)
+    start = time.perf_counter()
+    for utterance in utterances:
+        await interface.parse_natural_language(utterance)
+    elapsed = time.perf_counter() - start
+    tokens = metrics.counters.get(("llm_prompt_tokens_total", (("operation", "parse"),)), 0) - tokens_before
+    return tokens / len(utterances), elapsed / len(utterances)
+
+
+def recall(tools, top_k):
+    from src.tool_index import ToolIndex
+    start = time.perf_counter()
+    index = ToolIndex(tools)
+    built = time.perf_counter() - start
+    cases = [(utterance, action) for utterance, action in UTTERANCES if action in tools]
+    start = time.perf_counter()
+    hits = sum(action in [tool.name for tool in index.select(utterance, top_k)] for utterance, action in cases)
+    lookup = (time.perf_counter() - start) / len(cases)
+    return hits, len(cases), built, lookup
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="stub LLM time to first token for an empty prompt")
+    parser.add_argument("--prefill", type=float, default=0.2, help="extra seconds per 1000 prompt tokens")
+    parser.add_argument("--sizes", default="8,12,25,50,100")
+    args = parser.parse_args()
+    allow_stub_llm()
+    os.environ["INTENT_FAST_PATH"] = "false"
+    os.environ["INTENT_CACHE_PATH"] = ""
+
+    print(f"top-k {args.top_k}, stub LLM {args.llm_latency * 1000:.0f} ms + {args.prefill * 1000:.0f} ms per 1k prompt tokens\n")
+    print(f"{'tools':>5}{'tokens all':>12}{'tokens top-k':>14}{'parse all':>11}{'parse top-k':>13}"
+          f"{'recall@k':>10}{'index build':>13}{'lookup':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        tools = registry_of(size)
+        all_tokens, all_latency = await parse_all(tools, 0, args)
+        pruned_tokens, pruned_latency = await parse_all(tools, args.top_k, args)
+        hits, cases, built, lookup = recall(tools, args.top_k)
+        print(
+            f"{size:>5}{all_tokens:>12.0f}{pruned_tokens:>14.0f}{all_latency * 1000:>9.0f}ms{pruned_latency * 1000:>11.0f}ms"
+            f"{f'{hits}/{cases}':>10}{built * 1000:>11.1f}ms{lookup * 1e6:>7.0f}µs"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""Throughput of the HTTP server with 1, 2, 4 and 8 worker processes on large listing results.
+
+The fake GitHub API and every server run in their own processes; this
+process only sends requests. Each request is a tools/call of
+list_repositories with 100 repositories, so most of the work is building,
+shaping and JSON-encoding a large result, the part a single process runs
+under one GIL. Read coalescing is off and the rate limits are lifted for
+the throughput runs, so every call does its full work.
+
+The second table checks the shared rate budget: with GITHUB_REQUESTS_PER_SECOND
+set to --rate, all workers together should reach GitHub at most that often
+(plus the bucket's burst), not once per worker.
+
+    python -m benchmarks.bench_workers --workers 1,2,4,8 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.common import summarize, use_fake_github
+
+LISTING = {"name": "list_repositories", "arguments": {"limit": 100, "per_page": 100}}
+
+
+def start_fake(latency, repos):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_github", "--latency", str(latency), "--repos", str(repos), "--issues", "0"],
+        stdout=subprocess.PIPE, text=True
+    )
+    return process, process.stdout.readline().strip()
+
+
+def start_server(port, workers, env):
+    process = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "-m", "src.transport", "--transport", "http",
+         "--port", str(port), "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"server with {workers} workers did not start")
+
+
+def stop_server(process):
+    process.terminate()
+    process.wait(timeout=30)
+
+
+async def drive(url, concurrency, seconds):
+    """Send listing calls from `concurrency` clients for `seconds`; latencies of the completed ones"""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def client(client_id):
+        # A fresh connection per client so the kernel spreads them over the workers
+        async with httpx.AsyncClient(timeout=120) as http:
+            request_id = 0
+            while time.perf_counter() < deadline:
+                request_id += 1
+                start = time.perf_counter()
+                response = await http.post(url, json={
+                    "jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": LISTING
+                }, headers={"Accept": "application/json, text/event-stream"})
+                response.raise_for_status()
+                assert "error" not in response.json(), response.json()
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def upstream_requests(fake_url):
+    return httpx.get(f"{fake_url}/_bench/stats").json()["request_count"]
+
+
+async def run(fake_url, workers, args, extra_env):
+    with tempfile.TemporaryDirectory() as state_dir:
+        env = {
+            **os.environ,
+            "GITHUB_HTTP_CACHE": "disk",
+            "GITHUB_HTTP_CACHE_PATH": os.path.join(state_dir, "http-cache.sqlite"),
+            "GITHUB_RATE_STATE_PATH": os.path.join(state_dir, "rate-state.sqlite"),
+            **extra_env,
+        }
+        server = start_server(args.port, workers, env)
+        try:
+            url = f"http://127.0.0.1:{args.port}/mcp"
+            # Every worker resolves the login and fills the shared cache first
+            await drive(url, workers * 2, 1)
+            before = upstream_requests(fake_url)
+            latencies, elapsed = await drive(url, args.concurrency, args.seconds)
+            upstream = upstream_requests(fake_url) - before
+        finally:
+            stop_server(server)
+    return latencies, elapsed, upstream
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--seconds", type=float, default=10, help="measured load per run")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--repos", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.005, help="fake API latency in seconds")
+    parser.add_argument("--rate", type=float, default=20, help="GITHUB_REQUESTS_PER_SECOND for the shared-budget check")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    fake, fake_url = start_fake(args.latency, args.repos)
+    use_fake_github(fake_url)
+    worker_counts = [int(count) for count in args.workers.split(",")]
+    try:
+        print(f"{os.cpu_count()} CPUs, {args.concurrency} clients, list_repositories x 100 repos per call\n")
+        baseline = None
+        for workers in worker_counts:
+            # Identical concurrent reads would share one execution; measure the per-call work
+            latencies, elapsed, _ = await run(fake_url, workers, args, {"MCP_COALESCE_READS": "false"})
+            throughput = len(latencies) / elapsed
+            baseline = baseline or throughput
+            summarize(f"{workers} workers (x{throughput / baseline:.2f})", latencies, elapsed)
+
+        print(f"\nshared budget: GITHUB_REQUESTS_PER_SECOND={args.rate:g}, burst 5")
+        for workers in worker_counts:
+            _, elapsed, upstream = await run(
+                fake_url, workers, args, {"GITHUB_REQUESTS_PER_SECOND": str(args.rate), "GITHUB_BURST": "5"}
+            )
+            print(f"{workers} workers: {upstream / elapsed:6.1f} GitHub requests/s ({upstream} in {elapsed:.1f} s)")
+    finally:
+        fake.terminate()
+        fake.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""Shared helpers for the benchmark scripts"""
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def use_fake_github(url):
+    """Point GitHubClient at a FakeGitHubServer instead of api.github.com.
+
+    The fake API has no rate limits, so unless overridden the scheduler's
+    pacing is lifted to measure the client itself.
+    """
+    os.environ["GITHUB_TOKEN"] = "bench-token"
+    os.environ["GITHUB_API_URL"] = url
+    os.environ.setdefault("GITHUB_REQUESTS_PER_SECOND", "10000")
+    os.environ.setdefault("GITHUB_BURST", "10000")
+    os.environ.setdefault("GITHUB_WRITE_INTERVAL", "0")
+    # Resolve the login against the fake API every run so request counts don't depend on earlier runs
+    os.environ.setdefault("GITHUB_LOGIN_CACHE_TTL", "0")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(label, latencies, elapsed):
+    """Print throughput and latency percentiles for one run"""
+    print(
+        f"{label:<28} {len(latencies) / elapsed:8.1f} req/s   "
+        f"p50 {percentile(latencies, 50) * 1000:7.1f} ms   "
+        f"p99 {percentile(latencies, 99) * 1000:7.1f} ms   "
+        f"total {elapsed:6.2f} s"
+    )
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the progress prints of the code under test"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
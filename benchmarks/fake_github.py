@@ -0,0 +1,438 @@
+"""Minimal in-process fake of the GitHub REST API used by the benchmarks.
+
+Only the endpoints that GitHubClient touches are implemented. Every request
+sleeps for ``latency`` seconds to stand in for a real network round-trip, so
+benchmarks measure how well the client overlaps I/O rather than raw CPU speed.
+"""
+import base64
+import hashlib
+import json
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LOGIN = "bench-user"
+# Commit every repository's main branch starts at, with an empty tree
+INITIAL_COMMIT = "a" * 40
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+def object_sha(kind, payload):
+    return hashlib.sha1(kind.encode() + json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class FakeGitHubState:
+    """In-memory repositories, issues and branches served by the fake API"""
+
+    def __init__(self, repo_count=5, issues_per_repo=10, fixture=None):
+        self.lock = threading.Lock()
+        self.request_count = 0
+        # Requests per Authorization header, i.e. per token
+        self.requests_by_token = {}
+        # 304 answers, which GitHub doesn't count against the rate limit
+        self.not_modified = 0
+        # Answer the next N requests with 429 + Retry-After to exercise rate-limit handling
+        self.throttle_next = 0
+        self.retry_after = 1
+        # Set to False to make /graphql answer 404, as if GraphQL were unavailable
+        self.graphql_enabled = True
+        # Every write advances this clock by a second, so updated_at/since filters are deterministic
+        self.clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.repos = {}
+        self.issues = {}
+        self.refs = {}
+        # Git database shared by all repositories: blob contents, trees as
+        # flat {path: blob sha} maps and commits
+        self.blobs = {}
+        self.trees = {EMPTY_TREE: {}}
+        self.commits = {INITIAL_COMMIT: {"tree": EMPTY_TREE, "parents": [], "message": "Initial commit"}}
+        if fixture:
+            self.load_fixture(fixture)
+        for i in range(len(self.repos), repo_count):
+            self.add_repo(f"repo-{i}")
+            for j in range(issues_per_repo):
+                self.add_issue(f"repo-{i}", f"Issue {j}")
+
+    def load_fixture(self, path):
+        """Load repositories and issues recorded by benchmarks/record_fixtures.py"""
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        for repo in fixture["repos"]:
+            fields = {key: value for key, value in repo.items() if key not in ("name", "description", "private")}
+            self.add_repo(repo["name"], repo.get("description") or "", repo.get("private", False), **fields)
+            for issue in fixture.get("issues", {}).get(repo["name"], []):
+                self.add_issue(repo["name"], issue["title"], issue.get("body") or "")
+
+    def add_repo(self, name, description="", private=False, **fields):
+        timestamp = self.tick()
+        self.repos[name] = {
+            "id": len(self.repos) + 1,
+            "name": name,
+            "full_name": f"{LOGIN}/{name}",
+            "description": description,
+            "private": private,
+            "stargazers_count": len(name),
+            "forks_count": 1,
+            "watchers_count": len(name),
+            "open_issues_count": 0,
+            "language": "Python",
+            "size": 128,
+            "default_branch": "main",
+            "created_at": timestamp,
+            "updated_at": timestamp,
+            **fields,
+        }
+        self.issues.setdefault(name, [])
+        self.refs.setdefault(name, {"main": INITIAL_COMMIT})
+        return self.repos[name]
+
+    def tick(self):
+        """Advance the fake clock and return it as a GitHub timestamp"""
+        self.clock += timedelta(seconds=1)
+        return self.clock.isoformat().replace("+00:00", "Z")
+
+    def add_issue(self, repo_name, title, body=""):
+        issues = self.issues[repo_name]
+        number = len(issues) + 1
+        timestamp = self.tick()
+        issue = {"id": number, "number": number, "title": title, "body": body, "state": "open",
+                 "created_at": timestamp, "updated_at": timestamp}
+        issues.append(issue)
+        self.repos[repo_name]["open_issues_count"] = len(issues)
+        return issue
+
+    def add_blob(self, data):
+        sha = object_sha("blob", base64.b64encode(data).decode())
+        self.blobs[sha] = data
+        return sha
+
+    def add_commit(self, tree, parents, message):
+        sha = object_sha("commit", [tree, parents, message, self.tick()])
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def files_at(self, repo_name, branch):
+        """{path: content} of a branch, for checking what a benchmark committed"""
+        tree = self.trees[self.commits[self.refs[repo_name][branch]]["tree"]]
+        return {path: self.blobs[sha] for path, sha in tree.items()}
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without this, Nagle's
+        # algorithm and delayed ACKs add ~40 ms to every response with a body
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        # Like GitHub, every token has its own budget
+        used = self.state.requests_by_token.get(self.headers.get("Authorization"), 0)
+        self.send_header("X-RateLimit-Remaining", str(max(0, 5000 - used)))
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _paginate(self, path, items, query):
+        if "since" in query:
+            items = [item for item in items if item["updated_at"] >= query["since"][0]]
+        if query.get("sort", [""])[0] == "updated":
+            items = sorted(items, key=lambda item: item["updated_at"], reverse=query.get("direction", ["desc"])[0] == "desc")
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["30"])[0])
+        last_page = max(1, -(-len(items) // per_page))
+        start = (page - 1) * per_page
+        links = []
+        if page < last_page:
+            links.append(f'<{self.base_url}{path}?per_page={per_page}&page={page + 1}>; rel="next"')
+            links.append(f'<{self.base_url}{path}?per_page={per_page}&page={last_page}>; rel="last"')
+        # Carry the filters over to the next/last links like GitHub does
+        extra = "".join(f"&{key}={value[0]}" for key, value in query.items() if key not in ("page", "per_page"))
+        links = [link.replace(">;", f"{extra}>;", 1) for link in links]
+        headers = {"Link": ", ".join(links)} if links else {}
+        self._send_conditional(items[start:start + per_page], headers)
+
+    def _send_conditional(self, payload, headers=None):
+        """200 with an ETag, or 304 when the request's If-None-Match still matches"""
+        etag = f'"{hash(json.dumps([payload, headers], sort_keys=True)) & 0xFFFFFFFF:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            with self.state.lock:
+                self.state.not_modified += 1
+            return self._send(304, headers={"ETag": etag})
+        self._send(200, payload, {**(headers or {}), "ETag": etag})
+
+    def _repo_json(self, repo):
+        url = f"{self.base_url}/repos/{LOGIN}/{repo['name']}"
+        return {
+            **repo,
+            "owner": {"login": LOGIN},
+            "url": url,
+            "html_url": f"https://github.com/{LOGIN}/{repo['name']}",
+        }
+
+    def _issue_json(self, repo_name, issue):
+        return {
+            **issue,
+            "url": f"{self.base_url}/repos/{LOGIN}/{repo_name}/issues/{issue['number']}",
+            "html_url": f"https://github.com/{LOGIN}/{repo_name}/issues/{issue['number']}",
+        }
+
+    def _graphql_repo(self, repo):
+        return {
+            "name": repo["name"],
+            "stargazerCount": repo["stargazers_count"],
+            "forkCount": repo["forks_count"],
+            "watchers": {"totalCount": repo["watchers_count"]},
+            "issues": {"totalCount": repo["open_issues_count"]},
+            "primaryLanguage": {"name": repo["language"]} if repo["language"] else None,
+            "diskUsage": repo["size"],
+            "createdAt": repo["created_at"],
+            "updatedAt": repo["updated_at"],
+        }
+
+    def _graphql(self):
+        """Answer the two query shapes GitHubClient sends, not general GraphQL"""
+        request = self._read_json()
+        query, variables = request["query"], request.get("variables") or {}
+        if not self.state.graphql_enabled:
+            return self._send(404, {"message": "Not Found"})
+
+        if "viewer" in query:
+            repos = sorted(self.state.repos.values(), key=lambda r: r["name"])
+            start = int(variables.get("after") or 0)
+            end = start + int(variables["first"])
+            return self._send(200, {"data": {"viewer": {"repositories": {
+                "nodes": [self._graphql_repo(r) for r in repos[start:end]],
+                "pageInfo": {"hasNextPage": end < len(repos), "endCursor": str(end)},
+            }}}})
+
+        data, errors = {}, []
+        for alias, name in re.findall(r'(\w+): repository\(owner: \$owner, name: "([^"]+)"\)', query):
+            repo = self.state.repos.get(name)
+            data[alias] = self._graphql_repo(repo) if repo else None
+            if not repo:
+                errors.append({
+                    "type": "NOT_FOUND",
+                    "path": [alias],
+                    "message": f"Could not resolve to a Repository with the name '{LOGIN}/{name}'.",
+                })
+        payload = {"data": data, "errors": errors} if errors else {"data": data}
+        return self._send(200, payload)
+
+    def _route(self, method):
+        if self.path == "/_bench/stats":
+            # For benchmarks running the fake in another process; not counted
+            return self._send(200, {"request_count": self.state.request_count})
+        with self.state.lock:
+            self.state.request_count += 1
+            token = self.headers.get("Authorization")
+            self.state.requests_by_token[token] = self.state.requests_by_token.get(token, 0) + 1
+            throttled = self.state.throttle_next > 0
+            if throttled:
+                self.state.throttle_next -= 1
+        time.sleep(self.server.latency)
+        if throttled:
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            return self._send(429, {"message": "API rate limit exceeded"}, {"Retry-After": str(self.state.retry_after)})
+
+        parsed = urlparse(self.path)
+        path, query = parsed.path, parse_qs(parsed.query)
+
+        if method == "POST" and path == "/graphql":
+            return self._graphql()
+
+        if method == "GET" and path == "/user":
+            return self._send_conditional({"login": LOGIN, "url": f"{self.base_url}/user"})
+
+        if path == "/user/repos":
+            if method == "POST":
+                data = self._read_json()
+                with self.state.lock:
+                    repo = self.state.add_repo(data["name"], data.get("description", ""), data.get("private", False))
+                return self._send(201, self._repo_json(repo))
+            repos = [self._repo_json(r) for r in self.state.repos.values()]
+            return self._paginate(path, repos, query)
+
+        match = re.fullmatch(rf"/repos/{LOGIN}/([^/]+)(/.*)?", path)
+        if not match or match.group(1) not in self.state.repos:
+            return self._send(404, {"message": "Not Found"})
+        name, rest = match.group(1), match.group(2) or ""
+        repo = self.state.repos[name]
+
+        if method == "GET" and rest == "":
+            return self._send_conditional(self._repo_json(repo))
+
+        if rest == "/issues":
+            if method == "POST":
+                data = self._read_json()
+                with self.state.lock:
+                    issue = self.state.add_issue(name, data["title"], data.get("body", ""))
+                return self._send(201, self._issue_json(name, issue))
+            state = query.get("state", ["open"])[0]
+            issues = [self._issue_json(name, i) for i in self.state.issues[name] if state == "all" or i["state"] == state]
+            return self._paginate(path, issues, query)
+
+        branch = re.fullmatch(r"/branches/([^/]+)", rest)
+        if method == "GET" and branch:
+            sha = self.state.refs[name].get(branch.group(1))
+            if sha is None:
+                return self._send(404, {"message": "Branch not found"})
+            tree = self.state.commits[sha]["tree"]
+            return self._send_conditional({"name": branch.group(1), "commit": {"sha": sha, "commit": {"tree": {"sha": tree}}}})
+
+        if method == "POST" and rest.startswith("/git/") and rest != "/git/refs":
+            return self._git_object(rest[len("/git/"):], self._read_json())
+
+        contents = re.fullmatch(r"/contents/(.+)", rest)
+        if method == "PUT" and contents:
+            return self._put_contents(name, contents.group(1), self._read_json())
+
+        if method == "POST" and rest == "/git/refs":
+            data = self._read_json()
+            with self.state.lock:
+                self.state.refs[name][data["ref"].rsplit("/", 1)[-1]] = data["sha"]
+            return self._send(201, {"ref": data["ref"], "object": {"sha": data["sha"]}})
+
+        if method == "POST" and rest == "/pulls":
+            data = self._read_json()
+            return self._send(201, {
+                "number": 1,
+                "title": data["title"],
+                "html_url": f"https://github.com/{LOGIN}/{name}/pull/1",
+            })
+
+        return self._send(404, {"message": "Not Found"})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PATCH(self):
+        self._route("PATCH")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def _git_object(self, kind, data):
+        """POST /git/blobs, /git/trees and /git/commits, checking what they reference like GitHub does"""
+        with self.state.lock:
+            status, payload = self._create_git_object(kind, data)
+        self._send(status, payload)
+
+    def _create_git_object(self, kind, data):
+        state = self.state
+        if kind == "blobs":
+            content = data["content"]
+            raw = base64.b64decode(content) if data.get("encoding") == "base64" else content.encode()
+            return 201, {"sha": state.add_blob(raw)}
+        if kind == "trees":
+            if data.get("base_tree") and data["base_tree"] not in state.trees:
+                return 422, {"message": "Invalid base_tree"}
+            files = dict(state.trees.get(data.get("base_tree"), {}))
+            for entry in data["tree"]:
+                if "content" in entry:
+                    files[entry["path"]] = state.add_blob(entry["content"].encode())
+                elif entry.get("sha") is None:
+                    files.pop(entry["path"], None)
+                elif entry["sha"] in state.blobs:
+                    files[entry["path"]] = entry["sha"]
+                else:
+                    return 422, {"message": f"Invalid tree entry {entry['path']}: unknown sha"}
+            sha = object_sha("tree", files)
+            state.trees[sha] = files
+            return 201, {"sha": sha}
+        if kind == "commits":
+            if data["tree"] not in state.trees or any(parent not in state.commits for parent in data["parents"]):
+                return 422, {"message": "Invalid tree or parent"}
+            return 201, {"sha": state.add_commit(data["tree"], data["parents"], data["message"])}
+        return 404, {"message": "Not Found"}
+
+    def _put_contents(self, name, path, data):
+        """Contents API: one commit per file on top of the branch"""
+        state = self.state
+        with state.lock:
+            branch = data.get("branch", "main")
+            parent = state.refs[name][branch]
+            files = dict(state.trees[state.commits[parent]["tree"]])
+            files[path] = state.add_blob(base64.b64decode(data["content"]))
+            tree = object_sha("tree", files)
+            state.trees[tree] = files
+            commit = state.add_commit(tree, [parent], data["message"])
+            state.refs[name][branch] = commit
+        self._send(201, {"content": {"path": path, "sha": files[path]}, "commit": {"sha": commit}})
+
+
+class FakeGitHubServer:
+    """Run the fake API on a background thread: ``with FakeGitHubServer() as url: ...``"""
+
+    def __init__(self, latency=0.05, repo_count=5, issues_per_repo=10, host="127.0.0.1", port=0, fixture=None):
+        self.httpd = ThreadingHTTPServer((host, port), FakeGitHubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.state = FakeGitHubState(repo_count, issues_per_repo, fixture)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def state(self):
+        return self.httpd.state
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fake GitHub API in the foreground")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--repos", type=int, default=5)
+    parser.add_argument("--issues", type=int, default=10, help="issues per repository")
+    args = parser.parse_args()
+    with FakeGitHubServer(latency=args.latency, repo_count=args.repos, issues_per_repo=args.issues, port=args.port) as fake:
+        print(fake.url, flush=True)
+        fake.thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Load test of a multi-tenant server: many users, one process.
+
+Starts the fake GitHub API and a MCP_MULTI_TENANT HTTP server in-process,
+then drives it with --tenants HTTP clients, each with its own token
+(Authorization: Bearer) and sending --requests tools/call requests. The same
+load is also sent with a single shared token for comparison.
+
+Memory per tenant is measured in a separate tracemalloc pass (tenant clients
+created and used once, in-process) and set against the peak RSS of one
+single-user server process, the cost of the one-process-per-user setup.
+
+    python -m benchmarks.load_tenants --tenants 200 --requests 10
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+from benchmarks.common import quiet, summarize, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+from benchmarks.load_transport import call, start_http_server
+
+# One single-user server making one call, reporting its peak RSS in KB
+# (VmHWM: ru_maxrss would include the parent's RSS at fork time)
+SINGLE_USER_PROCESS = """
+import asyncio, contextlib, io
+from src.mcp_server import GitHubMCPServer
+with contextlib.redirect_stdout(io.StringIO()):
+    server = GitHubMCPServer()
+    asyncio.run(server.call_tool("list_repositories", {"limit": 5}))
+with open("/proc/self/status") as f:
+    print(next(line.split()[1] for line in f if line.startswith("VmHWM")))
+"""
+
+
+async def tenant(url, token, tenant_id, requests, latencies):
+    headers = {"Accept": "application/json, text/event-stream", "Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(timeout=120) as http:
+        for i in range(requests):
+            start = time.perf_counter()
+            response = await http.post(url, json=call(tenant_id * requests + i), headers=headers)
+            response.raise_for_status()
+            assert "error" not in response.json(), response.json()
+            latencies.append(time.perf_counter() - start)
+
+
+async def run_load(url, tokens, requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(tenant(url, token, i, requests, latencies) for i, token in enumerate(tokens)))
+    return latencies, time.perf_counter() - start
+
+
+async def memory_per_tenant(tenants):
+    """KB of Python heap each tenant client adds once it has made a call"""
+    from src.mcp_server import GitHubMCPServer
+    with quiet():
+        server = GitHubMCPServer(multi_tenant=True)
+        # Imports and first-use state are not per tenant
+        await server.call_tool("list_repositories", {"limit": 5}, token="memory-warmup")
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(tenants):
+        await server.call_tool("list_repositories", {"limit": 5}, token=f"memory-tenant-{i}")
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    server.close()
+    return used / tenants / 1024
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="requests per tenant")
+    parser.add_argument("--max-tenants", type=int, default=256, help="MCP_MAX_TENANTS (clients kept in the pool)")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with FakeGitHubServer(latency=args.latency) as fake:
+        use_fake_github(fake.url)
+        os.environ["MCP_MAX_TENANTS"] = str(args.max_tenants)
+        # Otherwise the shared-token run would be measuring coalescing of its identical calls
+        os.environ["MCP_COALESCE_READS"] = "false"
+        from src.mcp_server import GitHubMCPServer
+        from src.transport import MCPTransportServer
+
+        url = f"http://127.0.0.1:{args.port}/mcp"
+        tokens = [f"tenant-token-{i}" for i in range(args.tenants)]
+        print(f"{args.tenants} tenants x {args.requests} requests, {args.latency * 1000:.0f} ms fake API latency\n")
+        with quiet():
+            transport = MCPTransportServer(GitHubMCPServer(multi_tenant=True))
+            server, thread = start_http_server(transport, args.port)
+            shared = await run_load(url, ["shared-token"] * args.tenants, args.requests)
+            separate = await run_load(url, tokens, args.requests)
+        summarize("1 shared token", *shared)
+        summarize(f"{args.tenants} tenant tokens", *separate)
+
+        pool = transport.mcp_server.clients
+        print(f"pool: {pool.snapshot()}")
+        # Each tenant's scheduler tracks the budget of its own token (the fake API starts every token at 5000)
+        separate_budgets = sum(
+            1 for token in tokens[-args.max_tenants:]
+            if pool.get(token).scheduler.budgets["core"]["remaining"]
+            == 5000 - fake.state.requests_by_token[f"token {token}"]
+        )
+        print(f"tenants whose budget reflects only their own requests: {separate_budgets}/{min(args.tenants, args.max_tenants)}")
+        server.should_exit = True
+        thread.join()
+        transport.mcp_server.close()
+
+        per_tenant = await memory_per_tenant(min(args.tenants, args.max_tenants))
+        process = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", SINGLE_USER_PROCESS],
+            capture_output=True, text=True, check=True, env=os.environ
+        )
+        rss = int(process.stdout.split()[-1])
+        print(f"\nmemory per tenant client:      {per_tenant:8.1f} KB")
+        print(f"single-user server process:    {rss:8d} KB peak RSS")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
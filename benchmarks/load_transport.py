@@ -0,0 +1,92 @@
+"""Load test of the streamable HTTP transport with many concurrent clients.
+
+Starts the fake GitHub API and src.transport's HTTP server in-process, then
+drives it with --clients independent HTTP clients, each sending --requests
+tools/call requests (every --batch-every'th one as a JSON-RPC batch).
+Read coalescing is off: the clients repeat the same few calls.
+
+    python -m benchmarks.load_transport --clients 50 --requests 20
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+
+from benchmarks.common import quiet, summarize, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+
+CALLS = [
+    ("get_repository_info", {"repo_name": "repo-0"}),
+    ("get_repository_stats", {"repo_name": "repo-1"}),
+    ("list_issues", {"repo_name": "repo-2", "limit": 5}),
+    ("list_repositories", {"limit": 5}),
+]
+
+
+def start_http_server(transport, port):
+    import uvicorn
+    config = uvicorn.Config(transport.http_app(), host="127.0.0.1", port=port, log_level="error")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def call(request_id):
+    name, arguments = CALLS[request_id % len(CALLS)]
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+async def client(url, client_id, requests, batch_every, latencies):
+    async with httpx.AsyncClient(timeout=120) as http:
+        for i in range(requests):
+            request_id = client_id * requests + i
+            body = [call(request_id), call(request_id + 1)] if batch_every and i % batch_every == 0 else call(request_id)
+            start = time.perf_counter()
+            response = await http.post(url, json=body, headers={"Accept": "application/json, text/event-stream"})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--batch-every", type=int, default=5, help="send every Nth request as a batch (0 = never)")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API latency in seconds")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    os.environ["MCP_COALESCE_READS"] = "false"
+
+    with FakeGitHubServer(latency=args.latency) as fake:
+        use_fake_github(fake.url)
+        from src.transport import MCPTransportServer
+
+        with quiet():
+            transport = MCPTransportServer()
+            server, thread = start_http_server(transport, args.port)
+
+            latencies = []
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                client(f"http://127.0.0.1:{args.port}/mcp", c, args.requests, args.batch_every, latencies)
+                for c in range(args.clients)
+            ))
+            elapsed = time.perf_counter() - start
+
+        print(f"{args.clients} clients x {args.requests} requests, {args.latency * 1000:.0f} ms fake API latency")
+        summarize("streamable HTTP", latencies, elapsed)
+        print(f"GitHub requests: {fake.state.request_count}")
+        server.should_exit = True
+        thread.join()
+        transport.mcp_server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
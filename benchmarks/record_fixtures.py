@@ -0,0 +1,61 @@
+"""Record a fixture for the offline benchmarks from the live GitHub and Gemini APIs.
+
+Saves the authenticated user's repositories, their open issues and the
+parsed intents of the given utterances, which FakeGitHubServer(fixture=...)
+and StubBackend(parse_replies=...) replay. Needs GITHUB_TOKEN, plus
+GOOGLE_API_KEY when --utterance is given.
+
+    python -m benchmarks.record_fixtures --out benchmarks/fixtures/mine.json \\
+        --utterance "what's going on in my busiest repo?"
+"""
+import argparse
+import asyncio
+import json
+
+from benchmarks.common import use_fake_github  # noqa: F401  (ensures src is importable)
+
+REPO_FIELDS = (
+    "name", "description", "private", "stargazers_count", "forks_count", "watchers_count",
+    "language", "size", "default_branch", "created_at", "updated_at",
+)
+
+
+def record_github(max_repos, max_issues):
+    from src.github_client import GitHubClient
+    client = GitHubClient()
+    repos, issues = [], {}
+    for repo in client.github.get_user().get_repos(affiliation="owner")[:max_repos]:
+        raw = repo.raw_data
+        repos.append({field: raw.get(field) for field in REPO_FIELDS})
+        issues[repo.name] = [
+            {"title": issue.title, "body": issue.body or ""}
+            for issue in repo.get_issues(state="open")[:max_issues]
+        ]
+    return repos, issues
+
+
+async def record_parses(utterances):
+    from src.llm_interface import LLMInterface
+    interface = LLMInterface()
+    # Bypass the rule and cache tiers so every utterance is a real LLM parse
+    return {utterance: await interface._parse_with_llm(utterance) for utterance in utterances}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--repos", type=int, default=50, help="maximum repositories to record")
+    parser.add_argument("--issues", type=int, default=20, help="maximum open issues per repository")
+    parser.add_argument("--utterance", action="append", default=[], help="utterance whose LLM parse to record")
+    args = parser.parse_args()
+
+    repos, issues = record_github(args.repos, args.issues)
+    fixture = {"repos": repos, "issues": issues, "llm_parse": asyncio.run(record_parses(args.utterance))}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=2)
+    print(f"Recorded {len(repos)} repositories, {sum(map(len, issues.values()))} issues "
+          f"and {len(args.utterance)} parses to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
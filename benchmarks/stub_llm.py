@@ -0,0 +1,67 @@
+"""Stand-in for the Gemini backend with configurable latency.
+
+StubBackend implements the LLMBackend single-attempt hooks with
+asyncio.sleep, so deadlines, retries and streaming behave exactly as they do
+against Gemini, minus the network.
+"""
+import asyncio
+import json
+import os
+
+from benchmarks.common import use_fake_github  # noqa: F401  (ensures src is importable)
+from src.llm_backend import LLMBackend
+
+
+class StubBackend(LLMBackend):
+    def __init__(self, first_token_latency=0.8, chunks=12, chunk_interval=0.05, parse_replies=None,
+                 prefill_per_1k_tokens=0.0, **kwargs):
+        super().__init__(**kwargs)
+        # Recorded parse results by utterance; anything else parses as list_repositories
+        self.parse_replies = {key.lower(): value for key, value in (parse_replies or {}).items()}
+        self.first_token_latency = first_token_latency
+        self.chunks = chunks
+        self.chunk_interval = chunk_interval
+        # Extra time to first token per 1000 prompt tokens, as prompt processing costs
+        self.prefill_per_1k_tokens = prefill_per_1k_tokens
+        self.calls = {}
+
+    def _reply(self, prompt, operation):
+        if operation == "parse":
+            utterance = prompt.rsplit("User: ", 1)[-1].strip().lower()
+            return json.dumps(self.parse_replies.get(utterance, {"action": "list_repositories", "parameters": {}}))
+        return " ".join(["🎉 Done!"] + ["Here is what happened."] * (self.chunks - 1))
+
+    def _chunks(self, prompt, operation):
+        words = self._reply(prompt, operation).split(" ")
+        size = max(1, len(words) // self.chunks)
+        return [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)]
+
+    def _count(self, prompt, operation, system, annotate=True):
+        """Count the call and its tokens, estimated at 4 characters per token; return the time to first token"""
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        reply = self._reply(prompt, operation)
+        prompt_tokens = (len(system or "") + len(prompt)) // 4
+        self.record_usage(operation, prompt_tokens, 0, len(reply) // 4, annotate=annotate)
+        return self.first_token_latency + prompt_tokens / 1000 * self.prefill_per_1k_tokens
+
+    async def _generate(self, prompt, operation, timeout, system=None):
+        first_token = self._count(prompt, operation, system)
+        await asyncio.sleep(first_token + self.chunks * self.chunk_interval)
+        return self._reply(prompt, operation)
+
+    async def _stream(self, prompt, operation, timeout, system=None):
+        await asyncio.sleep(self._count(prompt, operation, system, annotate=False))
+        for chunk in self._chunks(prompt, operation):
+            yield chunk
+            await asyncio.sleep(self.chunk_interval)
+
+
+def allow_stub_llm():
+    """Let LLMInterface be constructed without a real Gemini key"""
+    os.environ.setdefault("GOOGLE_API_KEY", "bench-key")
+
+
+def install_stub_backend(interface, backend):
+    """Make a GitHubInterface talk to `backend` instead of Gemini"""
+    interface.llm_interface.backend = backend
+    return backend
@@ -0,0 +1,267 @@
+"""Offline benchmark suite: realistic workloads against the fake GitHub API and a stub LLM.
+
+Every workload runs against a fresh FakeGitHubServer loaded from a recorded
+fixture (benchmarks/fixtures/sample.json by default, see record_fixtures.py)
+and reports throughput, latency percentiles, GitHub HTTP calls, LLM calls and
+peak Python memory. Results can be saved as JSON and compared with an
+earlier run, e.g. from another commit:
+
+    python -m benchmarks.suite --json before.json
+    git checkout my-branch
+    python -m benchmarks.suite --compare before.json
+
+Peak memory comes from a separate tracemalloc pass so it doesn't slow down
+the timed one (--no-memory skips it). Read coalescing is off, so repeated
+identical reads each do their work (bench_coalescing measures it).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from benchmarks.common import percentile, quiet, use_fake_github
+from benchmarks.fake_github import FakeGitHubServer
+from benchmarks.stub_llm import StubBackend, allow_stub_llm, install_stub_backend
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sample.json")
+
+# Utterances of one interactive session: rule-matched, recorded LLM parses, reads and writes
+SESSION = [
+    "list my repos",
+    "what's in my face recognition project?",
+    "show stats for arabic-sentiment",
+    "how popular is arabic-sentiment?",
+    "what still needs doing in portfolio-site?",
+    "open a ticket in api-gateway about flaky login tests",
+    "list issues in api-gateway",
+    "start a dark-mode branch in portfolio-site",
+    "file bugs about caching and hourly forecast in weather-dashboard and show me stats for ml-experiments",
+    "show stats for all my repos",
+]
+
+WORKLOADS = {}
+
+
+def workload(name, repo_count=0, issues_per_repo=0, description=""):
+    """Register a workload; repo_count pads the fixture with synthetic repositories"""
+    def register(fn):
+        WORKLOADS[name] = {"fn": fn, "repo_count": repo_count, "issues_per_repo": issues_per_repo,
+                           "description": description}
+        return fn
+    return register
+
+
+async def timed(latencies, coro):
+    start = time.perf_counter()
+    result = await coro
+    latencies.append(time.perf_counter() - start)
+    return result
+
+
+@workload("large_listing", repo_count=1000, description="page through 1000 repositories, 100 per call")
+async def large_listing(env, args):
+    server, latencies = env["server"], []
+    for _ in range(args.rounds):
+        cursor = None
+        while True:
+            result = await timed(latencies, server.call_tool(
+                "list_repositories", {"limit": 100, "cursor": cursor, "per_page": 100}
+            ))
+            cursor = result.get("next_cursor")
+            if not cursor:
+                break
+        await timed(latencies, server.handle_mcp_request({
+            "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+            "params": {"name": "list_repositories", "arguments": {"limit": 1000, "per_page": 100}},
+        }))
+    return latencies
+
+
+@workload("issue_flood", description="create issues concurrently, then list them all")
+async def issue_flood(env, args):
+    server, latencies = env["server"], []
+    await asyncio.gather(*(
+        timed(latencies, server.call_tool("create_issue", {"repo_name": "api-gateway", "title": f"Flood {i}"}))
+        for i in range(args.issues)
+    ))
+    cursor = None
+    while True:
+        result = await timed(latencies, server.call_tool(
+            "list_issues", {"repo_name": "api-gateway", "limit": 100, "cursor": cursor}
+        ))
+        cursor = result.get("next_cursor")
+        if not cursor:
+            break
+    return latencies
+
+
+@workload("mcp_protocol", description="concurrent JSON-RPC tools/list and read tools/call messages")
+async def mcp_protocol(env, args):
+    server, latencies = env["server"], []
+    calls = [
+        ("get_repository_info", {"repo_name": "Face-Recognition-CNN"}),
+        ("get_repository_stats", {"repo_name": "arabic-sentiment"}),
+        ("list_issues", {"repo_name": "github-mcp-integration", "limit": 5}),
+        ("list_repositories", {"limit": 5}),
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def send(i):
+        if i % 5 == 0:
+            message = {"jsonrpc": "2.0", "id": i, "method": "tools/list"}
+        else:
+            name, arguments = calls[i % len(calls)]
+            message = {"jsonrpc": "2.0", "id": i, "method": "tools/call",
+                       "params": {"name": name, "arguments": arguments}}
+        async with semaphore:
+            await timed(latencies, server.handle_mcp_request(message))
+
+    await asyncio.gather(*(send(i) for i in range(args.messages)))
+    return latencies
+
+
+@workload("mixed_session", description="concurrent natural-language sessions mixing reads and writes")
+async def mixed_session(env, args):
+    interface, latencies = env["interface"], []
+
+    async def session():
+        for utterance in SESSION:
+            await timed(latencies, interface.process_natural_language_request(utterance))
+
+    await asyncio.gather(*(session() for _ in range(args.sessions)))
+    return latencies
+
+
+async def run_workload(name, args, fixture, measure_memory):
+    """Run one workload against fresh fake services and return its measurements"""
+    spec = WORKLOADS[name]
+    with FakeGitHubServer(latency=args.github_latency, repo_count=spec["repo_count"],
+                          issues_per_repo=spec["issues_per_repo"], fixture=args.fixture) as fake:
+        use_fake_github(fake.url)
+        allow_stub_llm()
+        from src.main import GitHubInterface
+        from src.metrics import metrics
+
+        with quiet():
+            interface = GitHubInterface()
+            interface.response_mode = args.response_mode
+            interface.mcp_server.github_client.login
+        backend = install_stub_backend(interface, StubBackend(
+            first_token_latency=args.llm_latency, chunks=4, chunk_interval=0.01,
+            parse_replies=fixture.get("llm_parse")
+        ))
+        env = {"interface": interface, "server": interface.mcp_server, "fake": fake}
+        metrics.reset()
+        requests_before = fake.state.request_count
+
+        if measure_memory:
+            tracemalloc.start()
+        with quiet():
+            start = time.perf_counter()
+            latencies = await spec["fn"](env, args)
+            elapsed = time.perf_counter() - start
+        peak = None
+        if measure_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        stages = {
+            f"{h['stage']}/{h['name']}" if "name" in h else h["stage"]: h["p50"]
+            for h in metrics.snapshot(recent_spans=0)["histograms"] if h["metric"] == "stage_duration_seconds"
+        }
+        interface.mcp_server.close()
+        return {
+            "ops": len(latencies),
+            "seconds": round(elapsed, 4),
+            "ops_per_second": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "http_requests": fake.state.request_count - requests_before,
+            "llm_calls": sum(backend.calls.values()),
+            "peak_memory_kb": round(peak / 1024) if peak is not None else None,
+            "stage_p50_seconds": stages,
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+COLUMNS = [("ops/s", "ops_per_second"), ("p50 ms", "p50_ms"), ("p95 ms", "p95_ms"), ("p99 ms", "p99_ms"),
+           ("HTTP", "http_requests"), ("LLM", "llm_calls"), ("peak KB", "peak_memory_kb")]
+
+
+def print_table(results, baseline=None):
+    print(f"{'workload':<16}" + "".join(f"{label:>12}" for label, _ in COLUMNS))
+    for name, result in results.items():
+        print(f"{name:<16}" + "".join(f"{str(result[key]):>12}" for _, key in COLUMNS))
+        before = (baseline or {}).get(name)
+        if before:
+            deltas = []
+            for _, key in COLUMNS:
+                old, new = before.get(key), result[key]
+                deltas.append(f"{(new - old) / old * 100:+.1f}%" if old and new is not None else "-")
+            print(f"{'  vs baseline':<16}" + "".join(f"{delta:>12}" for delta in deltas))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS), help="run only these (repeatable)")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--github-latency", type=float, default=0.02, help="fake API latency in seconds")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="stub LLM time to first token")
+    parser.add_argument("--response-mode", default="template", choices=["llm", "template", "stream"])
+    parser.add_argument("--rounds", type=int, default=3, help="large_listing: passes over the listing")
+    parser.add_argument("--issues", type=int, default=200, help="issue_flood: issues to create")
+    parser.add_argument("--messages", type=int, default=500, help="mcp_protocol: JSON-RPC messages")
+    parser.add_argument("--concurrency", type=int, default=50, help="mcp_protocol: messages in flight")
+    parser.add_argument("--sessions", type=int, default=4, help="mixed_session: concurrent sessions")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="results file of an earlier run to compare against")
+    args = parser.parse_args()
+    os.environ["MCP_COALESCE_READS"] = "false"
+
+    with open(args.fixture, encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    results = {}
+    for name in args.workload or WORKLOADS:
+        print(f"▶ {name}: {WORKLOADS[name]['description']}")
+        results[name] = await run_workload(name, args, fixture, measure_memory=False)
+        if not args.no_memory:
+            results[name]["peak_memory_kb"] = (await run_workload(name, args, fixture, True))["peak_memory_kb"]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        baseline = previous["workloads"]
+        print(f"\nBaseline: commit {previous.get('commit')} from {previous.get('recorded_at')}")
+    print()
+    print_table(results, baseline)
+
+    if args.json:
+        report = {
+            "commit": git_commit(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "settings": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+            "workloads": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from src.mirror import next_link
+from src.rate_limiter import BULK, priority_context
+
+def issue_key(title):
+    """Idempotency key of an issue: hash of its title, ignoring case and spacing"""
+    normalized = re.sub(r"\s+", " ", title).strip().casefold()
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+def load_issue_file(path):
+    """Read [{"title", "body"}] from a .csv (title/body columns), .jsonl or .json file"""
+    if not path.endswith((".csv", ".jsonl", ".json")):
+        raise ValueError(f"Unsupported issue file '{path}': use .csv, .jsonl or .json")
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        elif path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = json.load(f)
+    issues = []
+    for number, row in enumerate(rows, 1):
+        title = (row.get("title") or "").strip() if isinstance(row, dict) else ""
+        if not title:
+            raise ValueError(f"{path}: entry {number} has no title")
+        issues.append({"title": title, "body": row.get("body") or ""})
+    return issues
+
+class Checkpoint:
+    """JSON file of the issues already created by an import, keyed by issue_key.
+
+    Rewritten after every created issue, so an interrupted import picks up
+    where it stopped. The file records the repository (owner/name) it was
+    written for and can't be used to import into another one. It is written
+    once up front, so an unwritable path fails the import before any issue
+    is created.
+    """
+
+    def __init__(self, path, repo):
+        self.path = path
+        self.repo = repo
+        self._lock = threading.Lock()
+        self.done = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("repo") != repo:
+                raise ValueError(
+                    f"Checkpoint '{path}' was written for {saved.get('repo') or 'another repository'}, not {repo}; "
+                    "give another checkpoint file"
+                )
+            self.done = saved.get("created", {})
+        if path:
+            try:
+                self._save()
+            except OSError as e:
+                raise ValueError(f"Can't write checkpoint '{path}': {e}") from None
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"repo": self.repo, "created": self.done}, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, key, entry):
+        with self._lock:
+            self.done[key] = entry
+            if self.path:
+                self._save()
+
+class BulkIssueImport:
+    """Create many issues in one repository, skipping ones that already exist.
+
+    Existing issues (open and closed) are listed once and matched by
+    issue_key, as are the entries of the checkpoint, so running the same
+    import again never creates duplicates. Issues are created one after
+    another at BULK priority: the scheduler serializes content-creating
+    POSTs and keeps them GITHUB_WRITE_INTERVAL apart anyway, and interactive
+    requests go first.
+    """
+
+    def __init__(self, client, repo_name, checkpoint_path=None):
+        self.client = client
+        self.repo_name = repo_name
+        self.checkpoint = Checkpoint(checkpoint_path, f"{client.login}/{repo_name}")
+
+    def existing_issues(self):
+        """{issue_key: url} of every issue in the repository, pull requests excluded"""
+        requester = self.client.github.requester
+        url = f"/repos/{self.client.login}/{self.repo_name}/issues"
+        params = {"state": "all", "per_page": 100}
+        existing = {}
+        while url:
+            headers, page = requester.requestJsonAndCheck("GET", url, params)
+            for raw in page:
+                if "pull_request" not in raw:
+                    existing[issue_key(raw["title"])] = raw["html_url"]
+            # The next link carries the query string already
+            url, params = next_link(headers), None
+        return existing
+
+    def _create(self, key, issue):
+        try:
+            _, raw = self.client.github.requester.requestJsonAndCheck(
+                "POST", f"/repos/{self.client.login}/{self.repo_name}/issues",
+                input={"title": issue["title"], "body": issue["body"]}
+            )
+        except Exception as e:
+            return {"title": issue["title"], "status": "failed", "error": str(e)}
+        result = {"title": issue["title"], "status": "created", "url": raw["html_url"]}
+        try:
+            self.checkpoint.record(key, {"number": raw["number"], "url": raw["html_url"]})
+        except OSError as e:
+            # The issue exists either way; a later run still finds it by title
+            result["warning"] = f"not checkpointed: {e}"
+        return result
+
+    def run(self, issues):
+        started = time.perf_counter()
+        existing = self.existing_issues()
+        results, pending, seen = [None] * len(issues), [], set()
+        for index, issue in enumerate(issues):
+            key = issue_key(issue["title"])
+            url = existing.get(key) or self.checkpoint.done.get(key, {}).get("url")
+            if url or key in seen:
+                reason = "already exists" if url else "duplicate in this import"
+                results[index] = {"title": issue["title"], "status": "skipped", "url": url, "reason": reason}
+            else:
+                pending.append((index, key, issue))
+            seen.add(key)
+
+        context = priority_context(BULK)
+        for index, key, issue in pending:
+            results[index] = context.run(self._create, key, issue)
+
+        elapsed = time.perf_counter() - started
+        counts = {status: sum(1 for item in results if item["status"] == status) for status in ("created", "skipped", "failed")}
+        return results, counts, elapsed
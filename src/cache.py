@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries go stale after `ttl` seconds.
+
+    Stale entries are kept (until evicted) so callers can revalidate them
+    cheaply, e.g. with a conditional request, instead of refetching.
+    """
+
+    def __init__(self, max_size=256, ttl=60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "invalidations": 0}
+
+    def lookup(self, key):
+        """Return (value, fresh). value is None on a miss; fresh is False for stale entries"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            value, stored_at = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self.stats["hits"] += 1
+                return value, True
+            self.stats["stale"] += 1
+            return value, False
+
+    def get(self, key):
+        """Return a fresh value or None"""
+        value, fresh = self.lookup(key)
+        return value if fresh else None
+
+    def put(self, key, value):
+        """Store a value and restart its TTL, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, key):
+        """Drop a single entry"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def items(self):
+        """Return [key, value] pairs from least to most recently used"""
+        with self._lock:
+            return [[key, value] for key, (value, _) in self._entries.items()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def record(self, counter, amount=1):
+        """Increment a caller-defined counter (e.g. revalidations)"""
+        with self._lock:
+            self.stats[counter] = self.stats.get(counter, 0) + amount
+
+    def snapshot(self):
+        """Return counters plus the current size"""
+        with self._lock:
+            return {**self.stats, "size": len(self._entries), "max_size": self.max_size, "ttl": self.ttl}
+
+    def __len__(self):
+        return len(self._entries)
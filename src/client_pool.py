@@ -0,0 +1,53 @@
+import os
+import threading
+from collections import OrderedDict
+from src.github_client import GitHubClient, _token_key
+from src.http_transport import pooled_session
+
+class GitHubClientPool:
+    """Per-token GitHubClients for serving many users from one process.
+
+    A client is created on the first request carrying its token and kept in
+    LRU order; past `max_clients` the least recently used one is closed.
+    All clients send through one pooled HTTP session, so connections to
+    GitHub are shared, while each keeps its own rate-limit scheduler (GitHub
+    budgets are per token), repository cache and in-memory HTTP cache.
+    Tokens are only held by their clients; the pool is keyed by their hash.
+    """
+
+    def __init__(self, max_clients=None, pool_size=None):
+        self.max_clients = max_clients or int(os.getenv("MCP_MAX_TENANTS", "256"))
+        self.session = pooled_session(pool_size or int(os.getenv("GITHUB_POOL_SIZE", "32")))
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "evicted": 0}
+
+    def get(self, token):
+        """The client for `token`, created on first use"""
+        key = _token_key(token)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.stats["reused"] += 1
+                return client
+            # Cheap: nothing is sent to GitHub until the client is used
+            client = self._clients[key] = GitHubClient(token, session=self.session, tenant=True)
+            self.stats["created"] += 1
+            while len(self._clients) > self.max_clients:
+                _, evicted = self._clients.popitem(last=False)
+                # Calls still running on it finish: the shared session stays open
+                evicted.close()
+                self.stats["evicted"] += 1
+            return client
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.stats, "tenants": len(self._clients), "max_tenants": self.max_clients}
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+        self.session.close()
@@ -0,0 +1,95 @@
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+# Listing fields that only matter to programs paging through results
+PROMPT_DROP_FIELDS = {"next_cursor", "source", "mirror"}
+# Item fields worth phrasing a reply about; anything else in list items is left out
+PROMPT_ITEM_FIELDS = ("name", "title", "status", "stars", "forks", "issues", "language", "error")
+
+class ResultEncoder:
+    """Serializes tool results for MCP responses.
+
+    style: "compact" (default, no whitespace), "pretty" (indent=2, the old
+    format) or "orjson" (compact, falls back to json when orjson is missing).
+    content: what tools/call returns, "text" (default, a JSON text block every
+    client understands), "structured" (structuredContent only, the smallest)
+    or "both" (structuredContent plus the text copy the MCP spec recommends
+    for older clients, the largest).
+    """
+
+    def __init__(self, style=None, content=None):
+        self.style = (style or os.getenv("MCP_RESULT_JSON", "compact")).lower()
+        self.content = (content or os.getenv("MCP_RESULT_CONTENT", "text")).lower()
+        if self.style == "orjson" and orjson is None:
+            print("⚠️ orjson is not installed, using compact json")
+            self.style = "compact"
+
+    def dumps(self, obj):
+        """Tool result as JSON text, in the configured style"""
+        if self.style == "orjson":
+            return self._orjson(obj).decode()
+        if self.style == "pretty":
+            return json.dumps(obj, indent=2, default=str)
+        return _compact(obj)
+
+    def encode_message(self, message):
+        """A whole JSON-RPC message as UTF-8 bytes on one line (stdio framing relies on it)"""
+        if self.style == "orjson":
+            return self._orjson(message)
+        return _compact(message).encode()
+
+    @staticmethod
+    def _orjson(obj):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def tool_result(self, result):
+        """CallToolResult for a tool's result dict"""
+        payload = {"content": [], "isError": not result.get("success", False)}
+        if self.content in ("text", "both"):
+            payload["content"].append({"type": "text", "text": self.dumps(result)})
+        if self.content in ("structured", "both"):
+            payload["structuredContent"] = result
+        return payload
+
+def _compact(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def _truncate(value, max_chars):
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "…"
+    return value
+
+def _project(value, max_items, max_chars):
+    if isinstance(value, dict):
+        return project_for_prompt(value, max_items, max_chars)
+    if isinstance(value, list):
+        return [_project_item(item, max_items, max_chars) for item in value[:max_items]]
+    return _truncate(value, max_chars)
+
+def _project_item(item, max_items, max_chars):
+    if not isinstance(item, dict):
+        return _project(item, max_items, max_chars)
+    keys = [key for key in PROMPT_ITEM_FIELDS if key in item] or list(item)
+    return {key: _project(item[key], max_items, max_chars) for key in keys}
+
+def project_for_prompt(result, max_items=20, max_chars=200):
+    """Trim a tool result to what the LLM needs to phrase a reply.
+
+    Paging fields are dropped, lists keep their first `max_items` entries
+    (with a `<key>_omitted` count for the rest) and only the PROMPT_ITEM_FIELDS
+    of each item, and long strings are cut at `max_chars`. Nested results,
+    like the steps of a plan, are projected the same way.
+    """
+    projected = {}
+    for key, value in result.items():
+        if key in PROMPT_DROP_FIELDS:
+            continue
+        projected[key] = _project(value, max_items, max_chars)
+        if isinstance(value, list) and len(value) > max_items:
+            projected[f"{key}_omitted"] = len(value) - max_items
+    return projected
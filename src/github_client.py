@@ -1,22 +1,330 @@
-from github import Github
+import contextvars
+import hashlib
+import importlib
+import json
 import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from src.bulk_issues import BulkIssueImport, load_issue_file
+from src.cache import TTLCache
+from src.commit_files import FileCommit, load_directory
+from src.http_cache import http_cache_from_env
+from src.http_transport import GitHubTransport
+from src.metrics import metrics
+from src.mirror import RepoMirror
+from src.rate_limiter import RateLimitScheduler, shared_rate_state_from_env
+
+# PyGithub is imported on first use (see GitHubClient.github): it is the
+# slowest part of starting the client and many commands never need it.
 
 # Load environment variables from .env file in the project root
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 env_path = os.path.join(project_root, '.env')
 load_dotenv(env_path)
 
+# GitHub caps page size at 100 items
+MAX_PER_PAGE = 100
+
+# Aliased `repository(...)` lookups per GraphQL query in bulk reads
+GRAPHQL_BATCH_SIZE = 50
+
+# Selection set for one repository in the GraphQL bulk reads
+REPO_STATS_FIELDS = """
+    name
+    stargazerCount
+    forkCount
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    primaryLanguage { name }
+    diskUsage
+    createdAt
+    updatedAt
+"""
+
+def _stats_from_repo(repo):
+    """get_repo_stats fields of a PyGithub Repository"""
+    return {
+        "name": repo.name,
+        "stars": repo.stargazers_count,
+        "forks": repo.forks_count,
+        "watchers": repo.watchers_count,
+        "issues": repo.open_issues_count,
+        "language": repo.language,
+        "size": repo.size,
+        "created_at": repo.created_at.isoformat(),
+        "updated_at": repo.updated_at.isoformat()
+    }
+
+def _stats_from_raw(raw):
+    """get_repo_stats fields of a REST repository payload (as stored by the mirror)"""
+    return {
+        "name": raw["name"],
+        "stars": raw["stargazers_count"],
+        "forks": raw["forks_count"],
+        "watchers": raw["watchers_count"],
+        "issues": raw["open_issues_count"],
+        "language": raw.get("language"),
+        "size": raw["size"],
+        "created_at": raw["created_at"].replace("Z", "+00:00"),
+        "updated_at": raw["updated_at"].replace("Z", "+00:00")
+    }
+
+def _stats_from_graphql(node):
+    """get_repo_stats fields of a GraphQL Repository node"""
+    return {
+        "name": node["name"],
+        "stars": node["stargazerCount"],
+        "forks": node["forkCount"],
+        "watchers": node["watchers"]["totalCount"],
+        "issues": node["issues"]["totalCount"],
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "size": node["diskUsage"],
+        "created_at": node["createdAt"].replace("Z", "+00:00"),
+        "updated_at": node["updatedAt"].replace("Z", "+00:00")
+    }
+
+def _identity_cache_path():
+    return os.getenv(
+        'GITHUB_LOGIN_CACHE_PATH',
+        os.path.join(os.path.expanduser('~'), '.cache', 'github-mcp-integration', 'identity.json')
+    )
+
+def _token_key(token):
+    """Identify a token in the identity cache without storing the token itself"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def load_cached_login(token, ttl):
+    """Login previously resolved for this token, or None if unknown or older than ttl"""
+    if ttl <= 0:
+        return None
+    try:
+        with open(_identity_cache_path()) as f:
+            entry = json.load(f).get(_token_key(token))
+    except (OSError, ValueError):
+        return None
+    if not entry or time.time() - entry.get("resolved_at", 0) > ttl:
+        return None
+    return entry.get("login")
+
+def save_cached_login(token, login):
+    """Remember the login of a token on disk (atomic replace, failures ignored)"""
+    path = _identity_cache_path()
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        entries = {}
+    entries[_token_key(token)] = {"login": login, "resolved_at": time.time()}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
 class GitHubClient:
-    def __init__(self):
-        """Initialize GitHub client with token from environment"""
-        token = os.getenv('GITHUB_TOKEN')
+    def __init__(self, token=None, session=None, tenant=False):
+        """Initialize GitHub client with `token`, by default GITHUB_TOKEN from the environment.
+
+        Nothing is sent to GitHub here: the PyGithub client is built on first
+        use and the login is read from the identity cache when possible.
+        Tenant clients (see GitHubClientPool) share the pool's HTTP `session`
+        and get a small in-memory HTTP cache of their own and no mirror.
+        """
+        token = token or os.getenv('GITHUB_TOKEN')
         if not token:
             raise ValueError("GITHUB_TOKEN not found in environment variables")
         
-        self.github = Github(token)
-        self.user = self.github.get_user()
-        print(f"Connected to GitHub as: {self.user.login}")
+        self._token = token
+        self.base_url = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+        self.login_cache_ttl = float(os.getenv('GITHUB_LOGIN_CACHE_TTL', '86400'))
+        # All requests go through one pooled transport; the scheduler replaces
+        # PyGithub's fixed sleeps between requests with rate-limit-aware pacing
+        # and every request is recorded as a github.request span. The scheduler
+        # is per client: GitHub's rate limits are per token. With
+        # GITHUB_RATE_STATE_PATH its budget is shared with other processes.
+        self.scheduler = RateLimitScheduler(shared=shared_rate_state_from_env(), key=_token_key(token))
+        self.transport = GitHubTransport(
+            middlewares=[metrics.github_middleware, self.scheduler.middleware],
+            pool_size=int(os.getenv('GITHUB_POOL_SIZE', '32')),
+            session=session
+        )
+        # Innermost: repeated GETs become conditional requests and 304s are
+        # answered from the cache (GITHUB_HTTP_CACHE=memory|disk|off)
+        self.http_cache = http_cache_from_env(tenant=tenant)
+        if self.http_cache is not None:
+            self.transport.add_middleware(self.http_cache.middleware)
+        self.repo_cache = TTLCache(
+            max_size=int(os.getenv('GITHUB_REPO_CACHE_SIZE', '256')),
+            ttl=float(os.getenv('GITHUB_REPO_CACHE_TTL', '60'))
+        )
+        # Optional SQLite mirror answering reads within a staleness bound
+        self.mirror = None
+        if os.getenv('GITHUB_MIRROR_PATH') and not tenant:
+            self.mirror = RepoMirror(
+                self,
+                os.getenv('GITHUB_MIRROR_PATH'),
+                max_staleness=float(os.getenv('GITHUB_MIRROR_STALENESS', '300'))
+            )
+            self.mirror.start_refresher(float(os.getenv('GITHUB_MIRROR_REFRESH', '300')))
+        self._init_lock = threading.Lock()
+        self._github = None
+        self._user = None
+        self._login = None
+    
+    @property
+    def github(self):
+        """The PyGithub client, imported and created on first use"""
+        if self._github is None:
+            with self._init_lock:
+                if self._github is None:
+                    from github import Github
+                    self._github = self.transport.install(Github(
+                        self._token,
+                        base_url=self.base_url,
+                        retry=None,
+                        seconds_between_requests=None,
+                        seconds_between_writes=None
+                    ))
+        return self._github
+    
+    def close(self):
+        """Stop the mirror refresher and close the HTTP cache and transport"""
+        if self.mirror is not None:
+            self.mirror.close()
+        if self.http_cache is not None:
+            self.http_cache.close()
+        self.transport.close()
+    
+    def _pygithub(self, name):
+        """PyGithub class `name` from its module of the same name.
+        
+        The client is created first: importing a submodule while another
+        thread is still importing PyGithub (warm-up, concurrent first
+        requests) can hit a partially initialized package.
+        """
+        self.github
+        return getattr(importlib.import_module(f"github.{name}"), name)
+    
+    @property
+    def user(self):
+        """The authenticated user (lazy: no request until an attribute is read)"""
+        if self._user is None:
+            self._user = self.github.get_user()
+        return self._user
+    
+    @property
+    def identity(self):
+        """Hash of the token, naming whose data a call reads without exposing the token"""
+        return _token_key(self._token)
+    
+    @property
+    def login(self):
+        """Login of the token owner, from the identity cache or a single /user request"""
+        if self._login is None:
+            login = load_cached_login(self._token, self.login_cache_ttl)
+            if login is None:
+                login = self.user.login
+                save_cached_login(self._token, login)
+            self._login = login
+        return self._login
+    
+    def _get_repo(self, repo_name):
+        """Return a Repository for the user, served from the repo cache when possible.
+        
+        Fresh entries are returned as-is. Stale entries are revalidated with a
+        conditional request (If-None-Match), and GitHub doesn't count a 304
+        against the rate limit.
+        """
+        full_name = f"{self.login}/{repo_name}"
+        repo, fresh = self.repo_cache.lookup(full_name)
+        if repo is None:
+            repo = self.github.get_repo(full_name)
+        elif not fresh:
+            if repo.update():
+                self.repo_cache.record("refreshed")
+            else:
+                self.repo_cache.record("revalidated")
+        else:
+            return repo
+        self.repo_cache.put(full_name, repo)
+        return repo
+    
+    def invalidate_repo(self, repo_name):
+        """Forget the cached metadata of a repository after it was modified"""
+        self.repo_cache.invalidate(f"{self.login}/{repo_name}")
+        if self.mirror is not None:
+            self.mirror.mark_stale("repos")
+            self.mirror.mark_stale(RepoMirror.issues_key(repo_name))
+    
+    def _from_mirror(self, key):
+        """True if reads of `key` can be answered by the mirror, syncing it first when stale"""
+        if self.mirror is None:
+            return False
+        try:
+            self.mirror.ensure_fresh(key)
+            return True
+        except Exception as e:
+            print(f"⚠️ Mirror sync failed, reading from GitHub: {e}")
+            return False
+    
+    def _mirror_window(self, key, rows, total, offset, include_count):
+        """Shape a page of mirror rows like _window_result"""
+        next_offset = offset + len(rows)
+        result = {
+            "success": True,
+            key: rows,
+            "returned": len(rows),
+            "next_cursor": str(next_offset) if next_offset < total else None,
+            "source": "mirror"
+        }
+        if include_count:
+            result["count"] = total
+        return result
+    
+    def resync_mirror(self, repo_name=None, full=True):
+        """Re-sync the local mirror now (one repository's issues, or everything mirrored)"""
+        if self.mirror is None:
+            return {"success": False, "error": "The local mirror is disabled (set GITHUB_MIRROR_PATH)"}
+        try:
+            if repo_name:
+                synced = {
+                    "repositories": self.mirror.sync_repositories(full=full),
+                    "issues": self.mirror.sync_issues(repo_name, full=full),
+                    "issue_repositories": 1
+                }
+            else:
+                synced = self.mirror.sync_all(full=full)
+            return {
+                "success": True,
+                "message": f"Mirror synced: {synced['repositories']} repositories and {synced['issues']} issues fetched",
+                "synced": synced,
+                "mirror": self.mirror.status()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def rate_limit_status(self):
+        """Return the remaining GitHub budget and request queue depth"""
+        status = {"success": True, **self.scheduler.status()}
+        if self.http_cache is not None:
+            status["http_cache"] = self.http_cache.snapshot()
+        return status
+    
+    def cache_stats(self):
+        """Return repo cache and HTTP cache counters"""
+        return {
+            "repo_cache": self.repo_cache.snapshot(),
+            "http_cache": self.http_cache.snapshot() if self.http_cache is not None else None
+        }
     
     def create_repository(self, name, description="", private=False):
         """Create a new repository"""
@@ -26,6 +334,7 @@ class GitHubClient:
                 description=description,
                 private=private
             )
+            self.invalidate_repo(name)
             return {
                 "success": True,
                 "message": f"Repository '{name}' created successfully",
@@ -37,27 +346,83 @@ class GitHubClient:
                 "error": str(e)
             }
     
-    def list_repositories(self):
-        """List all user repositories"""
+    def _paginate(self, content_class, url, per_page, params=None):
+        """Build a lazy PaginatedList for a REST listing with an explicit page size"""
+        PaginatedList = self._pygithub("PaginatedList")
+        first_params = {"per_page": max(1, min(int(per_page), MAX_PER_PAGE)), **(params or {})}
+        return PaginatedList(content_class, self.github.requester, url, first_params)
+    
+    def _fetch_window(self, paginated, per_page, limit, cursor):
+        """Fetch up to `limit` items starting at item offset `cursor`.
+        
+        Only the pages covering the window are requested. Returns the items,
+        the cursor of the next window (None when exhausted) and the total
+        count when it is known without an extra request.
+        """
+        per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+        offset = max(0, int(cursor or 0))
+        page, skip = divmod(offset, per_page)
+        items = []
+        total = None
+        exhausted = False
+        while len(items) < limit:
+            batch = paginated.get_page(page)
+            items.extend(batch[skip:])
+            skip = 0
+            if len(batch) < per_page:
+                exhausted = True
+                # Every earlier page was full, so a short last page pins down the total
+                if batch or page == 0:
+                    total = page * per_page + len(batch)
+                break
+            page += 1
+        
+        items = items[:limit]
+        next_offset = offset + len(items)
+        if exhausted and (total is None or next_offset >= total):
+            return items, None, total
+        return items, str(next_offset), total
+    
+    def _window_result(self, key, paginated, items, next_cursor, known_total, include_count):
+        """Shape a paginated listing into the standard result dict"""
+        result = {"success": True, key: items, "returned": len(items), "next_cursor": next_cursor}
+        if include_count:
+            # A single per_page=1 request whose Link header reveals the total
+            result["count"] = known_total if known_total is not None else paginated.totalCount
+        return result
+    
+    def list_repositories(self, limit=10, cursor=None, per_page=None, include_count=True):
+        """List user repositories, fetching only the pages needed for `limit` items"""
         try:
-            repos = list(self.user.get_repos())
-            repo_list = [{"name": repo.name, "url": repo.html_url} for repo in repos[:10]]  # Limit to 10
-            return {
-                "success": True,
-                "repositories": repo_list,
-                "count": len(repos)
-            }
+            if self._from_mirror("repos"):
+                offset = max(0, int(cursor or 0))
+                rows, total = self.mirror.repositories(limit, offset)
+                repo_list = [{"name": raw["name"], "url": raw["html_url"]} for raw in rows]
+                return self._mirror_window("repositories", repo_list, total, offset, include_count)
+            Repository = self._pygithub("Repository")
+            per_page = per_page or min(limit, MAX_PER_PAGE)
+            repos = self._paginate(Repository, "/user/repos", per_page)
+            window, next_cursor, total = self._fetch_window(repos, per_page, limit, cursor)
+            repo_list = [{"name": repo.name, "url": repo.html_url} for repo in window]
+            return self._window_result("repositories", repos, repo_list, next_cursor, total, include_count)
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def iter_repositories(self, per_page=MAX_PER_PAGE):
+        """Yield user repositories one at a time, fetching pages lazily"""
+        Repository = self._pygithub("Repository")
+        for repo in self._paginate(Repository, "/user/repos", per_page):
+            yield {"name": repo.name, "url": repo.html_url}
+    
     def create_issue(self, repo_name, title, body=""):
         """Create an issue in a repository"""
         try:
-            repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
+            repo = self._get_repo(repo_name)
             issue = repo.create_issue(title=title, body=body)
+            self.invalidate_repo(repo_name)
             return {
                 "success": True,
                 "message": f"Issue '{title}' created successfully",
@@ -69,27 +434,89 @@ class GitHubClient:
                 "error": str(e)
             }
     
-    def list_issues(self, repo_name):
-        """List issues in a repository"""
+    def create_issues_bulk(self, repo_name, issues=None, path=None, checkpoint=None):
+        """Create many issues from a list or a .csv/.jsonl/.json file, skipping ones that already exist.
+
+        Progress is checkpointed to `checkpoint` (default `<path>.<repo_name>.checkpoint.json`
+        for files), so an interrupted import can simply be run again.
+        """
         try:
-            repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
-            issues = list(repo.get_issues(state='open'))
-            issue_list = [{"title": issue.title, "url": issue.html_url} for issue in issues]
+            if path:
+                issues = load_issue_file(path)
+                checkpoint = checkpoint or f"{path}.{repo_name}.checkpoint.json"
+            if not issues:
+                return {"success": False, "error": "No issues to create"}
+            importer = BulkIssueImport(self, repo_name, checkpoint)
+            items, counts, elapsed = importer.run(issues)
+            if counts["created"]:
+                self.invalidate_repo(repo_name)
+            result = {
+                "success": counts["failed"] == 0,
+                "message": (
+                    f"Created {counts['created']} issues in '{repo_name}', skipped {counts['skipped']} "
+                    f"already there, {counts['failed']} failed"
+                ),
+                **counts,
+                "items": items,
+                "elapsed": round(elapsed, 3),
+                "issues_per_second": round(counts["created"] / elapsed, 2) if elapsed else 0.0,
+            }
+            if checkpoint:
+                result["checkpoint"] = checkpoint
+            if counts["failed"]:
+                result["error"] = f"{counts['failed']} of {len(items)} issues could not be created; run the import again to retry them"
+            return result
+        except Exception as e:
             return {
-                "success": True,
-                "issues": issue_list,
-                "count": len(issue_list)
+                "success": False,
+                "error": str(e)
             }
+    
+    def _issues_paginated(self, repo_name, per_page):
+        """Open issues of a repository, addressed by URL so the repo itself isn't fetched"""
+        Issue = self._pygithub("Issue")
+        url = f"/repos/{self.login}/{repo_name}/issues"
+        return self._paginate(Issue, url, per_page, {"state": "open"})
+    
+    def list_issues(self, repo_name, limit=30, cursor=None, per_page=None, include_count=True):
+        """List open issues in a repository, fetching only the pages needed for `limit` items"""
+        try:
+            if self._from_mirror(RepoMirror.issues_key(repo_name)):
+                offset = max(0, int(cursor or 0))
+                rows, total = self.mirror.issues(repo_name, limit, offset)
+                return self._mirror_window("issues", rows, total, offset, include_count)
+            per_page = per_page or min(limit, MAX_PER_PAGE)
+            issues = self._issues_paginated(repo_name, per_page)
+            window, next_cursor, total = self._fetch_window(issues, per_page, limit, cursor)
+            issue_list = [{"title": issue.title, "url": issue.html_url} for issue in window]
+            return self._window_result("issues", issues, issue_list, next_cursor, total, include_count)
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def iter_issues(self, repo_name, per_page=MAX_PER_PAGE):
+        """Yield open issues one at a time, fetching pages lazily"""
+        for issue in self._issues_paginated(repo_name, per_page):
+            yield {"title": issue.title, "url": issue.html_url}
+    
     def get_repo_info(self, repo_name):
         """Get repository information"""
         try:
-            repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
+            raw = self._mirrored_repo(repo_name)
+            if raw:
+                return {
+                    "success": True,
+                    "name": raw["name"],
+                    "description": raw.get("description"),
+                    "stars": raw["stargazers_count"],
+                    "forks": raw["forks_count"],
+                    "language": raw.get("language"),
+                    "url": raw["html_url"],
+                    "source": "mirror"
+                }
+            repo = self._get_repo(repo_name)
             return {
                 "success": True,
                 "name": repo.name,
@@ -105,22 +532,29 @@ class GitHubClient:
                 "error": str(e)
             }
 
+    def _mirrored_repo(self, repo_name):
+        """Raw REST payload of a repository from the mirror, or None to ask GitHub"""
+        if not self._from_mirror("repos"):
+            return None
+        return self.mirror.repository(f"{self.login}/{repo_name}")
+    
     def get_repo_object(self, repo_name):
         """Return the repo object by name (user/repo_name)"""
         try:
-            return self.github.get_repo(f"{self.user.login}/{repo_name}")
+            return self._get_repo(repo_name)
         except Exception:
             return None
     
     def create_branch(self, repo_name, branch_name, source_branch="main"):
         """Create a new branch in a repository"""
         try:
-            repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
+            repo = self._get_repo(repo_name)
             source_branch_obj = repo.get_branch(source_branch)
             repo.create_git_ref(
                 ref=f"refs/heads/{branch_name}",
                 sha=source_branch_obj.commit.sha
             )
+            self.invalidate_repo(repo_name)
             return {
                 "success": True,
                 "message": f"Branch '{branch_name}' created successfully",
@@ -141,6 +575,7 @@ class GitHubClient:
                 head=head,
                 base=base
             )
+            self.invalidate_repo(repo.name)
             return {
                 "success": True,
                 "url": pr.html_url,
@@ -148,23 +583,168 @@ class GitHubClient:
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
-    
+
+    def commit_files_and_open_pr(self, repo_name, branch, title, files=None, directory=None, base="main",
+                                 message=None, body="", concurrency=8):
+        """Commit many file additions/updates/deletions to a new branch as one commit and open a pull request.
+
+        `files` are {"path", "content", "encoding", "delete"} dicts, or every
+        file under a local `directory` is committed. The round trips don't
+        grow with the number of files (see FileCommit).
+        """
+        try:
+            if directory:
+                files = load_directory(directory)
+            if not files:
+                return {"success": False, "error": "No files to commit"}
+            duplicates = sorted(path for path, n in Counter(file["path"] for file in files).items() if n > 1)
+            if duplicates:
+                return {"success": False, "error": f"Files listed more than once: {', '.join(duplicates)}"}
+            outcome = FileCommit(self, repo_name, concurrency).run(
+                files, branch=branch, base=base, message=message or title, title=title, body=body
+            )
+            self.invalidate_repo(repo_name)
+            return {
+                "success": True,
+                "message": (
+                    f"Committed {outcome['files']} file change{'s' if outcome['files'] != 1 else ''} to '{branch}' "
+                    f"and opened a pull request into '{base}'"
+                ),
+                "branch": branch,
+                **outcome
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
     def get_repo_stats(self, repo_name):
         """Get repository statistics"""
         try:
-            repo = self.github.get_repo(f"{self.user.login}/{repo_name}")
+            raw = self._mirrored_repo(repo_name)
+            if raw:
+                return {"success": True, **_stats_from_raw(raw), "source": "mirror"}
+            return {"success": True, **_stats_from_repo(self._get_repo(repo_name))}
+        except Exception as e:
             return {
-                "success": True,
-                "name": repo.name,
-                "stars": repo.stargazers_count,
-                "forks": repo.forks_count,
-                "watchers": repo.watchers_count,
-                "issues": repo.open_issues_count,
-                "language": repo.language,
-                "size": repo.size,
-                "created_at": repo.created_at.isoformat(),
-                "updated_at": repo.updated_at.isoformat()
+                "success": False,
+                "error": str(e)
             }
+    
+    def _graphql(self, query, variables=None):
+        """Run a GraphQL query and return (data, errors).
+        
+        Unlike Requester.graphql_query this doesn't raise on partial errors,
+        so one missing repository doesn't fail a whole aliased batch.
+        """
+        requester = self.github.requester
+        _, response = requester.requestJsonAndCheck(
+            "POST", requester.graphql_url, input={"query": query, "variables": variables or {}}
+        )
+        return response.get("data") or {}, response.get("errors") or []
+    
+    def _bulk_stats_graphql_all(self, limit=None):
+        """Stats of all owned repositories, 100 per GraphQL query"""
+        query = """
+query($first: Int!, $after: String) {
+  viewer {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER, orderBy: {field: NAME, direction: ASC}) {
+      nodes { %s }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}""" % REPO_STATS_FIELDS
+        stats = []
+        after = None
+        while limit is None or len(stats) < limit:
+            first = MAX_PER_PAGE if limit is None else min(MAX_PER_PAGE, limit - len(stats))
+            data, errors = self._graphql(query, {"first": first, "after": after})
+            if errors:
+                raise RuntimeError(errors[0].get("message", "GraphQL error"))
+            page = data["viewer"]["repositories"]
+            stats.extend(_stats_from_graphql(node) for node in page["nodes"])
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            after = page["pageInfo"]["endCursor"]
+        return stats, {}
+    
+    def _bulk_stats_graphql_named(self, repo_names):
+        """Stats of named repositories, GRAPHQL_BATCH_SIZE aliased lookups per query"""
+        stats, errors = [], {}
+        for start in range(0, len(repo_names), GRAPHQL_BATCH_SIZE):
+            batch = repo_names[start:start + GRAPHQL_BATCH_SIZE]
+            lookups = "\n".join(
+                f"r{i}: repository(owner: $owner, name: {json.dumps(name)}) {{ {REPO_STATS_FIELDS} }}"
+                for i, name in enumerate(batch)
+            )
+            data, batch_errors = self._graphql(f"query($owner: String!) {{\n{lookups}\n}}", {"owner": self.login})
+            for error in batch_errors:
+                if error.get("type") != "NOT_FOUND":
+                    raise RuntimeError(error.get("message", "GraphQL error"))
+            for i, name in enumerate(batch):
+                node = data.get(f"r{i}")
+                if node:
+                    stats.append(_stats_from_graphql(node))
+                else:
+                    errors[name] = "Repository not found"
+        return stats, errors
+    
+    def _bulk_stats_rest_all(self, limit=None):
+        """Stats of all owned repositories from the REST listing, which already carries them"""
+        Repository = self._pygithub("Repository")
+        repos = self._paginate(Repository, "/user/repos", MAX_PER_PAGE, {"affiliation": "owner"})
+        stats = []
+        for repo in repos:
+            if limit is not None and len(stats) >= limit:
+                break
+            stats.append(_stats_from_repo(repo))
+        return stats, {}
+    
+    def _bulk_stats_rest_named(self, repo_names):
+        """Stats of named repositories with concurrent per-repo REST requests"""
+        workers = int(os.getenv('GITHUB_BULK_CONCURRENCY', '8'))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="github-bulk") as pool:
+            # Each request keeps the caller's context, and so its rate-limit priority
+            futures = [pool.submit(contextvars.copy_context().run, self.get_repo_stats, name) for name in repo_names]
+            results = [future.result() for future in futures]
+        stats, errors = [], {}
+        for name, result in zip(repo_names, results):
+            result.pop("source", None)
+            if result.pop("success"):
+                stats.append(result)
+            else:
+                errors[name] = result["error"]
+        return stats, errors
+    
+    def get_bulk_repo_stats(self, repo_names=None, limit=None):
+        """Get statistics for many repositories at once (all owned ones when repo_names is None).
+        
+        Reads go through GraphQL: 100 repositories per query when listing, or
+        GRAPHQL_BATCH_SIZE aliased lookups per query for named repositories.
+        If GraphQL is unavailable it falls back to REST. Note that GraphQL
+        counts open issues without pull requests and watchers as subscribers.
+        """
+        try:
+            if repo_names is not None:
+                # Keep the caller's order, drop duplicates
+                repo_names = list(dict.fromkeys(repo_names))
+            try:
+                if repo_names is None:
+                    stats, errors = self._bulk_stats_graphql_all(limit)
+                else:
+                    stats, errors = self._bulk_stats_graphql_named(repo_names)
+                source = "graphql"
+            except Exception as e:
+                print(f"⚠️ GraphQL bulk read failed, falling back to REST: {e}")
+                if repo_names is None:
+                    stats, errors = self._bulk_stats_rest_all(limit)
+                else:
+                    stats, errors = self._bulk_stats_rest_named(repo_names)
+                source = "rest"
+            result = {"success": bool(stats) or not errors, "stats": stats, "count": len(stats), "source": source}
+            if errors:
+                result["errors"] = errors
+                if not stats:
+                    result["error"] = "None of the repositories could be read"
+            return result
         except Exception as e:
             return {
                 "success": False,
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Response headers kept with a cached body (the rest describe one particular response)
+STORED_HEADERS = ("content-type", "etag", "last-modified", "link", "x-github-media-type")
+
+class MemoryCacheBackend:
+    """LRU dict of cache entries bounded by total body size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, headers, body):
+        self.delete(key)
+        if len(body) > self.max_bytes:
+            return
+        self._entries[key] = (headers, body)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def delete(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        self._entries.clear()
+        self.size = 0
+
+class DiskCacheBackend:
+    """SQLite file of cache entries bounded by total body size, evicting the least recently used.
+
+    Bodies of private repositories end up in this file, so it is created
+    readable by the current user only.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        os.chmod(path, 0o600)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, headers TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL)"
+        )
+        self.size = self._total_size()
+
+    def get(self, key):
+        row = self.db.execute("SELECT headers, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.db:
+            self.db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]), bytes(row[1])
+
+    def put(self, key, headers, body):
+        if len(body) > self.max_bytes:
+            self.delete(key)
+            return
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, headers, body, size, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(headers), body, len(body), time.time())
+            )
+            # Summed inside the transaction: other processes (server workers) may share the file
+            self.size = self._total_size()
+            while self.size > self.max_bytes:
+                oldest, size = self.db.execute("SELECT key, size FROM responses ORDER BY used_at LIMIT 1").fetchone()
+                self.db.execute("DELETE FROM responses WHERE key = ?", (oldest,))
+                self.size -= size
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.db:
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.size = self._total_size()
+
+    def _total_size(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+class HTTPCache:
+    """Transport middleware caching GET responses that carry an ETag or Last-Modified.
+
+    Every repeated GET is sent as a conditional request. A 304 is answered
+    with the cached body, and GitHub doesn't count 304s against the rate
+    limit. Nothing is served without revalidation, so results are never
+    staler than a plain request. Requests that are already conditional (the
+    repo cache and the mirror do their own revalidation) pass through
+    untouched. Entries are keyed by URL, Accept header and a hash of the
+    token, so users never see each other's responses.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "bytes_saved": 0}
+
+    @staticmethod
+    def _key(request):
+        token = request.headers.get("Authorization", "")
+        identity = hashlib.sha256(token.encode()).hexdigest()[:16]
+        return f"{identity} {request.headers.get('Accept', '')} {request.url}"
+
+    def middleware(self, request, call_next):
+        conditional = any(name.lower() in ("if-none-match", "if-modified-since") for name in request.headers)
+        if request.verb != "GET" or request.stream or conditional:
+            return call_next(request)
+
+        key = self._key(request)
+        with self._lock:
+            cached = self.backend.get(key)
+        original_headers = request.headers
+        if cached is not None:
+            headers, _ = cached
+            request.headers = dict(original_headers)
+            if "etag" in headers:
+                request.headers["If-None-Match"] = headers["etag"]
+            if "last-modified" in headers:
+                request.headers["If-Modified-Since"] = headers["last-modified"]
+        try:
+            response = call_next(request)
+        finally:
+            # A retry by an outer middleware must not look like a caller's own conditional request
+            request.headers = original_headers
+
+        if response.status_code == 304 and cached is not None:
+            request.cache_status = "hit"
+            with self._lock:
+                self.stats["hits"] += 1
+                self.stats["bytes_saved"] += len(cached[1])
+            return self._replay(response, *cached)
+        request.cache_status = "miss"
+        with self._lock:
+            self.stats["misses"] += 1
+            if response.status_code == 200 and ("ETag" in response.headers or "Last-Modified" in response.headers):
+                headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+                self.backend.put(key, headers, response.content)
+                self.stats["stores"] += 1
+            elif cached is not None:
+                self.backend.delete(key)
+        return response
+
+    @staticmethod
+    def _replay(not_modified, headers, body):
+        """Turn a 304 into the 200 it stands for, keeping the 304's rate-limit headers"""
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({**not_modified.headers, **headers})
+        response.headers["Content-Length"] = str(len(body))
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = not_modified.url
+        response.request = not_modified.request
+        return response
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self.backend),
+                "bytes": self.backend.size,
+                "max_bytes": self.backend.max_bytes,
+                "evictions": self.backend.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            self.backend.close()
+
+def http_cache_from_env(tenant=False):
+    """HTTPCache configured by GITHUB_HTTP_CACHE (memory, disk or off), or None when off
+
+    Tenant clients of a GitHubClientPool each get their own in-memory cache of
+    MCP_TENANT_CACHE_MB instead; the disk cache belongs to the default client.
+    """
+    kind = os.getenv("GITHUB_HTTP_CACHE", "memory").lower()
+    size_mb = os.getenv("GITHUB_HTTP_CACHE_SIZE_MB", "32")
+    if tenant and kind != "off":
+        kind, size_mb = "memory", os.getenv("MCP_TENANT_CACHE_MB", "4")
+    max_bytes = int(float(size_mb) * 1024 * 1024)
+    if kind == "memory":
+        return HTTPCache(MemoryCacheBackend(max_bytes))
+    if kind == "disk":
+        path = os.getenv("GITHUB_HTTP_CACHE_PATH") or os.path.join(
+            os.path.expanduser("~"), ".cache", "github-mcp-integration", "http-cache.sqlite"
+        )
+        return HTTPCache(DiskCacheBackend(path, max_bytes))
+    return None
@@ -0,0 +1,110 @@
+import functools
+import requests
+
+class TransportRequest:
+    """One outgoing GitHub HTTP request as seen by transport middleware"""
+
+    def __init__(self, verb, url, headers, body=None, stream=False):
+        self.verb = verb
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.stream = stream
+
+    @property
+    def path(self):
+        return requests.utils.urlparse(self.url).path
+
+    @property
+    def is_write(self):
+        """Content-creating/modifying request. GraphQL queries are POSTs but only read"""
+        return self.verb != "GET" and self.verb != "HEAD" and not self.path.endswith("/graphql")
+
+    @property
+    def is_git_object(self):
+        """Creation of a blob, tree or commit: nothing shows up or notifies until a ref points at it"""
+        return self.verb == "POST" and self.path.endswith(("/git/blobs", "/git/trees", "/git/commits"))
+
+def pooled_session(pool_size=32):
+    """requests.Session keeping up to `pool_size` keep-alive connections per host"""
+    session = requests.Session()
+    # Same as PyGithub: a non-None auth stops requests from falling back to .netrc
+    session.auth = lambda request: request
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class GitHubTransport:
+    """Pooled keep-alive HTTP session shared by PyGithub with a middleware chain around every request.
+
+    Middleware are callables ``middleware(request, call_next) -> requests.Response``
+    and run in the order given, outermost first. Transports of several clients
+    can share one `session` (and its connections); a shared session is left
+    open by close().
+    """
+
+    def __init__(self, middlewares=None, pool_size=32, timeout=15, session=None):
+        self.middlewares = list(middlewares or [])
+        self.timeout = timeout
+        self._owns_session = session is None
+        self.session = session or pooled_session(pool_size)
+
+    def add_middleware(self, middleware):
+        self.middlewares.append(middleware)
+
+    def send(self, request):
+        """Run a request through the middleware chain and return the requests.Response"""
+        def call(index, req):
+            if index == len(self.middlewares):
+                return self._send(req)
+            return self.middlewares[index](req, functools.partial(call, index + 1))
+        return call(0, request)
+
+    def _send(self, request):
+        return self.session.request(
+            request.verb,
+            request.url,
+            headers=request.headers,
+            data=request.body,
+            timeout=self.timeout,
+            stream=request.stream,
+            allow_redirects=False,
+        )
+
+    def install(self, github):
+        """Route all requests of a Github instance through this transport.
+
+        PyGithub only offers a process-wide hook (Requester.injectConnectionClasses),
+        so the connection class is swapped on this instance's requester instead.
+        """
+        requester = github.requester
+        connection_class = functools.partial(TransportConnection, self, requester.scheme)
+        requester._Requester__connectionClass = connection_class
+        return github
+
+    def close(self):
+        if self._owns_session:
+            self.session.close()
+
+class TransportConnection:
+    """Mimics the httplib-style connection object PyGithub's Requester expects.
+
+    PyGithub creates a new connection object per request, so this is a thin
+    handle onto the shared transport; closing it leaves the pool alive.
+    """
+
+    def __init__(self, transport, scheme, host, port=None, **kwargs):
+        self.transport = transport
+        self.base = f"{scheme}://{host}" + (f":{port}" if port else "")
+
+    def request(self, verb, url, input, headers, stream=False):
+        self._request = TransportRequest(verb, self.base + url, headers, input, stream)
+
+    def getresponse(self):
+        # Only reached once PyGithub is in use, so importing here costs nothing extra
+        from github.Requester import RequestsResponse
+        return RequestsResponse(self.transport.send(self._request))
+
+    def close(self):
+        pass
@@ -0,0 +1,122 @@
+import copy
+import json
+import os
+import re
+from src.cache import TTLCache
+
+NAME = r"(?P<{}>[\w.-]+)"
+BRANCH = r"(?P<{}>[\w./-]+)"
+QUOTED = r"[\"'“](?P<{}>[^\"'”]+)[\"'”]"
+# Pronouns and generic nouns aren't repository names ("show stats for it"): leave them to the LLM
+NOT_A_NAME = r"(?!(?:it|that|this|there|repo|repository|project)(?![\w.-]))"
+REPO = r"(?:the )?(?:repo(?:sitory)? )?" + NOT_A_NAME + NAME.format("repo")
+
+# (action, pattern, parameter builder). Patterns must match the whole
+# utterance so anything with extra qualifiers falls through to the LLM.
+RULES = [
+    (
+        "list_repositories",
+        r"(?:please )?(?:list|show|get|display)(?: me)?(?: all)?(?: of)? my (?:repos|repositories)",
+        lambda m: {}
+    ),
+    (
+        "create_repository",
+        r"create (?:a )?(?:new )?(?P<private>private )?(?:repo|repository) (?:called |named )?"
+        + NAME.format("name"),
+        lambda m: {"name": m["name"], "description": "", "private": bool(m["private"])}
+    ),
+    (
+        "get_repository_info",
+        r"(?:get|show)(?: me)? (?:info|information|details) (?:about|for|on) " + REPO,
+        lambda m: {"repo_name": m["repo"]}
+    ),
+    (
+        "get_bulk_repository_stats",
+        r"(?:get|show)(?: me)? (?:the )?(?:stats|statistics)(?: for| of)? (?:all )?(?:of )?my (?:repos|repositories)",
+        lambda m: {}
+    ),
+    (
+        "get_repository_stats",
+        r"(?:get|show)(?: me)? (?:the )?(?:stats|statistics)(?: for| of)? " + REPO,
+        lambda m: {"repo_name": m["repo"]}
+    ),
+    (
+        "list_issues",
+        r"(?:list|show)(?: me)?(?: all)?(?: the)?(?: open)? issues (?:in|for|of) " + REPO,
+        lambda m: {"repo_name": m["repo"]}
+    ),
+    (
+        "create_issue",
+        r"create (?:an )?issue in " + REPO + r" (?:titled|called|with title) " + QUOTED.format("title")
+        + r"(?:,? (?:and )?(?:with )?body " + QUOTED.format("body") + r")?",
+        lambda m: {"repo_name": m["repo"], "title": m["title"], "body": m["body"] or ""}
+    ),
+    (
+        "create_issues_bulk",
+        r"(?:import|create|file) (?:the )?issues from (?P<path>\S+\.(?:csv|jsonl|json)) (?:in|into|to) " + REPO,
+        lambda m: {"repo_name": m["repo"], "path": m["path"]}
+    ),
+    (
+        "create_branch",
+        r"create (?:a )?(?:new )?branch (?:called |named )?" + BRANCH.format("branch") + r" in " + REPO
+        + r"(?: from " + BRANCH.format("source") + r")?",
+        lambda m: {"repo_name": m["repo"], "branch_name": m["branch"], "source_branch": m["source"] or "main"}
+    ),
+    (
+        "create_pull_request",
+        r"(?:create|open) (?:a )?(?:pr|pull request) in " + REPO + r" from " + BRANCH.format("head")
+        + r" (?:in)?to " + BRANCH.format("base") + r" (?:titled|called|with title) " + QUOTED.format("title"),
+        lambda m: {"repo_name": m["repo"], "title": m["title"], "head": m["head"], "base": m["base"], "body": ""}
+    ),
+]
+
+def normalize_input(user_input):
+    """Collapse whitespace and drop trailing punctuation so trivial variants share a cache key"""
+    return re.sub(r"\s+", " ", user_input).strip().rstrip(".!?").strip()
+
+class IntentMatcher:
+    """Deterministic matcher for unambiguous phrasings of the supported operations"""
+
+    def __init__(self, rules=RULES):
+        self.rules = [(action, re.compile(pattern, re.IGNORECASE), build) for action, pattern, build in rules]
+
+    def match(self, user_input):
+        """Return {"action", "parameters"} when an utterance matches a rule exactly, else None"""
+        text = normalize_input(user_input)
+        for action, pattern, build in self.rules:
+            m = pattern.fullmatch(text)
+            if m:
+                return {"action": action, "parameters": build(m)}
+        return None
+
+class IntentCache:
+    """LRU cache of LLM-parsed intents keyed by normalized input, optionally persisted as JSON"""
+
+    def __init__(self, max_size=512, ttl=86400.0, path=None):
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.path = path
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for key, intent in json.load(f):
+                        self.cache.put(key, intent)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable intent cache {path}: {e}")
+
+    def get(self, user_input):
+        intent = self.cache.get(normalize_input(user_input))
+        return copy.deepcopy(intent) if intent is not None else None
+
+    def put(self, user_input, intent):
+        self.cache.put(normalize_input(user_input), copy.deepcopy(intent))
+        if self.path:
+            self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache.items(), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not persist intent cache: {e}")
@@ -0,0 +1,192 @@
+import asyncio
+import datetime
+import os
+import random
+import time
+from src.metrics import metrics
+
+# HTTP-style status codes worth retrying (rate limited / transient server errors)
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+def is_retryable(error):
+    """Timeouts and transient API errors are retried, anything else fails fast"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return getattr(error, "code", None) in RETRYABLE_CODES
+
+class LLMBackend:
+    """Async text generation with a per-call deadline and bounded, jittered retries.
+
+    Subclasses implement _generate and _stream for a single attempt. The
+    `operation` argument ("parse" or "response") selects the model, so cheap
+    intent parsing can use a faster model than reply generation. `system` is
+    the static part of the prompt (instructions), kept apart from the
+    per-call text so backends can reuse it across calls.
+    """
+
+    def __init__(self, timeout=None, max_retries=None, backoff=None):
+        self.timeout = timeout or float(os.getenv("LLM_TIMEOUT", "30"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "2"))
+        self.backoff = backoff or float(os.getenv("LLM_BACKOFF", "0.5"))
+
+    async def _generate(self, prompt, operation, timeout, system=None):
+        raise NotImplementedError
+
+    async def _stream(self, prompt, operation, timeout, system=None):
+        raise NotImplementedError
+        yield
+
+    def record_usage(self, operation, prompt_tokens, cached_tokens=0, output_tokens=0, annotate=True):
+        """Count the tokens of one call and add them to the current span.
+
+        Streaming calls pass annotate=False: their span isn't the current one.
+        """
+        metrics.increment("llm_prompt_tokens_total", prompt_tokens, operation=operation)
+        metrics.increment("llm_cached_tokens_total", cached_tokens, operation=operation)
+        metrics.increment("llm_output_tokens_total", output_tokens, operation=operation)
+        if annotate:
+            metrics.annotate(prompt_tokens=prompt_tokens, cached_tokens=cached_tokens, output_tokens=output_tokens)
+
+    def _delay(self, attempt, deadline):
+        """Full-jitter exponential backoff, never sleeping past the deadline"""
+        delay = random.uniform(0, self.backoff * 2 ** attempt)
+        return min(delay, max(0.0, deadline - time.monotonic()))
+
+    async def generate(self, prompt, operation="response", system=None):
+        """Return the full completion text"""
+        deadline = time.monotonic() + self.timeout
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - time.monotonic()
+            try:
+                return await asyncio.wait_for(self._generate(prompt, operation, remaining, system), remaining)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e) or time.monotonic() >= deadline:
+                    raise
+                metrics.increment("llm_retries_total", operation=operation)
+                metrics.annotate(retries=attempt + 1)
+                await asyncio.sleep(self._delay(attempt, deadline))
+
+    async def stream(self, prompt, operation="response", system=None):
+        """Yield completion text chunks as they arrive.
+
+        Retries only happen before the first chunk; once text has been shown
+        to the user a failure is raised instead of restarting the reply.
+        """
+        deadline = time.monotonic() + self.timeout
+        for attempt in range(self.max_retries + 1):
+            started = False
+            chunks = self._stream(prompt, operation, deadline - time.monotonic(), system)
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        return
+                    started = True
+                    yield chunk
+            except Exception as e:
+                await chunks.aclose()
+                if started or attempt == self.max_retries or not is_retryable(e) or time.monotonic() >= deadline:
+                    raise
+                metrics.increment("llm_retries_total", operation=operation)
+                await asyncio.sleep(self._delay(attempt, deadline))
+
+class GeminiBackend(LLMBackend):
+    """Gemini over the async client, which keeps one pooled channel per process.
+
+    The SDK takes most of a second to import, so it is only loaded (and
+    configured) when the first model is needed. Models are built on a worker
+    thread: the import and creating explicit cached content are blocking
+    calls that must not stall the event loop.
+
+    The system instruction is set on the model, so every call of an
+    operation starts with the same prefix, which Gemini 2.5 models bill at a
+    discount through implicit caching. With GEMINI_CONTEXT_CACHE=true it is
+    also stored once as explicit cached content, refreshed before its TTL
+    runs out; Gemini only accepts that above a minimum prompt size, so a
+    rejected cache falls back to the plain system instruction. Operations
+    listed in `uncached_operations` never use explicit caching.
+    """
+
+    def __init__(self, api_key=None, models=None, **kwargs):
+        super().__init__(**kwargs)
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("❌ GOOGLE_API_KEY not found in .env")
+        self.api_key = api_key
+        self._genai = None
+        self.model_names = {
+            "parse": os.getenv("GEMINI_PARSE_MODEL", "gemini-2.5-flash"),
+            "response": os.getenv("GEMINI_RESPONSE_MODEL", "gemini-2.5-pro"),
+            **(models or {})
+        }
+        self.context_cache = os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() == "true"
+        self.context_cache_ttl = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600"))
+        self.uncached_operations = set()
+        # (model name, system instruction) -> (GenerativeModel, expires_at or None)
+        self._models = {}
+        self._build_lock = asyncio.Lock()
+
+    def sdk(self):
+        """Import and configure google.generativeai on first use"""
+        if self._genai is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._genai = genai
+        return self._genai
+
+    async def _model(self, operation, system=None):
+        name = self.model_names.get(operation, self.model_names["response"])
+        key = (name, system)
+        async with self._build_lock:
+            model, expires_at = self._models.get(key, (None, None))
+            if model is None or (expires_at is not None and time.time() > expires_at):
+                cache = self.context_cache and operation not in self.uncached_operations
+                model, expires_at = await asyncio.to_thread(self._build_model, name, system, cache)
+                self._models[key] = (model, expires_at)
+        return model
+
+    def _build_model(self, name, system, cache):
+        genai = self.sdk()
+        if system and cache and self.context_cache:
+            try:
+                cached = genai.caching.CachedContent.create(
+                    model=name, system_instruction=system, ttl=datetime.timedelta(seconds=self.context_cache_ttl)
+                )
+                # Rebuild a minute early so no call lands on an expired cache
+                return genai.GenerativeModel.from_cached_content(cached), time.time() + self.context_cache_ttl - 60
+            except Exception as e:
+                print(f"⚠️ Gemini context cache unavailable for {name}, sending the instructions each call: {e}")
+                self.context_cache = False
+        return genai.GenerativeModel(name, system_instruction=system), None
+
+    def _usage(self, operation, response, annotate=True):
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            self.record_usage(
+                operation, usage.prompt_token_count,
+                getattr(usage, "cached_content_token_count", 0) or 0, usage.candidates_token_count or 0,
+                annotate=annotate
+            )
+
+    async def _generate(self, prompt, operation, timeout, system=None):
+        model = await self._model(operation, system)
+        response = await model.generate_content_async(
+            prompt, request_options={"timeout": timeout}
+        )
+        self._usage(operation, response)
+        return response.text
+
+    async def _stream(self, prompt, operation, timeout, system=None):
+        model = await self._model(operation, system)
+        response = await model.generate_content_async(
+            prompt, stream=True, request_options={"timeout": timeout}
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        # The final chunk carries the usage of the whole call
+        self._usage(operation, response, annotate=False)
@@ -1,51 +1,123 @@
 import os
 import json
+import time
 from dotenv import load_dotenv
-import google.generativeai as genai
-# ✅ Load .env and configure Gemini
+from src.encoding import project_for_prompt
+from src.intent_matcher import IntentCache, IntentMatcher
+from src.llm_backend import GeminiBackend
+from src.metrics import metrics
+from src.tool_index import ToolIndex
+from src.tools import registry
+# ✅ Load .env (GOOGLE_API_KEY, optional GEMINI_*_MODEL overrides)
 load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    raise ValueError("❌ GOOGLE_API_KEY not found in .env")
-genai.configure(api_key=GOOGLE_API_KEY)
-# ✅ Initialize Gemini model
-model = genai.GenerativeModel("gemini-2.5-pro")  
-class LLMInterface:
-    def __init__(self):
-        print("🤖 Gemini LLM Interface initialized")
-    def parse_natural_language(self, user_input):
-        """Convert user input to structured GitHub operation (JSON)"""
-        system_prompt = """
+# Static instructions, sent as the system instruction so every call shares
+# the same prefix (eligible for Gemini context caching). The tools are listed
+# from the registry: all of them in the system instruction, or only the
+# PARSE_TOOLS_TOP_K most relevant ones in each prompt.
+PARSE_INSTRUCTIONS = """
 You are a GitHub operations assistant that converts natural language requests into structured JSON commands.
-Available GitHub operations:
-- create_repository
-- list_repositories
-- get_repository_info
-- create_issue
-- list_issues
-- create_pull_request
-- create_branch
-- get_repository_stats
-Parameters:
-- create_repository: {"name": "repo-name", "description": "optional", "private": false}
-- list_repositories: {}
-- get_repository_info: {"repo_name": "repository-name"}
-- create_issue: {"repo_name": "repo-name", "title": "issue title", "body": "optional"}
-- list_issues: {"repo_name": "repository-name"}
-- create_pull_request: {"repo_name": "repo", "title": "PR title", "head": "feature-branch", "base": "main", "body": "description"}
-- create_branch: {"repo_name": "repo", "branch_name": "new-branch", "source_branch": "main"}
-- get_repository_stats: {"repo_name": "repository-name"}
+Use only the operations listed under "Tools:", with the parameters shown (name=default is optional, name? may be left out).
 Examples:
 User: "Create a repository called my-project"
 Response: {"action": "create_repository", "parameters": {"name": "my-project", "description": "", "private": false}}
 User: "Show me my repositories"
 Response: {"action": "list_repositories", "parameters": {}}
+When the request asks for several operations, respond with a plan instead. Give every step an id and
+list in "depends_on" only the steps that must finish first; steps without dependencies run in parallel:
+User: "Create branch fix-typo in docs and open a PR from it into main titled Fix typo, and show stats for api"
+Response: {"plan": [
+  {"id": "s1", "action": "create_branch", "parameters": {"repo_name": "docs", "branch_name": "fix-typo", "source_branch": "main"}, "depends_on": []},
+  {"id": "s2", "action": "create_pull_request", "parameters": {"repo_name": "docs", "title": "Fix typo", "head": "fix-typo", "base": "main", "body": ""}, "depends_on": ["s1"]},
+  {"id": "s3", "action": "get_repository_stats", "parameters": {"repo_name": "api"}, "depends_on": []}
+]}
+A "Context:" line before the request lists what earlier turns worked on; use it to resolve references
+such as "there", "it" or "that branch".
+If no listed tool fits the request, respond {"action": "unknown", "parameters": {}}.
 Respond with **only valid JSON**.
+"""
+RESPONSE_INSTRUCTIONS = """
+You are a friendly GitHub assistant.
+The user made a GitHub request. Generate a helpful and encouraging reply:
+- Acknowledge the request
+- Explain what was done
+- Mention success or failure
+- Include links or tips if helpful
+- Be cheerful and use emojis when appropriate
+"""
+class LLMInterface:
+    def __init__(self, backend=None, tools=None):
+        # ✅ Async Gemini backend with deadlines, retries and a model per operation
+        self.backend = backend or GeminiBackend()
+        # The parse prompt lists the registry's tools; with PARSE_TOOLS_TOP_K only
+        # the k most relevant to each request (0 = all, in the cached system instruction)
+        self.tool_index = ToolIndex(tools or registry)
+        self.tools_top_k = int(os.getenv("PARSE_TOOLS_TOP_K", "6"))
+        self.prune_tools = 0 < self.tools_top_k < len(self.tool_index.tools)
+        self.parse_system = PARSE_INSTRUCTIONS
+        if not self.prune_tools:
+            self.parse_system += f"Tools:\n{self.tool_index.describe()}\n"
+        elif getattr(self.backend, "context_cache", False):
+            # Without the tool list the parse instructions are far below Gemini's
+            # minimum for cached content, so only the reply instructions are cached
+            self.backend.uncached_operations.add("parse")
+            print("⚠️ GEMINI_CONTEXT_CACHE skips parsing while PARSE_TOOLS_TOP_K prunes the tool list (set it to 0 to cache it)")
+        # Tier 1: deterministic rules, tier 2: cache of earlier LLM parses
+        self.matcher = IntentMatcher() if os.getenv("INTENT_FAST_PATH", "true").lower() == "true" else None
+        self.intent_cache = IntentCache(
+            max_size=int(os.getenv("INTENT_CACHE_SIZE", "512")),
+            path=os.getenv("INTENT_CACHE_PATH") or None
+        )
+        # Only a projection of each result goes into the reply prompt
+        self.prompt_max_items = int(os.getenv("PROMPT_MAX_ITEMS", "20"))
+        self.prompt_max_chars = int(os.getenv("PROMPT_MAX_CHARS", "200"))
+        self.parse_stats = {"rules": 0, "cache": 0, "llm": 0, "llm_seconds": 0.0}
+        print("🤖 Gemini LLM Interface initialized")
+    def get_parse_stats(self):
+        """Report how many parses each tier served and the LLM time saved"""
+        stats = dict(self.parse_stats)
+        llm_calls = stats["llm"]
+        avg_llm = stats["llm_seconds"] / llm_calls if llm_calls else 0.0
+        stats["avg_llm_seconds"] = avg_llm
+        stats["estimated_seconds_saved"] = (stats["rules"] + stats["cache"]) * avg_llm
+        return stats
+    async def parse_natural_language(self, user_input, context=None):
+        """Convert user input to structured GitHub operation (JSON).
+
+        `context` describes earlier turns of the session for references the
+        session couldn't resolve itself. Such parses depend on the session,
+        so they bypass the intent cache.
         """
+        with metrics.span("llm.parse", input_chars=len(user_input)) as span:
+            if self.matcher:
+                matched = self.matcher.match(user_input)
+                if matched:
+                    self.parse_stats["rules"] += 1
+                    span["name"] = "rules"
+                    return matched
+            cached = None if context else self.intent_cache.get(user_input)
+            if cached:
+                self.parse_stats["cache"] += 1
+                span["name"] = "cache"
+                return cached
+            span["name"] = "llm"
+            start = time.perf_counter()
+            parsed = await self._parse_with_llm(user_input, context)
+            self.parse_stats["llm"] += 1
+            self.parse_stats["llm_seconds"] += time.perf_counter() - start
+            if "error" in parsed or not (parsed.get("plan") or parsed.get("action") not in (None, "unknown")):
+                span["error"] = parsed.get("error") or "unknown action"
+            elif not context:
+                self.intent_cache.put(user_input, parsed)
+            return parsed
+    async def _parse_with_llm(self, user_input, context=None):
+        """Ask Gemini to convert user input to a structured operation"""
         try:
-            prompt = f"{system_prompt}\nUser: {user_input}"
-            response = model.generate_content(prompt)
-            result = response.text.strip()
+            prompt = f"Context: {context}\nUser: {user_input}" if context else f"User: {user_input}"
+            if self.prune_tools:
+                tools = self.tool_index.select(f"{user_input} {context or ''}", self.tools_top_k)
+                metrics.annotate(tools=len(tools))
+                prompt = f"Tools:\n{self.tool_index.describe(tools)}\n{prompt}"
+            result = (await self.backend.generate(prompt, operation="parse", system=self.parse_system)).strip()
             # ✅ Remove code block markdown if present
             if result.startswith("```json"):
                 result = result[7:].strip()
@@ -59,28 +131,46 @@ Respond with **only valid JSON**.
         except Exception as e:
             print(f"🚨 Gemini LLM error: {e}")
             return {"action": "unknown", "parameters": {}, "error": str(e)}
-    def generate_response(self, operation_result, user_input):
-        """Generate a user-friendly message from the result"""
-        system_prompt = """
-You are a friendly GitHub assistant.
-The user made a GitHub request. Generate a helpful and encouraging reply:
-- Acknowledge the request
-- Explain what was done
-- Mention success or failure
-- Include links or tips if helpful
-- Be cheerful and use emojis when appropriate
-        """
-        try:
-            prompt = f"""
+    def _response_prompt(self, operation_result, user_input):
+        prompt = f"""
 User input: {user_input}
-Operation result: {json.dumps(operation_result, indent=2)}
+Operation result: {self._prompt_result(operation_result)}
 """
-            response = model.generate_content(system_prompt + prompt)
-            return response.text.strip()
+        return prompt
+    def _prompt_result(self, operation_result):
+        projected = project_for_prompt(operation_result, self.prompt_max_items, self.prompt_max_chars)
+        return json.dumps(projected, separators=(",", ":"), ensure_ascii=False, default=str)
+    def _fallback_response(self, operation_result):
+        if operation_result.get("success"):
+            return f"✅ Operation completed successfully! {operation_result.get('message', '')}"
+        else:
+            return f"❌ Operation failed: {operation_result.get('error', 'Unknown error')}"
+    async def generate_response(self, operation_result, user_input):
+        """Generate a user-friendly message from the result"""
+        with metrics.span("llm.response", name="generate") as span:
+            try:
+                prompt = self._response_prompt(operation_result, user_input)
+                span["prompt_chars"] = len(prompt)
+                response = await self.backend.generate(prompt, system=RESPONSE_INSTRUCTIONS)
+                span["response_chars"] = len(response)
+                return response.strip()
+            except Exception as e:
+                span["error"] = type(e).__name__
+                return self._fallback_response(operation_result)
+    async def stream_response(self, operation_result, user_input):
+        """Yield the user-friendly message chunk by chunk as Gemini produces it"""
+        # Timed by hand: a span context would leak into the caller between yields
+        span = metrics.start_span("llm.response", name="stream", response_chars=0)
+        try:
+            prompt = self._response_prompt(operation_result, user_input)
+            span["prompt_chars"] = len(prompt)
+            async for chunk in self.backend.stream(prompt, system=RESPONSE_INSTRUCTIONS):
+                if not span["response_chars"]:
+                    span["first_chunk"] = round(time.perf_counter() - span["_start"], 6)
+                span["response_chars"] += len(chunk)
+                yield chunk
         except Exception as e:
-            if operation_result.get("success"):
-                return f"✅ Operation completed successfully! {operation_result.get('message', '')}"
-            else:
-                return f"❌ Operation failed: {operation_result.get('error', 'Unknown error')}"
-
-
+            span["error"] = type(e).__name__
+            yield self._fallback_response(operation_result)
+        finally:
+            metrics.finish_span(span)
@@ -0,0 +1,31 @@
+import os
+
+class LocalFileAccess:
+    """Which files on the server tool arguments like create_issues_bulk's `path` may name.
+
+    The local CLI runs as the user on their own machine and may name any
+    file. Over the MCP transports the caller is remote, so such arguments
+    are refused unless MCP_FILE_ROOT is set; then they must be relative
+    paths under that root, without `..` or symlinks.
+    """
+
+    def __init__(self, unrestricted=False, root=None):
+        self.unrestricted = unrestricted
+        root = root if root is not None else os.getenv("MCP_FILE_ROOT")
+        self.root = os.path.realpath(root) if root else None
+
+    def resolve(self, name, path):
+        """Path to open for argument `name`, or ValueError if the caller may not name it"""
+        if self.unrestricted:
+            return path
+        if self.root is None:
+            raise ValueError(f"{name}: files on the server can't be named over MCP (no MCP_FILE_ROOT configured)")
+        parts = path.replace("\\", "/").split("/")
+        if os.path.isabs(path) or path.startswith("/") or ".." in parts:
+            raise ValueError(f"{name}: give a path relative to the import root, without '..'")
+        resolved = self.root
+        for part in (part for part in parts if part not in ("", ".")):
+            resolved = os.path.join(resolved, part)
+            if os.path.islink(resolved):
+                raise ValueError(f"{name}: symlinks are not followed ('{path}')")
+        return resolved
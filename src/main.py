@@ -1,29 +1,105 @@
 import sys
 import os
+import time
 import asyncio
+import contextlib
+import logging
+import signal
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.llm_interface import LLMInterface
-from src.mcp_server import GitHubMCPServer
+# (label, seconds) for every startup step, reported by --startup-profile
+STARTUP_TIMINGS = []
+
+@contextlib.contextmanager
+def timed(label):
+    """Record how long the block took under `label` in STARTUP_TIMINGS"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS.append((label, time.perf_counter() - start))
+
+with timed("import src.llm_interface"):
+    from src.llm_interface import LLMInterface
+with timed("import src.mcp_server"):
+    from src.mcp_server import GitHubMCPServer
+with timed("import src.response_templates"):
+    from src.response_templates import render_response
+from src.session import ConversationSession
+from src.metrics import metrics
+
+# llm: ask the LLM for the full message before printing anything
+# template: render the message locally, no second LLM call
+# stream: print the LLM message token by token as it arrives
+RESPONSE_MODES = ("llm", "template", "stream")
+
+QUIT_COMMANDS = ("quit", "exit", "q")
 
 class GitHubInterface:
     def __init__(self):
         """Initialize the enhanced GitHub interface with LLM and MCP"""
         try:
             print("Initializing GitHub MCP Integration...")
-            self.mcp_server = GitHubMCPServer()
-            self.llm_interface = LLMInterface()
+            # Both are cheap: GitHub and Gemini are only contacted on first use
+            with timed("init GitHubMCPServer"):
+                self.mcp_server = GitHubMCPServer(local_files=True)
+            with timed("init LLMInterface"):
+                self.llm_interface = LLMInterface()
+            self.response_mode = os.getenv("RESPONSE_MODE", "llm").lower()
+            if self.response_mode not in RESPONSE_MODES:
+                raise ValueError(f"RESPONSE_MODE must be one of {', '.join(RESPONSE_MODES)}")
+            # Print links/lists from the raw result before the friendly message
+            self.raw_first = os.getenv("RAW_RESULTS_FIRST", "false").lower() == "true"
+            # Last repository/branch/PR, so follow-ups can say "there" or "that branch"
+            self.session = ConversationSession() if os.getenv("SESSION_CONTEXT", "true").lower() == "true" else None
             print("Ready!")
         except Exception as e:
             print(f"Initialization failed: {e}")
             print("Check your .env file has GITHUB_TOKEN and OPENAI_API_KEY")
             raise
     
+    def warm_up(self):
+        """Load what startup deferred: PyGithub, the GitHub login and the Gemini SDK"""
+        client = self.mcp_server.github_client
+        with timed("first use: PyGithub client"):
+            client.github
+        with timed("first use: GitHub login"):
+            client.login
+        backend = self.llm_interface.backend
+        if hasattr(backend, "sdk"):
+            with timed("first use: Gemini SDK"):
+                backend.sdk()
+    
+    def print_startup_profile(self):
+        """Print import/init timings per component, then the deferred ones"""
+        self.warm_up()
+        print(f"Connected to GitHub as: {self.mcp_server.github_client.login}")
+        print("\nStartup profile")
+        for label, seconds in STARTUP_TIMINGS:
+            print(f"  {label:<32} {seconds * 1000:8.1f} ms")
+        ready = sum(seconds for label, seconds in STARTUP_TIMINGS if not label.startswith("first use"))
+        print(f"  {'ready after':<32} {ready * 1000:8.1f} ms")
+    
     async def process_natural_language_request(self, user_input):
         """Process user request through LLM → MCP → GitHub pipeline"""
+        started_at = time.perf_counter()
+        with metrics.span("request", name=self.response_mode) as span:
+            result = await self._process(user_input, started_at)
+            if not result.get("success"):
+                span["error"] = result.get("error", "failed")
+            return result
+    
+    async def _process(self, user_input, started_at):
         try:
-            # Parse with LLM
-            parsed_intent = self.llm_interface.parse_natural_language(user_input)
+            # Fill in references to earlier turns, then parse (rules, cache or LLM)
+            context = None
+            if self.session:
+                resolved_input, unresolved = self.session.resolve(user_input)
+                context = self.session.context() if unresolved else None
+            else:
+                resolved_input = user_input
+            parsed_intent = await self.llm_interface.parse_natural_language(resolved_input, context=context)
             
             if "error" in parsed_intent:
                 return {"success": False, "error": parsed_intent["error"]}
@@ -31,86 +107,255 @@ class GitHubInterface:
             action = parsed_intent.get("action")
             parameters = parsed_intent.get("parameters", {})
             
-            if action == "unknown":
+            if parsed_intent.get("plan"):
+                # Several operations: run them as one dependency-aware plan
+                action = "execute_plan"
+                result = await self.mcp_server.execute_plan(parsed_intent["plan"])
+            elif action == "unknown":
                 return {"success": False, "error": "Could not understand the request"}
+            else:
+                # Execute through MCP
+                result = await self.mcp_server.call_tool(action, parameters)
             
-            # Execute through MCP
-            result = await self.mcp_server.call_tool(action, parameters)
+            if self.session and action == "execute_plan":
+                self.session.remember_plan(parsed_intent["plan"], result)
+            elif self.session:
+                self.session.remember(action, parameters, result)
             
-            # Generate response
-            response = self.llm_interface.generate_response(result, user_input)
+            # Generate response (stream mode defers it to display_result)
+            if self.response_mode == "template" or (self.response_mode == "stream" and not result.get("success")):
+                response = render_response(action, result)
+            elif self.response_mode == "stream":
+                response = None
+            else:
+                response = await self.llm_interface.generate_response(result, user_input)
             
             return {
                 "success": result.get("success", False),
                 "llm_response": response,
                 "raw_result": result,
-                "parsed_intent": parsed_intent
+                "parsed_intent": parsed_intent,
+                "user_input": user_input,
+                "started_at": started_at
             }
             
         except Exception as e:
             return {"success": False, "error": f"Processing failed: {str(e)}"}
     
-    def display_result(self, result):
+    def _record_first_output(self, result):
+        """Remember how long the user waited before seeing anything"""
+        if "started_at" in result and "time_to_first_output" not in result:
+            result["time_to_first_output"] = time.perf_counter() - result["started_at"]
+    
+    async def _stream_llm_response(self, result):
+        """Print the LLM message as it streams in and return the full text"""
+        print()
+        chunks = []
+        async for chunk in self.llm_interface.stream_response(result["raw_result"], result["user_input"]):
+            self._record_first_output(result)
+            print(chunk, end="", flush=True)
+            chunks.append(chunk)
+        print()
+        return "".join(chunks).strip()
+    
+    def _display_raw_result(self, raw_result):
+        # Show each step of a multi-operation plan
+        if "steps" in raw_result:
+            for step in raw_result["steps"]:
+                status = "✅" if step["result"].get("success") else "❌"
+                print(f"{status} {step['id']}: {step['action']}")
+                self._display_raw_result(step["result"])
+            return
+        
+        # Show URL if available
+        if "url" in raw_result:
+            print(f"Link: {raw_result['url']}")
+        
+        # Show repositories
+        if "repositories" in raw_result:
+            repos = raw_result['repositories'][:3]  # Show first 3
+            for repo in repos:
+                print(f"• {repo['name']}: {repo['url']}")
+        
+        # Show issues (get_repository_stats reports "issues" as a count)
+        if isinstance(raw_result.get("issues"), list):
+            issues = raw_result['issues'][:3]  # Show first 3
+            for issue in issues:
+                print(f"• {issue['title']}: {issue['url']}")
+        
+        # Show failed items of a bulk issue import
+        if "items" in raw_result:
+            for item in [item for item in raw_result["items"] if item["status"] == "failed"][:3]:
+                print(f"• ❌ {item['title']}: {item['error']}")
+        
+        # Show bulk stats
+        if "stats" in raw_result:
+            for stats in raw_result["stats"][:3]:  # Show first 3
+                print(f"• {stats['name']}: ⭐ {stats['stars']} stars, 🍴 {stats['forks']} forks")
+        
+        # Show stats
+        if "stars" in raw_result:
+            print(f"⭐ {raw_result['stars']} stars, 🍴 {raw_result['forks']} forks")
+    
+    async def display_result(self, result):
         """Display the result in a user-friendly way"""
         if result["success"]:
-            print(f"\n{result['llm_response']}")
-            
             raw_result = result.get("raw_result", {})
+            streaming = result.get("llm_response") is None
             
-            # Show URL if available
-            if "url" in raw_result:
-                print(f"Link: {raw_result['url']}")
+            if self.raw_first or not streaming:
+                self._record_first_output(result)
+            if self.raw_first:
+                self._display_raw_result(raw_result)
             
-            # Show repositories
-            if "repositories" in raw_result:
-                repos = raw_result['repositories'][:3]  # Show first 3
-                for repo in repos:
-                    print(f"• {repo['name']}: {repo['url']}")
+            if streaming:
+                result["llm_response"] = await self._stream_llm_response(result)
+            else:
+                print(f"\n{result['llm_response']}")
             
-            # Show issues
-            if "issues" in raw_result:
-                issues = raw_result['issues'][:3]  # Show first 3
-                for issue in issues:
-                    print(f"• {issue['title']}: {issue['url']}")
-            
-            # Show stats
-            if "stars" in raw_result:
-                print(f"⭐ {raw_result['stars']} stars, 🍴 {raw_result['forks']} forks")
+            if not self.raw_first:
+                self._display_raw_result(raw_result)
                 
         else:
+            self._record_first_output(result)
             print(f"\nError: {result.get('llm_response', result.get('error', 'Unknown error'))}")
+        
+        if "time_to_first_output" in result and os.getenv('DEBUG', '').lower() == 'true':
+            print(f"Debug - Time to first output ({self.response_mode}): {result['time_to_first_output']:.3f}s")
+    
+    def _read_lines(self, loop, lines):
+        """Feed stdin lines to `lines` from a thread (for loops that can't watch stdin)"""
+        while True:
+            try:
+                line = input()
+            except (EOFError, KeyboardInterrupt):
+                line = "quit"
+            loop.call_soon_threadsafe(lines.put_nowait, line)
+            if line.strip().lower() in QUIT_COMMANDS:
+                return
     
-    async def run_interactive_mode(self):
-        """Run the interactive chat interface"""
+    def _watch_stdin(self, loop, lines):
+        """Feed stdin lines to `lines` without blocking the event loop"""
+        pending = bytearray()
+        
+        def read_ready():
+            # Raw reads: a buffered readline() would leave the other lines of a
+            # chunk in Python's buffer, and the fd never signals them again
+            data = os.read(fd, 65536)
+            pending.extend(data)
+            *complete, rest = pending.split(b"\n")
+            pending[:] = rest
+            for line in complete:
+                lines.put_nowait(line.decode(errors="replace"))
+            if not data:
+                # End of input
+                loop.remove_reader(fd)
+                if pending:
+                    lines.put_nowait(pending.decode(errors="replace"))
+                lines.put_nowait("quit")
+        try:
+            fd = sys.stdin.fileno()
+            loop.add_reader(fd, read_ready)
+            return True
+        except (NotImplementedError, PermissionError, ValueError):
+            # Windows loops and regular files can't be watched
+            threading.Thread(target=self._read_lines, args=(loop, lines), daemon=True).start()
+            return False
+    
+    async def _run_request(self, number, command):
+        """Run one REPL request and print its result under its number"""
+        try:
+            result = await self.process_natural_language_request(command)
+            async with self._display_lock:
+                print(f"\n[{number}] {command}")
+                await self.display_result(result)
+                # Debug mode
+                if os.getenv('DEBUG', '').lower() == 'true':
+                    print(f"Debug - Intent: {result.get('parsed_intent', {})}")
+                    print(f"Debug - Parse tiers: {self.llm_interface.get_parse_stats()}")
+                    print(f"Debug - Caches: {self.mcp_server.github_client.cache_stats()}")
+        except asyncio.CancelledError:
+            # GitHub calls already sent still finish in the worker pool
+            print(f"\n[{number}] cancelled: {command}")
+        except Exception as e:
+            print(f"\n[{number}] Error: {e}")
+    
+    def _cancel_latest(self, lines):
+        """Ctrl-C: cancel the newest request still running, or quit when none is"""
+        if not self.running:
+            lines.put_nowait("quit")
+            return
+        number, task = max(self.running.items())
+        task.cancel()
+    
+    async def run_interactive_mode(self, lines=None):
+        """Run the interactive chat interface
+        
+        Requests run as tasks, so new commands can be typed while earlier ones
+        are still executing; results are printed as each one completes. Ctrl-C
+        cancels the most recent running request and exits when none is running.
+        `lines` is a queue of input lines, read from stdin when not given.
+        """
         print("\nGitHub MCP Integration")
         print("Commands: 'create repo', 'list repos', 'create issue', 'quit'")
+        print("Requests run in the background; Ctrl-C cancels the latest one")
         print("-" * 50)
         
-        while True:
-            try:
-                user_input = input("\nWhat would you like to do? ").strip()
-                
-                if user_input.lower() in ['quit', 'exit', 'q']:
-                    print("Goodbye!")
+        loop = asyncio.get_running_loop()
+        # Load the deferred clients while the user is typing the first request
+        warm_up = loop.run_in_executor(None, self.warm_up)
+        # Failures are ignored here; the first request reports them properly
+        warm_up.add_done_callback(lambda future: future.exception())
+        
+        self._display_lock = asyncio.Lock()
+        # Request number -> task of every request still running
+        self.running = running = {}
+        watching = False
+        if lines is None:
+            lines = asyncio.Queue()
+            watching = self._watch_stdin(loop, lines)
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._cancel_latest, lines)
+        except (NotImplementedError, RuntimeError):
+            # Windows or not the main thread: Ctrl-C keeps its default meaning
+            pass
+        
+        number = 0
+        try:
+            while True:
+                print("\nWhat would you like to do? ", end="", flush=True)
+                user_input = (await lines.get()).strip()
+                if user_input.lower() in QUIT_COMMANDS:
                     break
-                
                 if not user_input:
                     continue
                 
-                result = await self.process_natural_language_request(user_input)
-                self.display_result(result)
-                
-                # Debug mode
-                if os.getenv('DEBUG', '').lower() == 'true':
-                    print(f"Debug - Intent: {result.get('parsed_intent', {})}")
+                number += 1
+                task = asyncio.create_task(self._run_request(number, user_input))
+                running[number] = task
+                task.add_done_callback(lambda _, number=number: running.pop(number, None))
             
-            except KeyboardInterrupt:
-                print("\nGoodbye!")
-                break
-            except Exception as e:
-                print(f"Error: {e}")
+            if running:
+                print(f"Waiting for {len(running)} running request(s)... (Ctrl-C cancels)")
+                await asyncio.gather(*running.values(), return_exceptions=True)
+            print("Goodbye!")
+        except KeyboardInterrupt:
+            print("\nGoodbye!")
+        finally:
+            with contextlib.suppress(NotImplementedError, RuntimeError):
+                loop.remove_signal_handler(signal.SIGINT)
+            if watching:
+                loop.remove_reader(sys.stdin)
+            for task in list(running.values()):
+                task.cancel()
     
-    def run_demo_mode(self):
+    async def _run_command(self, command):
+        """Process a single command and display its result"""
+        result = await self.process_natural_language_request(command)
+        await self.display_result(result)
+        return result
+    
+    async def run_demo_mode(self):
         """Run a demonstration of the system capabilities"""
         print("Demo Mode")
         
@@ -121,26 +366,43 @@ class GitHubInterface:
             "Create an issue in demo-project about adding README"
         ]
         
-        for i, command in enumerate(demo_commands, 1):
-            print(f"\nDemo {i}: {command}")
-            input("Press Enter...")
-            
-            result = asyncio.run(self.process_natural_language_request(command))
-            self.display_result(result)
-            
-            if not result["success"]:
-                print("Demo stopped due to error")
-                break
+        loop = asyncio.get_running_loop()
+        lines = asyncio.Queue()
+        watching = self._watch_stdin(loop, lines)
+        try:
+            for i, command in enumerate(demo_commands, 1):
+                print(f"\nDemo {i}: {command}")
+                print("Press Enter...", end="", flush=True)
+                if (await lines.get()).strip().lower() in QUIT_COMMANDS:
+                    break
+                
+                result = await self._run_command(command)
+                
+                if not result["success"]:
+                    print("Demo stopped due to error")
+                    break
+        finally:
+            if watching:
+                loop.remove_reader(sys.stdin)
         
         print("Demo completed!")
 
+def configure_logging():
+    """LOG_LEVEL sets the level (DEBUG=true implies DEBUG); tool calls log at INFO, results at DEBUG"""
+    debug = os.getenv('DEBUG', '').lower() == 'true'
+    level = os.getenv('LOG_LEVEL', 'DEBUG' if debug else 'WARNING').upper()
+    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
+
 async def main():
     """Main entry point"""
+    configure_logging()
     try:
         interface = GitHubInterface()
         
-        if len(sys.argv) > 1 and sys.argv[1] == "--demo":
-            interface.run_demo_mode()
+        if "--startup-profile" in sys.argv:
+            interface.print_startup_profile()
+        elif len(sys.argv) > 1 and sys.argv[1] == "--demo":
+            await interface.run_demo_mode()
         else:
             await interface.run_interactive_mode()
             
@@ -1,207 +1,429 @@
 import asyncio
+import contextvars
+import hmac
 import json
-from src.github_client import GitHubClient
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.client_pool import GitHubClientPool
+from src.encoding import ResultEncoder
+from src.github_client import MAX_PER_PAGE, GitHubClient
+from src.local_files import LocalFileAccess
+from src.metrics import metrics
+from src.rate_limiter import BULK, priority_context
+from src.tools import InvalidArguments, registry
+
+MCP_PROTOCOL_VERSION = "2025-06-18"
+
+logger = logging.getLogger(__name__)
+
+def parse_tool_concurrency(value):
+    """Parse a "tool=limit,tool=limit" string (MCP_TOOL_CONCURRENCY) into a dict"""
+    limits = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, limit = item.split("=", 1)
+            limits[name.strip()] = int(limit)
+    return limits
+
+def request_params(request):
+    """The params object of a JSON-RPC request, {} when absent"""
+    params = request.get("params", {})
+    if not isinstance(params, dict):
+        raise InvalidArguments("Invalid params: expected an object")
+    return params
+
+def call_arguments(params):
+    """The arguments object of tools/call (or tools/stream) params, {} when absent"""
+    arguments = params.get("arguments", {})
+    if not isinstance(arguments, dict):
+        raise InvalidArguments("Invalid params: arguments must be an object")
+    return arguments
+
+def caller_token(params, credential=None):
+    """The transport-authenticated token, else the githubToken of the params' _meta"""
+    meta = params.get("_meta") or {}
+    if not isinstance(meta, dict):
+        raise InvalidArguments("Invalid params: _meta must be an object")
+    return credential or meta.get("githubToken")
 
 class GitHubMCPServer:
     """MCP Server for GitHub operations following Model Context Protocol"""
     
-    def __init__(self):
-        self.github_client = GitHubClient()
-        self.tools = self._define_tools()
+    def __init__(self, max_workers=None, tool_concurrency=None, tools=None, multi_tenant=False, local_files=False):
+        # Multi-tenant (the transport with MCP_MULTI_TENANT): every tools/call carries
+        # its caller's GitHub token and runs on that token's client; there is no
+        # server-wide token to fall back to
+        self.clients = GitHubClientPool() if multi_tenant else None
+        self.github_client = None if multi_tenant else GitHubClient()
+        # Server-wide metrics cover every caller: with MCP_METRICS_TOKEN set, or
+        # in multi-tenant mode, only the operator presenting it may read them
+        self.metrics_token = os.getenv("MCP_METRICS_TOKEN")
+        # Only the local CLI (local_files=True) may name any file on this machine
+        self.local_files = LocalFileAccess(unrestricted=local_files)
+        # Tools register themselves in src/tools.py; nothing here changes for a new tool
+        self.registry = tools or registry
+        # Compact JSON results by default (MCP_RESULT_JSON / MCP_RESULT_CONTENT)
+        self.encoder = ResultEncoder()
+        self.tools = self.registry.definitions()
+        
+        # PyGithub is synchronous, so tool calls run on a bounded thread pool
+        # instead of blocking the event loop
+        self.max_workers = max_workers or int(os.getenv("MCP_MAX_WORKERS", "32"))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-tool")
+        self.tool_concurrency = {
+            **self.registry.concurrency_limits(),
+            **parse_tool_concurrency(os.getenv("MCP_TOOL_CONCURRENCY")),
+            **(tool_concurrency or {})
+        }
+        self._tool_semaphores = {}
+        # Identical concurrent read calls share one execution (MCP_COALESCE_READS)
+        self.coalesce_reads = os.getenv("MCP_COALESCE_READS", "true").lower() == "true"
+        self._reads_in_flight = {}
+        # Bumped by every write, so a read never joins one that started before a write finished
+        self._write_generation = 0
+        self.coalesce_stats = {"executed": 0, "coalesced": 0}
         print("🔧 MCP Server initialized with GitHub tools")
     
-    def _define_tools(self):
-        """Define available MCP tools for GitHub operations"""
-        return {
-            "create_repository": {
-                "description": "Create a new GitHub repository",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "name": {"type": "string", "description": "Repository name"},
-                        "description": {"type": "string", "description": "Repository description"},
-                        "private": {"type": "boolean", "description": "Make repository private"}
-                    },
-                    "required": ["name"]
-                }
-            },
-            "list_repositories": {
-                "description": "List user repositories",
-                "parameters": {
-                    "type": "object",
-                    "properties": {}
-                }
-            },
-            "get_repository_info": {
-                "description": "Get detailed repository information",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "repo_name": {"type": "string", "description": "Repository name"}
-                    },
-                    "required": ["repo_name"]
-                }
-            },
-            "create_issue": {
-                "description": "Create an issue in a repository",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "repo_name": {"type": "string", "description": "Repository name"},
-                        "title": {"type": "string", "description": "Issue title"},
-                        "body": {"type": "string", "description": "Issue description"}
-                    },
-                    "required": ["repo_name", "title"]
-                }
-            },
-            "list_issues": {
-                "description": "List issues in a repository",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "repo_name": {"type": "string", "description": "Repository name"}
-                    },
-                    "required": ["repo_name"]
-                }
-            },
-            "create_branch": {
-                "description": "Create a new branch in a repository",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "repo_name": {"type": "string", "description": "Repository name"},
-                        "branch_name": {"type": "string", "description": "New branch name"},
-                        "source_branch": {"type": "string", "description": "Source branch (default: main)"}
-                    },
-                    "required": ["repo_name", "branch_name"]
-                }
-            },
-            "get_repository_stats": {
-                "description": "Get repository statistics",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "repo_name": {"type": "string", "description": "Repository name"}
-                    },
-                    "required": ["repo_name"]
-                }
-            },
-            "create_pull_request": {
-                "description": "Create a pull request in a repository",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "repo_name": {"type": "string", "description": "Repository name"},
-                        "title": {"type": "string", "description": "Pull request title"},
-                        "head": {"type": "string", "description": "Branch with your changes"},
-                        "base": {"type": "string", "description": "Branch to merge into"},
-                        "body": {"type": "string", "description": "Pull request description (optional)"}
-                    },
-                    "required": ["repo_name", "title", "head", "base"]
-                }
-            }
-        }
+    def _tool_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting in-flight calls of a tool"""
+        semaphore = self._tool_semaphores.get(tool_name)
+        if semaphore is None:
+            limit = min(self.tool_concurrency.get(tool_name, self.max_workers), self.max_workers)
+            semaphore = self._tool_semaphores[tool_name] = asyncio.Semaphore(limit)
+        return semaphore
     
-    async def call_tool(self, tool_name: str, parameters: dict) -> dict:
-        """Execute a tool call through MCP protocol"""
-        try:
-            print(f"🔧 MCP Tool Call: {tool_name} with {parameters}")
-            
-            if tool_name == "create_repository":
-                result = self.github_client.create_repository(
-                    name=parameters["name"],
-                    description=parameters.get("description", ""),
-                    private=parameters.get("private", False)
-                )
-            
-            elif tool_name == "list_repositories":
-                result = self.github_client.list_repositories()
-            
-            elif tool_name == "get_repository_info":
-                result = self.github_client.get_repo_info(parameters["repo_name"])
-            
-            elif tool_name == "create_issue":
-                result = self.github_client.create_issue(
-                    repo_name=parameters["repo_name"],
-                    title=parameters["title"],
-                    body=parameters.get("body", "")
-                )
-            
-            elif tool_name == "list_issues":
-                result = self.github_client.list_issues(parameters["repo_name"])
-            
-            elif tool_name == "create_branch":
-                result = self.github_client.create_branch(
-                    repo_name=parameters["repo_name"],
-                    branch_name=parameters["branch_name"],
-                    source_branch=parameters.get("source_branch", "main")
-                )
-            
-            elif tool_name == "get_repository_stats":
-                result = self.github_client.get_repo_stats(parameters["repo_name"])
-            
-            elif tool_name == "create_pull_request":
-                repo = self.github_client.get_repo_object(parameters["repo_name"])
-                if not repo:
-                    return {"success": False, "error": f"Repository '{parameters['repo_name']}' not found"}
-                result = self.github_client.create_pull_request(
-                    repo=repo,
-                    title=parameters["title"],
-                    head=parameters["head"],
-                    base=parameters["base"],
-                    body=parameters.get("body", "")
-                )
+    def client_for(self, token=None):
+        """The GitHubClient a call runs on: the token's own in multi-tenant mode"""
+        if self.clients is None:
+            return self.github_client
+        if not token:
+            raise InvalidArguments(
+                "This server needs your GitHub token: send it as a Bearer Authorization header "
+                "or in the githubToken field of the call's _meta"
+            )
+        return self.clients.get(token)
+    
+    def can_read_metrics(self, credential):
+        """Whether a caller may read the server-wide metrics (the metrics method and GET /metrics)"""
+        if self.metrics_token:
+            return bool(credential) and hmac.compare_digest(credential.encode(), self.metrics_token.encode())
+        return self.clients is None
+    
+    def _read_key(self, tool, client, arguments):
+        """Coalescing key of a read call: tool, whose token, and validated arguments with defaults filled in"""
+        values = arguments.model_dump(mode="json")
+        # GitHub repository names are case-insensitive
+        for name in ("repo_name", "repo_names"):
+            if isinstance(values.get(name), str):
+                values[name] = values[name].lower()
+            elif isinstance(values.get(name), list):
+                values[name] = [value.lower() for value in values[name]]
+        return (tool.name, client.identity, self._write_generation, json.dumps(values, sort_keys=True))
+    
+    def _check_local_paths(self, tool, arguments):
+        """Resolve the arguments naming files on the server, refusing what the caller may not name"""
+        updates = {}
+        for name in tool.local_paths:
+            value = getattr(arguments, name)
+            if value:
+                try:
+                    updates[name] = self.local_files.resolve(name, value)
+                except ValueError as e:
+                    raise InvalidArguments(f"Invalid arguments for {tool.name}: {e}") from None
+        return arguments.model_copy(update=updates) if updates else arguments
+    
+    async def _run_tool(self, tool, client, arguments):
+        async with self._tool_semaphore(tool.name):
+            loop = asyncio.get_running_loop()
+            # Copy the context so the request priority and current span reach the worker thread
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self.executor, context.run, tool.handler, client, arguments)
+    
+    async def _run_read(self, tool, client, arguments):
+        """Run a read tool, or wait for the identical call already in flight and share its result"""
+        key = self._read_key(tool, client, arguments)
+        shared = self._reads_in_flight.get(key)
+        if shared is not None:
+            self.coalesce_stats["coalesced"] += 1
+            metrics.increment("tool_calls_coalesced_total", tool=tool.name)
+            metrics.annotate(coalesced=True)
+            # Shielded: cancelling one waiter must not cancel the call the others wait for
+            return dict(await asyncio.shield(shared))
+        self.coalesce_stats["executed"] += 1
+        shared = self._reads_in_flight[key] = asyncio.ensure_future(self._run_tool(tool, client, arguments))
+        shared.add_done_callback(lambda _: self._reads_in_flight.pop(key, None))
+        return await asyncio.shield(shared)
+    
+    async def call_tool(self, tool_name: str, parameters: dict, token=None) -> dict:
+        """Execute a tool call through MCP protocol (with the caller's `token` in multi-tenant mode)"""
+        with metrics.span("tool", name=tool_name) as span:
+            try:
+                logger.info("MCP tool call: %s with %s", tool_name, parameters)
+                
+                # Validate before queueing, so bad arguments never reach GitHub
+                tool = self.registry.get(tool_name)
+                if tool is None:
+                    raise InvalidArguments(f"Unknown tool: {tool_name}")
+                arguments = self._check_local_paths(tool, tool.bind(parameters))
+                client = self.client_for(token)
+                # Lets the metrics method show a tenant the traces of its own calls only
+                span["tenant"] = client.identity
+                
+                if tool.read_only and self.coalesce_reads:
+                    result = await self._run_read(tool, client, arguments)
+                else:
+                    self._write_generation += not tool.read_only
+                    try:
+                        result = await self._run_tool(tool, client, arguments)
+                    finally:
+                        self._write_generation += not tool.read_only
+                
+                # Lazy %-formatting: large results are only rendered when DEBUG logging is on
+                logger.debug("MCP result: %s", result)
             
-            else:
-                result = {"success": False, "error": f"Unknown tool: {tool_name}"}
+            except InvalidArguments as e:
+                result = {"success": False, "error": str(e)}
+                logger.warning("MCP invalid call: %s", e)
+            except Exception as e:
+                result = {"success": False, "error": f"MCP tool execution failed: {str(e)}"}
+                logger.error("MCP error: %s", result)
             
-            print(f"🔧 MCP Result: {result}")
+            if not result.get("success"):
+                span["error"] = result.get("error", "failed")
             return result
-            
-        except Exception as e:
-            error_result = {"success": False, "error": f"MCP tool execution failed: {str(e)}"}
-            print(f"🚨 MCP Error: {error_result}")
-            return error_result
+    
+    def _infer_dependencies(self, steps):
+        """Add ordering the planner may have left implicit.
+        
+        Steps touching a repository wait for a step creating it, and pull
+        requests wait for steps creating their head or base branch (file
+        commits for their base branch).
+        """
+        created_repos = {
+            s["parameters"].get("name"): s["id"] for s in steps if s["action"] == "create_repository"
+        }
+        created_branches = {
+            (s["parameters"].get("repo_name"), s["parameters"].get("branch_name")): s["id"]
+            for s in steps if s["action"] == "create_branch"
+        }
+        for step in steps:
+            params = step["parameters"]
+            implied = [created_repos.get(params.get("repo_name"))]
+            if step["action"] == "create_pull_request":
+                for branch in (params.get("head"), params.get("base")):
+                    implied.append(created_branches.get((params.get("repo_name"), branch)))
+            elif step["action"] == "commit_files_and_open_pr":
+                implied.append(created_branches.get((params.get("repo_name"), params.get("base", "main"))))
+            for dep in implied:
+                if dep and dep != step["id"] and dep not in step["depends_on"]:
+                    step["depends_on"].append(dep)
+    
+    def _normalize_plan(self, steps):
+        """Validate plan steps, fill in ids/dependencies and reject cycles"""
+        if not isinstance(steps, list) or not steps:
+            raise ValueError("plan must be a non-empty list of steps")
+        normalized = []
+        for index, step in enumerate(steps, 1):
+            if not isinstance(step, dict) or not step.get("action"):
+                raise ValueError(f"step {index} has no action")
+            depends_on = step.get("depends_on") or []
+            normalized.append({
+                "id": str(step.get("id") or f"step{index}"),
+                "action": step["action"],
+                "parameters": dict(step.get("parameters") or {}),
+                "depends_on": [str(dep) for dep in (depends_on if isinstance(depends_on, list) else [depends_on])]
+            })
+        
+        # Check every step's arguments up front so a bad step fails the plan before any I/O
+        for step in normalized:
+            tool = self.registry.get(step["action"])
+            if tool is None:
+                raise ValueError(f"step '{step['id']}' uses unknown tool '{step['action']}'")
+            tool.bind(step["parameters"])
+        
+        ids = [step["id"] for step in normalized]
+        if len(set(ids)) != len(ids):
+            raise ValueError("step ids must be unique")
+        for step in normalized:
+            unknown = set(step["depends_on"]) - set(ids)
+            if unknown:
+                raise ValueError(f"step '{step['id']}' depends on unknown steps {sorted(unknown)}")
+        self._infer_dependencies(normalized)
+        
+        # Kahn's algorithm: if some steps never become ready there is a cycle
+        remaining = {step["id"]: set(step["depends_on"]) for step in normalized}
+        while remaining:
+            ready = [step_id for step_id, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"dependency cycle between steps {sorted(remaining)}")
+            for step_id in ready:
+                del remaining[step_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return normalized
+    
+    async def execute_plan(self, steps: list, token=None) -> dict:
+        """Execute several tool calls: independent steps concurrently, dependent steps in order.
+
+        Every step runs as the caller (`token`, in multi-tenant mode).
+        """
+        started = time.perf_counter()
+        try:
+            steps = self._normalize_plan(steps)
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid plan: {e}"}
+        
+        tasks = {}
+        
+        async def run_step(step):
+            for dep in step["depends_on"]:
+                if not (await tasks[dep]).get("success"):
+                    return {"success": False, "skipped": True, "error": f"Skipped because step '{dep}' failed"}
+            return await self.call_tool(step["action"], step["parameters"], token=token)
+        
+        # Every task is created before any of them runs, so dependencies can always be awaited
+        for step in steps:
+            tasks[step["id"]] = asyncio.ensure_future(run_step(step))
+        results = await asyncio.gather(*tasks.values())
+        
+        step_results = [
+            {"id": step["id"], "action": step["action"], "depends_on": step["depends_on"], "result": result}
+            for step, result in zip(steps, results)
+        ]
+        succeeded = sum(1 for result in results if result.get("success"))
+        return {
+            "success": succeeded == len(steps),
+            "message": f"Completed {succeeded} of {len(steps)} steps",
+            "steps": step_results,
+            "elapsed": round(time.perf_counter() - started, 3)
+        }
+    
+    async def stream_tool(self, tool_name: str, parameters: dict, token=None):
+        """Yield the items of list_repositories or list_issues one by one as pages arrive from GitHub.
+
+        Served as the non-standard tools/stream method (see src/transport.py).
+        Arguments are validated like a tools/call of the same tool; a stream
+        always starts at the first item, so `cursor` is refused.
+        """
+        if tool_name not in ("list_repositories", "list_issues"):
+            raise InvalidArguments(f"Tool does not support streaming: {tool_name}")
+        arguments = self.registry.get(tool_name).bind(parameters)
+        if arguments.cursor:
+            raise InvalidArguments(f"Invalid arguments for {tool_name}: cursor can't be used when streaming")
+        client = self.client_for(token)
+        per_page = arguments.per_page or MAX_PER_PAGE
+        if tool_name == "list_repositories":
+            items = client.iter_repositories(per_page=per_page)
+        else:
+            items = client.iter_issues(arguments.repo_name, per_page=per_page)
+        
+        loop = asyncio.get_running_loop()
+        done = object()
+        count = 0
+        # Long listings are bulk work and yield to interactive requests
+        context = priority_context(BULK)
+        async with self._tool_semaphore(tool_name):
+            while count < arguments.limit:
+                # Each next() may block on a page fetch, so pull items on the worker pool
+                item = await loop.run_in_executor(self.executor, context.run, next, items, done)
+                if item is done:
+                    break
+                count += 1
+                yield item
+    
+    def close(self):
+        """Shut down the tool worker pool and the GitHub client(s)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.github_client is not None:
+            self.github_client.close()
+        if self.clients is not None:
+            self.clients.close()
     
     def get_available_tools(self) -> dict:
         """Return available tools for MCP discovery"""
         return self.tools
     
-    async def handle_mcp_request(self, request: dict) -> dict:
-        """Handle incoming MCP protocol requests"""
+    async def handle_mcp_request(self, request: dict, credential=None) -> dict:
+        """Handle incoming MCP protocol requests
+        
+        `credential` is the caller's GitHub token as authenticated by the
+        transport (HTTP Authorization header); used in multi-tenant mode only.
+        """
         try:
             method = request.get("method")
-            params = request.get("params", {})
+            params = request_params(request)
             
-            if method == "tools/list":
+            if method == "initialize":
                 return {
                     "jsonrpc": "2.0",
                     "id": request.get("id"),
                     "result": {
-                        "tools": [
-                            {"name": name, **info} 
-                            for name, info in self.tools.items()
-                        ]
+                        "protocolVersion": params.get("protocolVersion", MCP_PROTOCOL_VERSION),
+                        "capabilities": {"tools": {"listChanged": False}},
+                        "serverInfo": {"name": "github-mcp-integration", "version": "1.0.0"}
                     }
                 }
             
+            elif method == "ping":
+                return {"jsonrpc": "2.0", "id": request.get("id"), "result": {}}
+            
+            elif method == "metrics":
+                # Non-standard: per-stage latency histograms, counters and recent spans.
+                # The numbers cover every caller, so on a multi-tenant server only the
+                # operator (MCP_METRICS_TOKEN) gets them; a tenant gets the spans of
+                # its own calls.
+                token = caller_token(params, credential)
+                try:
+                    recent_spans = int(params.get("recent_spans", 20))
+                except (TypeError, ValueError):
+                    raise InvalidArguments("Invalid params: recent_spans must be an integer") from None
+                if self.can_read_metrics(token):
+                    if params.get("format") == "prometheus":
+                        result = {"text": metrics.prometheus()}
+                    else:
+                        result = metrics.snapshot(recent_spans=recent_spans)
+                        result["coalescing"] = dict(self.coalesce_stats)
+                        if self.clients is not None:
+                            result["tenants"] = self.clients.snapshot()
+                elif self.clients is not None and token and params.get("format") != "prometheus":
+                    tenant = self.client_for(token).identity
+                    result = {"recent_spans": metrics.snapshot(recent_spans=recent_spans, tenant=tenant)["recent_spans"]}
+                else:
+                    return {
+                        "jsonrpc": "2.0",
+                        "id": request.get("id"),
+                        "error": {"code": -32600, "message": "Server metrics need the operator token (MCP_METRICS_TOKEN)"}
+                    }
+                return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+            
+            elif method == "tools/stream":
+                # Answered by the transport, which can send more than one message per request
+                return {
+                    "jsonrpc": "2.0",
+                    "id": request.get("id"),
+                    "error": {
+                        "code": -32600,
+                        "message": "tools/stream needs the stdio transport or an SSE response, outside a batch"
+                    }
+                }
+            
+            elif method == "tools/list":
+                # Precomputed once by the registry
+                return {"jsonrpc": "2.0", "id": request.get("id"), "result": self.registry.list_payload()}
+            
             elif method == "tools/call":
                 tool_name = params.get("name")
-                tool_params = params.get("arguments", {})
+                tool_params = call_arguments(params)
                 
-                result = await self.call_tool(tool_name, tool_params)
+                token = caller_token(params, credential)
+                result = await self.call_tool(tool_name, tool_params, token=token)
                 
                 return {
                     "jsonrpc": "2.0",
                     "id": request.get("id"),
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(result, indent=2)
-                            }
-                        ]
-                    }
+                    "result": self.encoder.tool_result(result)
                 }
             
             else:
@@ -214,6 +436,12 @@ class GitHubMCPServer:
                     }
                 }
                 
+        except InvalidArguments as e:
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get("id"),
+                "error": {"code": -32602, "message": str(e)}
+            }
         except Exception as e:
             return {
                 "jsonrpc": "2.0",
@@ -0,0 +1,266 @@
+import bisect
+import collections
+import contextlib
+import contextvars
+import itertools
+import os
+import threading
+import time
+import uuid
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current_span = contextvars.ContextVar("metrics_current_span", default=None)
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+class MetricsRegistry:
+    """Spans, histograms, counters and gauges for the LLM → MCP → GitHub pipeline.
+
+    A span times one stage (llm.parse, tool, github.request, llm.response...)
+    and is linked to the enclosing span through a context variable, so the
+    GitHub requests made by a tool call share its trace id even when they run
+    on the worker pool. Finished spans feed a duration histogram per stage and
+    name, and the most recent ones are kept for inspection.
+    """
+
+    def __init__(self, span_buffer=None):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.spans = collections.deque(maxlen=span_buffer or int(os.getenv("METRICS_SPAN_BUFFER", "256")))
+        self._span_ids = itertools.count(1)
+        self._otel_tracer = None
+        self.otel_enabled = os.getenv("METRICS_OTEL", "false").lower() == "true"
+
+    # -- primitives --------------------------------------------------------
+
+    # Positional-only, so "name" can be used as a label
+    def observe(self, metric, value, /, **labels):
+        key = (metric, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, metric, amount=1, /, **labels):
+        key = (metric, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, metric, value, /, **labels):
+        with self._lock:
+            self.gauges[(metric, _label_key(labels))] = value
+
+    # -- spans -------------------------------------------------------------
+
+    def start_span(self, stage, **attributes):
+        """Open a span under the current one; finish it with finish_span"""
+        parent = _current_span.get()
+        return {
+            "stage": stage,
+            "span_id": next(self._span_ids),
+            "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex[:16],
+            "parent_id": parent["span_id"] if parent else None,
+            "started_at": time.time(),
+            "_start": time.perf_counter(),
+            **attributes,
+        }
+
+    def annotate(self, **attributes):
+        """Add attributes to the current span, if any"""
+        span = _current_span.get()
+        if span is not None:
+            span.update(attributes)
+
+    def finish_span(self, span):
+        """Record a span's duration in the histogram of its stage and name"""
+        span["duration"] = round(time.perf_counter() - span.pop("_start"), 6)
+        self.observe("stage_duration_seconds", span["duration"], stage=span["stage"], name=span.get("name"))
+        if span.get("error"):
+            self.increment("stage_errors_total", stage=span["stage"], name=span.get("name"))
+        with self._lock:
+            self.spans.append(span)
+        if self.otel_enabled:
+            self._export_otel(span)
+
+    @contextlib.contextmanager
+    def span(self, stage, **attributes):
+        """Time the block as one stage. The yielded dict takes extra attributes.
+
+        Not for async generators: the span would stay current for the caller
+        between yields. Use start_span/finish_span there.
+        """
+        span = self.start_span(stage, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish_span(span)
+
+    def _export_otel(self, span):
+        """Mirror a finished span to OpenTelemetry when opentelemetry-api is installed"""
+        if self._otel_tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                print("⚠️ METRICS_OTEL is set but opentelemetry-api is not installed")
+                self.otel_enabled = False
+                return
+            self._otel_tracer = trace.get_tracer("github-mcp-integration")
+        start_ns = int(span["started_at"] * 1e9)
+        attributes = {
+            key: value for key, value in span.items()
+            if key not in ("stage", "started_at", "duration") and isinstance(value, (str, bool, int, float))
+        }
+        otel_span = self._otel_tracer.start_span(span["stage"], start_time=start_ns, attributes=attributes)
+        otel_span.end(end_time=start_ns + int(span["duration"] * 1e9))
+
+    # -- GitHub transport --------------------------------------------------
+
+    def github_middleware(self, request, call_next):
+        """Transport middleware recording a github.request span per HTTP request.
+
+        Installed outermost, so the span covers rate-limit pacing and retries;
+        the scheduler reports both on the request object.
+        """
+        resource = "graphql" if request.path.endswith("/graphql") else "core"
+        with self.span("github.request", name=resource, method=request.verb, path=request.path) as span:
+            span["request_bytes"] = len(request.body or b"")
+            response = call_next(request)
+            span["status"] = response.status_code
+            span["retries"] = max(0, getattr(request, "attempts", 1) - 1)
+            span["wait"] = round(getattr(request, "wait_seconds", 0.0), 6)
+            cache_status = getattr(request, "cache_status", None)
+            if cache_status:
+                span["cache"] = cache_status
+            if request.stream:
+                span["response_bytes"] = int(response.headers.get("Content-Length") or 0)
+            elif cache_status == "hit":
+                # A 304: the body came from the HTTP cache, not over the wire
+                span["response_bytes"] = 0
+            else:
+                span["response_bytes"] = len(response.content)
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                span["rate_limit_remaining"] = int(float(remaining))
+                span["rate_limit_reset"] = int(float(response.headers.get("X-RateLimit-Reset", 0)))
+                self.set_gauge(
+                    "github_rate_limit_remaining", span["rate_limit_remaining"],
+                    resource=response.headers.get("X-RateLimit-Resource") or resource
+                )
+        self.increment("github_requests_total", resource=resource, status=span["status"])
+        self.increment("github_response_bytes_total", span["response_bytes"], resource=resource)
+        if span["retries"]:
+            self.increment("github_retries_total", span["retries"], resource=resource)
+        return response
+
+    # -- export ------------------------------------------------------------
+
+    def snapshot(self, recent_spans=20, tenant=None):
+        """All metrics as a JSON-friendly dict, plus the most recent spans.
+
+        With `tenant`, the spans are limited to the traces of that tenant's
+        tool calls (their tool span carries it, see GitHubMCPServer.call_tool).
+        """
+        with self._lock:
+            spans = list(self.spans)
+            if tenant is not None:
+                traces = {span["trace_id"] for span in spans if span.get("tenant") == tenant}
+                spans = [span for span in spans if span["trace_id"] in traces]
+            return {
+                "histograms": [
+                    {"metric": name, **dict(labels), **histogram.snapshot()}
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+                "counters": [{"metric": name, **dict(labels), "value": value} for (name, labels), value in self.counters.items()],
+                "gauges": [{"metric": name, **dict(labels), "value": value} for (name, labels), value in self.gauges.items()],
+                "recent_spans": spans[-recent_spans:] if recent_spans else [],
+            }
+
+    def prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in self.histograms.items():
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+            for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({name for name, _ in values}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for (metric, labels), value in values.items():
+                        if metric == name:
+                            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self.spans.clear()
+
+# Process-wide registry shared by the LLM interface, MCP server and GitHub client
+metrics = MetricsRegistry()
@@ -0,0 +1,294 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from src.rate_limiter import BULK, request_priority
+
+# Every row belongs to the login whose token mirrored it, so a mirror file
+# shared by several accounts (or kept across a GITHUB_TOKEN change) never
+# answers one user's reads with another's data
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    login TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (login, full_name)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    login TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (login, repo, number)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    login TEXT NOT NULL,
+    key TEXT NOT NULL,
+    synced_at REAL,
+    etag TEXT,
+    high_water TEXT,
+    PRIMARY KEY (login, key)
+);
+"""
+
+def next_link(headers):
+    """URL of rel="next" in a Link header, or None"""
+    match = re.search(r'<([^>]+)>;\s*rel="next"', headers.get("link", ""))
+    return match.group(1) if match else None
+
+class RepoMirror:
+    """On-disk SQLite mirror of the user's repositories and open issues.
+
+    Reads are answered from the mirror while a sync is younger than
+    max_staleness seconds. Older data is brought up to date incrementally
+    first: listings are requested newest-updated first (repos) or with
+    `since` (issues), paging stops at the previous high-water mark, and the
+    first page is a conditional request, so an unchanged listing costs one
+    304 that GitHub doesn't count against the rate limit. Deleted
+    repositories are only dropped by a full resync. Rows are kept per login,
+    and every read and sync only sees those of the client's login.
+    """
+
+    def __init__(self, client, path, max_staleness=300):
+        self.client = client
+        self.path = path
+        self.max_staleness = max_staleness
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Older mirrors aren't keyed by login; it's only a cache, so start over
+            self.db.executescript("DROP TABLE IF EXISTS repos; DROP TABLE IF EXISTS issues; DROP TABLE IF EXISTS sync_state;")
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._refresher = None
+        self._stop = threading.Event()
+        self.stats = {"reads": 0, "syncs": 0, "not_modified": 0, "pages": 0}
+
+    @property
+    def login(self):
+        """The login whose rows this mirror reads and writes"""
+        return self.client.login
+
+    # -- sync state ------------------------------------------------------
+
+    def _state(self, key):
+        login = self.login
+        with self._lock:
+            row = self.db.execute(
+                "SELECT synced_at, etag, high_water FROM sync_state WHERE login = ? AND key = ?", (login, key)
+            ).fetchone()
+        return row or (None, None, None)
+
+    def _save_state(self, key, etag, high_water):
+        self.db.execute(
+            "INSERT OR REPLACE INTO sync_state (login, key, synced_at, etag, high_water) VALUES (?, ?, ?, ?, ?)",
+            (self.login, key, time.time(), etag, high_water)
+        )
+
+    def is_synced(self, key):
+        return self._state(key)[0] is not None
+
+    def is_fresh(self, key):
+        synced_at = self._state(key)[0]
+        return synced_at is not None and time.time() - synced_at <= self.max_staleness
+
+    def mark_stale(self, key):
+        """Force the next read of `key` to sync first (after a write through the client)"""
+        login = self.login
+        with self._lock, self.db:
+            self.db.execute("UPDATE sync_state SET synced_at = 0 WHERE login = ? AND key = ?", (login, key))
+
+    @staticmethod
+    def issues_key(repo_name):
+        return f"issues:{repo_name}"
+
+    # -- fetching ----------------------------------------------------------
+
+    def _pages(self, url, params, etag):
+        """Yield (items, headers) per page; nothing if the first page answers 304"""
+        requester = self.client.github.requester
+        headers = {"If-None-Match": etag} if etag else {}
+        while url:
+            status, response_headers, body = requester.requestJson("GET", url, params, headers)
+            self.stats["pages"] += 1
+            if status == 304:
+                self.stats["not_modified"] += 1
+                return
+            if status >= 400:
+                from github import GithubException
+                raise GithubException(status, json.loads(body or "null"), response_headers)
+            yield json.loads(body), response_headers
+            # The next link carries the query string already
+            url, params, headers = next_link(response_headers), None, {}
+
+    # -- sync --------------------------------------------------------------
+
+    def sync_repositories(self, full=False):
+        """Bring the repository table up to date; returns the number of rows written"""
+        _, etag, high_water = self._state("repos")
+        if full or high_water is None:
+            etag = high_water = None
+        login = self.login
+        written, seen, new_etag, new_high_water = 0, set(), etag, high_water
+        params = {"sort": "updated", "direction": "desc", "per_page": 100}
+        # `with self.db` commits the sync as one transaction, or rolls it back
+        with request_priority(BULK), self._lock, self.db:
+            for number, (page, headers) in enumerate(self._pages("/user/repos", params, etag)):
+                if number == 0:
+                    new_etag = headers.get("etag")
+                    new_high_water = page[0]["updated_at"] if page else high_water
+                for raw in page:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO repos (login, full_name, name, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+                        (login, raw["full_name"], raw["name"], raw["updated_at"], json.dumps(raw))
+                    )
+                    seen.add(raw["full_name"])
+                written += len(page)
+                # Newest first: everything after an already-mirrored update is unchanged
+                if high_water and page and page[-1]["updated_at"] <= high_water:
+                    break
+            if full:
+                known = {row[0] for row in self.db.execute("SELECT full_name FROM repos WHERE login = ?", (login,))}
+                self.db.executemany(
+                    "DELETE FROM repos WHERE login = ? AND full_name = ?", [(login, name) for name in known - seen]
+                )
+            self._save_state("repos", new_etag, new_high_water)
+        self.stats["syncs"] += 1
+        return written
+
+    def sync_issues(self, repo_name, full=False):
+        """Bring the open issues of a repository up to date; returns the number of issues fetched"""
+        key = self.issues_key(repo_name)
+        _, etag, since = self._state(key)
+        if full or since is None:
+            etag = since = None
+        login = self.login
+        url = f"/repos/{login}/{repo_name}/issues"
+        params = {"state": "all" if since else "open", "sort": "updated", "direction": "asc", "per_page": 100}
+        if since:
+            params["since"] = since
+        fetched, new_etag, high_water = 0, etag, since
+        with request_priority(BULK), self._lock, self.db:
+            if full or since is None:
+                self.db.execute("DELETE FROM issues WHERE login = ? AND repo = ?", (login, repo_name))
+            for number, (page, headers) in enumerate(self._pages(url, params, etag)):
+                if number == 0:
+                    new_etag = headers.get("etag")
+                for raw in page:
+                    if raw["state"] == "open":
+                        self.db.execute(
+                            "INSERT OR REPLACE INTO issues (login, repo, number, title, url, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                            (login, repo_name, raw["number"], raw["title"], raw.get("html_url"), raw.get("updated_at"))
+                        )
+                    else:
+                        self.db.execute(
+                            "DELETE FROM issues WHERE login = ? AND repo = ? AND number = ?", (login, repo_name, raw["number"])
+                        )
+                    high_water = max(high_water or "", raw.get("updated_at") or "") or None
+                fetched += len(page)
+            self._save_state(key, new_etag, high_water or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+        self.stats["syncs"] += 1
+        return fetched
+
+    def ensure_fresh(self, key):
+        """Sync `key` ("repos" or issues_key(name)) unless it is within the staleness bound"""
+        if self.is_fresh(key):
+            return
+        if key == "repos":
+            self.sync_repositories()
+        else:
+            self.sync_issues(key.split(":", 1)[1])
+
+    def sync_all(self, full=False):
+        """Sync the repositories and the issues of every repository mirrored so far"""
+        repos = self.sync_repositories(full=full)
+        login = self.login
+        with self._lock:
+            tracked = [
+                row[0] for row in self.db.execute(
+                    "SELECT key FROM sync_state WHERE login = ? AND key LIKE 'issues:%'", (login,)
+                )
+            ]
+        issues = sum(self.sync_issues(key.split(":", 1)[1], full=full) for key in tracked)
+        return {"repositories": repos, "issues": issues, "issue_repositories": len(tracked)}
+
+    # -- reads -------------------------------------------------------------
+
+    def repositories(self, limit, offset=0):
+        """(raw repository dicts ordered like /user/repos, total count)"""
+        login = self.login
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT data FROM repos WHERE login = ? ORDER BY lower(full_name) LIMIT ? OFFSET ?", (login, limit, offset)
+            ).fetchall()
+            total = self.db.execute("SELECT COUNT(*) FROM repos WHERE login = ?", (login,)).fetchone()[0]
+        self.stats["reads"] += 1
+        return [json.loads(row[0]) for row in rows], total
+
+    def repository(self, full_name):
+        login = self.login
+        with self._lock:
+            row = self.db.execute(
+                "SELECT data FROM repos WHERE login = ? AND full_name = ?", (login, full_name)
+            ).fetchone()
+        self.stats["reads"] += 1
+        return json.loads(row[0]) if row else None
+
+    def issues(self, repo_name, limit, offset=0):
+        """(open issue dicts, newest first like the REST listing, total count)"""
+        login = self.login
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT title, url FROM issues WHERE login = ? AND repo = ? ORDER BY number DESC LIMIT ? OFFSET ?",
+                (login, repo_name, limit, offset)
+            ).fetchall()
+            total = self.db.execute(
+                "SELECT COUNT(*) FROM issues WHERE login = ? AND repo = ?", (login, repo_name)
+            ).fetchone()[0]
+        self.stats["reads"] += 1
+        return [{"title": title, "url": url} for title, url in rows], total
+
+    # -- background refresh ------------------------------------------------
+
+    def start_refresher(self, interval):
+        """Re-sync everything mirrored so far every `interval` seconds on a daemon thread"""
+        if self._refresher or interval <= 0:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sync_all()
+                except Exception as e:
+                    print(f"⚠️ Mirror refresh failed: {e}")
+
+        self._refresher = threading.Thread(target=run, name="github-mirror-refresh", daemon=True)
+        self._refresher.start()
+
+    def status(self):
+        login = self.login
+        with self._lock:
+            repos = self.db.execute("SELECT COUNT(*) FROM repos WHERE login = ?", (login,)).fetchone()[0]
+            issues = self.db.execute("SELECT COUNT(*) FROM issues WHERE login = ?", (login,)).fetchone()[0]
+        synced_at = self._state("repos")[0]
+        return {
+            "path": self.path,
+            "login": login,
+            "repositories": repos,
+            "issues": issues,
+            "repos_age_seconds": round(time.time() - synced_at, 1) if synced_at else None,
+            "max_staleness": self.max_staleness,
+            **self.stats,
+        }
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            self.db.close()
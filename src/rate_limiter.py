@@ -0,0 +1,368 @@
+import contextlib
+import contextvars
+import email.utils
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+
+INTERACTIVE = 0
+BULK = 1
+
+_priority = contextvars.ContextVar("github_request_priority", default=INTERACTIVE)
+
+@contextlib.contextmanager
+def request_priority(priority):
+    """Run GitHub requests made inside the block at the given priority (INTERACTIVE or BULK)"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def priority_context(priority):
+    """Copy of the current context whose GitHub requests run at `priority` (for executor threads)"""
+    context = contextvars.copy_context()
+    context.run(_priority.set, priority)
+    return context
+
+def _retry_after_seconds(value):
+    """Seconds of a Retry-After header, given as a number or an HTTP date (60 if unreadable)"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 60.0
+
+class RateLimitExhausted(Exception):
+    """The budget is spent and the reset is further away than max_wait"""
+
+def _resource_for(path):
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+class SharedRateState:
+    """Token buckets, rate-limit budgets and write slots in a SQLite file, shared by processes on one host.
+
+    Lets the worker processes of one server (see src/transport.py --workers)
+    spend a single GitHub budget instead of one each. Rows are keyed by a
+    hash of the token, so every token still has its own budget. Timestamps
+    are time.monotonic(), which is system-wide, not per process.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, refilled_at REAL NOT NULL, last_write REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS budgets (key TEXT NOT NULL, resource TEXT NOT NULL, "
+            "remaining INTEGER NOT NULL, rate_limit INTEGER NOT NULL, reset INTEGER NOT NULL, PRIMARY KEY (key, resource))"
+        )
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # IMMEDIATE: take the write lock up front so concurrent processes queue instead of failing
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def _bucket(self, key, burst):
+        row = self.db.execute("SELECT tokens, refilled_at, last_write FROM buckets WHERE key = ?", (key,)).fetchone()
+        return list(row) if row else [float(burst), time.monotonic(), 0.0]
+
+    @contextlib.contextmanager
+    def bucket(self, key, burst):
+        """Lock the bucket of `key` across processes and yield it as {"tokens", "refilled_at", "budgets"} to update"""
+        with self._transaction():
+            tokens, refilled_at, last_write = self._bucket(key, burst)
+            budgets = {
+                resource: {"remaining": remaining, "limit": limit, "reset": reset}
+                for resource, remaining, limit, reset in self.db.execute(
+                    "SELECT resource, remaining, rate_limit, reset FROM budgets WHERE key = ?", (key,)
+                )
+            }
+            state = {"tokens": tokens, "refilled_at": refilled_at, "budgets": budgets}
+            yield state
+            self.db.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, refilled_at, last_write) VALUES (?, ?, ?, ?)",
+                (key, state["tokens"], state["refilled_at"], last_write)
+            )
+
+    def observe(self, key, resource, budget):
+        """Record a budget from response headers, ignoring ones older than what another process already saw"""
+        with self._transaction():
+            row = self.db.execute(
+                "SELECT remaining, reset FROM budgets WHERE key = ? AND resource = ?", (key, resource)
+            ).fetchone()
+            # Responses of concurrent requests arrive out of order; within one
+            # reset window the lowest remaining count is the current one
+            if row and (row[1] > budget["reset"] or (row[1] == budget["reset"] and row[0] <= budget["remaining"])):
+                return
+            self.db.execute(
+                "INSERT OR REPLACE INTO budgets (key, resource, remaining, rate_limit, reset) VALUES (?, ?, ?, ?, ?)",
+                (key, resource, budget["remaining"], budget["limit"], budget["reset"])
+            )
+
+    def reserve_write(self, key, interval, burst):
+        """Seconds to wait before this process may start a write, so writes of all processes start `interval` apart"""
+        with self._transaction():
+            tokens, refilled_at, last_write = self._bucket(key, burst)
+            now = time.monotonic()
+            start = max(now, last_write + interval)
+            self.db.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, refilled_at, last_write) VALUES (?, ?, ?, ?)",
+                (key, tokens, refilled_at, start)
+            )
+        return start - now
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+_shared_states = {}
+_shared_states_lock = threading.Lock()
+
+def shared_rate_state_from_env():
+    """The process-wide SharedRateState at GITHUB_RATE_STATE_PATH, or None when it isn't set"""
+    path = os.getenv("GITHUB_RATE_STATE_PATH")
+    if not path:
+        return None
+    with _shared_states_lock:
+        if path not in _shared_states:
+            _shared_states[path] = SharedRateState(path)
+        return _shared_states[path]
+
+class RateLimitScheduler:
+    """Central pacing for every GitHub HTTP request, installed as transport middleware.
+
+    - tracks X-RateLimit-Remaining/Limit/Reset per resource from responses
+    - paces requests with a token bucket, slowing down to spread the remaining
+      budget over the reset window once it runs low
+    - serializes content-creating requests with a minimum gap between them,
+      as GitHub asks to avoid secondary rate limits (git blobs, trees and
+      commits excepted: they are invisible until a ref update, which is
+      serialized, so the blobs of a commit can be uploaded concurrently)
+    - honors Retry-After (or the reset time) on 403/429 rate-limit responses
+    - hands out tokens to INTERACTIVE requests before queued BULK ones, and
+      keeps the last `reserve` requests of a budget for INTERACTIVE ones
+    - fails a request with RateLimitExhausted instead of blocking longer
+      than max_wait for the budget to reset
+
+    With a `shared` SharedRateState the bucket, budgets and write spacing
+    are kept there under `key` (a hash of the token), so several processes
+    together stay within one rate. Priorities still apply within a process.
+    """
+
+    def __init__(self, rate=None, burst=None, write_interval=None, reserve=None, max_wait=None, max_retries=2,
+                 shared=None, key=""):
+        self.rate = rate or float(os.getenv("GITHUB_REQUESTS_PER_SECOND", "10"))
+        self.burst = burst or int(os.getenv("GITHUB_BURST", "20"))
+        self.write_interval = write_interval if write_interval is not None else float(os.getenv("GITHUB_WRITE_INTERVAL", "1.0"))
+        self.reserve = reserve if reserve is not None else int(os.getenv("GITHUB_RATE_RESERVE", "50"))
+        self.max_wait = max_wait or float(os.getenv("GITHUB_MAX_RATE_WAIT", "60"))
+        self.max_retries = max_retries
+        self.shared = shared
+        self.key = key
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+        self.budgets = {}
+        self.stats = {"requests": 0, "throttled_seconds": 0.0, "rate_limited": 0, "retries": 0}
+
+    # -- budget tracking -------------------------------------------------
+
+    def observe(self, path, headers):
+        """Update the budget of a resource from rate-limit response headers"""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource") or _resource_for(path)
+        budget = {
+            "remaining": int(float(headers["X-RateLimit-Remaining"])),
+            "limit": int(float(headers.get("X-RateLimit-Limit", 0))),
+            "reset": int(float(headers.get("X-RateLimit-Reset", 0))),
+        }
+        if self.shared is not None:
+            self.shared.observe(self.key, resource, budget)
+        with self._cond:
+            self.budgets[resource] = budget
+            self._cond.notify_all()
+
+    def _current_rate(self, resource, priority):
+        """Configured rate, lowered to last until reset once the budget drops under 20%.
+
+        BULK requests spread only what is left above the reserve; INTERACTIVE
+        ones may spend the reserve too.
+        """
+        budget = self.budgets.get(resource)
+        if not budget or not budget["limit"] or budget["remaining"] > budget["limit"] * 0.2:
+            return self.rate
+        seconds_left = max(1.0, budget["reset"] - time.time())
+        spendable = budget["remaining"] - (0 if priority == INTERACTIVE else self.reserve)
+        return max(0.01, min(self.rate, spendable / seconds_left))
+
+    def _wait_time(self, resource, priority):
+        """Seconds until a request for `resource` may start (0 = now). Caller holds the lock"""
+        budget = self.budgets.get(resource)
+        # BULK requests leave the reserve to interactive use instead of running the budget dry
+        floor = 0 if priority == INTERACTIVE else self.reserve
+        if budget and budget["remaining"] <= floor and budget["reset"] > time.time():
+            return budget["reset"] - time.time()
+
+        now = time.monotonic()
+        rate = self._current_rate(resource, priority)
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / rate
+
+    def _take(self, resource, priority):
+        """_wait_time, taking the token when it is 0. Caller holds the lock"""
+        if self.shared is None:
+            wait = self._wait_time(resource, priority)
+            if wait == 0:
+                self._tokens -= 1
+            return wait
+        with self.shared.bucket(self.key, self.burst) as state:
+            self._tokens, self._refilled_at = state["tokens"], state["refilled_at"]
+            self.budgets.update(state["budgets"])
+            wait = self._wait_time(resource, priority)
+            if wait == 0:
+                self._tokens -= 1
+            state["tokens"], state["refilled_at"] = self._tokens, self._refilled_at
+        return wait
+
+    # -- admission ---------------------------------------------------------
+
+    def acquire(self, resource="core", priority=None):
+        """Block until the request may be sent; higher priority waiters go first. Returns the seconds waited.
+
+        Raises RateLimitExhausted instead of waiting longer than max_wait.
+        """
+        ticket = (_priority.get() if priority is None else priority, next(self._sequence))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    wait = self._take(resource, ticket[0]) if self._waiters[0] == ticket else None
+                    if wait == 0:
+                        break
+                    if wait is not None and wait > self.max_wait:
+                        raise RateLimitExhausted(self._exhausted_message(resource, wait))
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                waited = time.monotonic() - started
+                self.stats["requests"] += 1
+                self.stats["throttled_seconds"] += waited
+                self._cond.notify_all()
+        return waited
+
+    def _exhausted_message(self, resource, wait):
+        """Error for a request that would wait `wait` seconds, naming when the budget resets"""
+        budget = self.budgets.get(resource)
+        resets_in = budget["reset"] - time.time() if budget else 0
+        if resets_in > 0:
+            return f"GitHub {resource} rate limit exhausted, resets in {int(resets_in) + 1} s"
+        return f"GitHub {resource} rate limit exhausted, next request possible in {int(wait) + 1} s"
+
+    @contextlib.contextmanager
+    def _write_slot(self):
+        """Serialize content-creating requests and keep them write_interval apart"""
+        with self._write_lock:
+            gap = self._last_write + self.write_interval - time.monotonic()
+            if self.shared is not None:
+                # Other processes only see when a write starts, not when it ends
+                gap = max(gap, self.shared.reserve_write(self.key, self.write_interval, self.burst))
+            if gap > 0:
+                time.sleep(gap)
+            try:
+                yield
+            finally:
+                self._last_write = time.monotonic()
+
+    def _retry_delay(self, response):
+        """Seconds to wait before retrying a rate-limited response, or None if it isn't one"""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            return _retry_after_seconds(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return max(0.0, float(response.headers.get("X-RateLimit-Reset", 0)) - time.time())
+        if "secondary rate limit" in response.text.lower():
+            return 60.0
+        return None
+
+    def middleware(self, request, call_next):
+        """Transport middleware applying pacing, write serialization and Retry-After handling.
+
+        Sets request.attempts and request.wait_seconds for the metrics middleware.
+        """
+        resource = _resource_for(request.path)
+        request.wait_seconds = 0.0
+        for attempt in range(self.max_retries + 1):
+            request.attempts = attempt + 1
+            request.wait_seconds += self.acquire(resource)
+            if request.is_write and not request.is_git_object:
+                with self._write_slot():
+                    response = call_next(request)
+            else:
+                response = call_next(request)
+            self.observe(request.path, response.headers)
+
+            delay = self._retry_delay(response)
+            if delay is None:
+                return response
+            with self._cond:
+                self.stats["rate_limited"] += 1
+            if attempt == self.max_retries or delay > self.max_wait:
+                return response
+            with self._cond:
+                self.stats["retries"] += 1
+            request.wait_seconds += delay
+            time.sleep(delay)
+        return response
+
+    def status(self):
+        """Current budget per resource, bucket level and queue depth"""
+        with self._cond:
+            now = time.time()
+            return {
+                "budgets": {
+                    resource: {**budget, "resets_in": max(0, int(budget["reset"] - now))}
+                    for resource, budget in self.budgets.items()
+                },
+                "tokens": round(self._tokens, 2),
+                "rate_per_second": self.rate,
+                "queue_depth": len(self._waiters),
+                "queued_bulk": sum(1 for priority, _ in self._waiters if priority == BULK),
+                "write_in_progress": self._write_lock.locked(),
+                **{key: round(value, 3) if isinstance(value, float) else value for key, value in self.stats.items()},
+            }
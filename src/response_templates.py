@@ -0,0 +1,67 @@
+def _plural(count, word, plural=None):
+    return f"{count} {word}" if count == 1 else f"{count} {plural or word + 's'}"
+
+def render_response(action, result):
+    """Render a friendly message for a tool result without calling the LLM.
+
+    Lists, links and stats are printed separately by display_result, so the
+    message only summarizes what happened.
+    """
+    label = (action or "operation").replace("_", " ")
+    if action == "execute_plan" and "steps" in result:
+        lines = [f"{'✅' if result.get('success') else '⚠️'} {result.get('message')} in {result.get('elapsed')}s:"]
+        for step in result["steps"]:
+            lines.append(f"  {step['id']}: {render_response(step['action'], step['result'])}")
+        return "\n".join(lines)
+
+    if action == "create_issues_bulk" and "items" in result:
+        icon = "✅" if result.get("success") else "⚠️"
+        message = (
+            f"{icon} Created {_plural(result['created'], 'issue')} in {result.get('elapsed')}s, "
+            f"skipped {result['skipped']} that already existed"
+        )
+        if result["failed"]:
+            message += f"; {result['failed']} failed — run the import again to retry them"
+        return message + "."
+
+    if not result.get("success"):
+        return f"❌ Could not {label}: {result.get('error', 'Unknown error')}"
+
+    if action == "list_repositories":
+        message = f"📚 Here are {_plural(result.get('returned', 0), 'repository', 'repositories')}"
+        if "count" in result:
+            message += f" of the {result['count']} on your account"
+        if result.get("next_cursor"):
+            message += " — ask for more to see the next page"
+        return message + "."
+
+    if action == "list_issues":
+        message = f"🐛 Found {_plural(result.get('count', result.get('returned', 0)), 'open issue')}"
+        if result.get("next_cursor"):
+            message += f", showing the first {result.get('returned', 0)}"
+        return message + "."
+
+    if action == "get_repository_info":
+        description = result.get("description") or "No description"
+        language = result.get("language") or "an unknown language"
+        return f"📦 {result.get('name')}: {description}. Written in {language}."
+
+    if action == "get_repository_stats":
+        return (
+            f"📊 {result.get('name')}: 👀 {result.get('watchers')} watchers, "
+            f"🐛 {_plural(result.get('issues', 0), 'open issue')}, {result.get('size')} KB, "
+            f"last updated {result.get('updated_at')}."
+        )
+
+    if action == "get_bulk_repository_stats":
+        stats = result.get("stats", [])
+        message = (
+            f"📊 Stats for {_plural(len(stats), 'repository', 'repositories')}: "
+            f"⭐ {_plural(sum(s['stars'] for s in stats), 'star')} and "
+            f"🍴 {_plural(sum(s['forks'] for s in stats), 'fork')} in total"
+        )
+        if result.get("errors"):
+            message += f" ({_plural(len(result['errors']), 'repository', 'repositories')} could not be read)"
+        return message + "."
+
+    return f"✅ {result.get('message') or 'Operation completed successfully!'}"
@@ -0,0 +1,95 @@
+import re
+
+# Quoted titles and bodies are never rewritten (apostrophes as in "what's" don't open a quote)
+QUOTED_SPAN = r"(\"[^\"]*\"|“[^”]*”|(?<!\w)'[^']*'(?!\w))"
+
+REPO_WORDS = r"(?:repo|repository|project)"
+# "there" as a place ("create an issue there"), not the existential one ("are there any issues?")
+THERE = r"(?<!\bis )(?<!\bare )(?<!\bwas )(?<!\bwere )\bthere\b(?!'s\b| (?:is|are|was|were|be|has|have)\b)"
+# (pattern, entity, preposition to add when the phrase has none) applied outside quotes
+REFERENCES = [
+    (r"\b(?:(?P<prep>in|on|for|of|to|into) )?(?:that|this|the same|the last) " + REPO_WORDS + r"\b", "repo", ""),
+    # "from there into main" is a branch, see below
+    (r"(?:\b(?P<prep>in|on|for|of|to|into) )?(?<!\bfrom )" + THERE, "repo", "in"),
+    (r"\b(?P<prep>in|for|of|into) it(?=[\s.!?]*$)", "repo", ""),
+    (r"\b(?:that|this|the same|the new|the last) branch\b", "branch", ""),
+    (r"\b(?P<prep>from) (?:it|there)\b(?= (?:in)?to\b)", "branch", ""),
+]
+
+# Anything like this left after resolution needs the LLM and the session context
+UNRESOLVED = re.compile(
+    THERE + r"|\b(?:it|that one|the same|(?:that|this|the last) (?:repo|repository|project|branch|pr|pull request|issue))\b",
+    re.IGNORECASE
+)
+
+class ConversationSession:
+    """Entities from the recent turns of one interactive session.
+
+    Follow-ups like "now create an issue there titled 'Bug'" are rewritten
+    with the remembered repository or branch before parsing, so the rule
+    tier can answer them without an LLM call. References it can't rewrite
+    are sent to the LLM with a one-line context instead.
+    """
+
+    def __init__(self):
+        self.repo = None
+        self.branch = None
+        self.pull_request = None
+        self.issue = None
+
+    def _rewrite(self, text):
+        entities = {"repo": self.repo, "branch": self.branch}
+        for pattern, entity, default_prep in REFERENCES:
+            value = entities[entity]
+            if not value:
+                continue
+
+            def replace(m):
+                prep = m.groupdict().get("prep") or default_prep
+                return f"{prep} {value}" if prep else value
+            text = re.sub(pattern, replace, text, flags=re.IGNORECASE)
+        return text
+
+    def resolve(self, user_input):
+        """Return (utterance with known references filled in, whether references remain)"""
+        parts = re.split(QUOTED_SPAN, user_input)
+        # Odd indexes are the quoted spans
+        parts = [part if i % 2 else self._rewrite(part) for i, part in enumerate(parts)]
+        unresolved = bool(UNRESOLVED.search(" ".join(parts[::2]))) and self.context() is not None
+        return "".join(parts), unresolved
+
+    def context(self):
+        """One line describing the remembered entities for the LLM, or None"""
+        known = [
+            f"{label}: {value}"
+            for label, value in (
+                ("last repository", self.repo), ("last branch", self.branch),
+                ("last pull request", self.pull_request), ("last issue", self.issue),
+            )
+            if value
+        ]
+        return "; ".join(known) or None
+
+    def remember_plan(self, plan, result):
+        """remember() every step of an executed plan, in plan order"""
+        for step, outcome in zip(plan, result.get("steps", [])):
+            self.remember(outcome["action"], step.get("parameters") or {}, outcome["result"])
+
+    def remember(self, action, parameters, result):
+        """Update the entities from a successful tool call"""
+        if not result.get("success"):
+            return
+        if action == "create_repository":
+            self.repo = parameters.get("name") or self.repo
+        elif parameters.get("repo_name"):
+            self.repo = parameters["repo_name"]
+        if action == "create_branch":
+            self.branch = parameters.get("branch_name")
+        elif action == "create_pull_request":
+            self.branch = parameters.get("head") or self.branch
+            self.pull_request = result.get("url")
+        elif action == "commit_files_and_open_pr":
+            self.branch = parameters.get("branch") or self.branch
+            self.pull_request = result.get("url")
+        elif action == "create_issue":
+            self.issue = result.get("url")
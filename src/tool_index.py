@@ -0,0 +1,93 @@
+import json
+import math
+import re
+from collections import Counter
+
+# Words that say nothing about which tool is meant
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "into", "to", "for", "on", "at", "by", "with", "from",
+    "me", "my", "i", "it", "its", "is", "are", "be", "this", "that", "all", "please", "can", "you",
+    "want", "would", "like", "some", "one", "called", "named", "titled", "about",
+}
+
+# Spellings users type for the words tool descriptions use
+SYNONYMS = {
+    "repo": "repository", "pr": "pull request", "prs": "pull request", "stat": "statistic",
+    "stats": "statistic", "info": "information", "details": "information", "make": "create",
+    "add": "create", "new": "create", "show": "list", "display": "list",
+    "ticket": "issue", "bug": "issue",
+}
+
+def _stem(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def tokenize(text):
+    """Lowercase word stems of `text` with synonyms expanded and stopwords dropped"""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        for part in SYNONYMS.get(word, word).split():
+            if part not in STOPWORDS:
+                tokens.append(_stem(part))
+    return tokens
+
+def tool_signature(tool):
+    """One prompt line for a tool: name(parameters) — description, with hints for structured parameters"""
+    schema = tool.schema
+    required = set(schema.get("required", []))
+    params, hints = [], []
+    for name, prop in schema.get("properties", {}).items():
+        if name in required:
+            params.append(name)
+        elif "default" in prop:
+            params.append(f"{name}={json.dumps(prop['default'])}")
+        else:
+            params.append(f"{name}?")
+        if prop.get("type") in ("array", "object") and prop.get("description"):
+            hints.append(f"{name}: {prop['description']}")
+    line = f"- {tool.name}({', '.join(params)}) — {tool.description}"
+    return line + (f" ({'; '.join(hints)})" if hints else "")
+
+class ToolIndex:
+    """TF-IDF index over the tools of a registry, for picking the few a request needs.
+
+    Each tool is indexed by its name, description, argument names and
+    descriptions, and example utterances. Everything is local and built
+    once; a lookup is a sparse dot product per tool.
+    """
+
+    def __init__(self, tools):
+        self.tools = list(tools)
+        documents = []
+        for tool in self.tools:
+            text = [tool.name.replace("_", " ")] * 2 + [tool.description] + list(tool.examples)
+            for name, prop in tool.schema.get("properties", {}).items():
+                text += [name.replace("_", " "), prop.get("description", "")]
+            documents.append(Counter(tokenize(" ".join(text))))
+        document_frequency = Counter(term for document in documents for term in document)
+        count = len(documents)
+        self.idf = {term: math.log((count + 1) / (df + 1)) + 1 for term, df in document_frequency.items()}
+        self.vectors = [self._vector(document) for document in documents]
+        self.signatures = {tool.name: tool_signature(tool) for tool in self.tools}
+
+    def _vector(self, counts):
+        weights = {term: (1 + math.log(n)) * self.idf[term] for term, n in counts.items() if term in self.idf}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def select(self, text, k):
+        """The k tools most relevant to `text`, best first (registry order on ties)"""
+        query = self._vector(Counter(tokenize(text)))
+        scores = [
+            (sum(weight * vector.get(term, 0.0) for term, weight in query.items()), -position, tool)
+            for position, (tool, vector) in enumerate(zip(self.tools, self.vectors))
+        ]
+        scores.sort(key=lambda item: item[:2], reverse=True)
+        return [tool for _, _, tool in scores[:k]]
+
+    def describe(self, tools=None):
+        """Prompt lines for `tools` (default: all of them)"""
+        return "\n".join(self.signatures[tool.name] for tool in (self.tools if tools is None else tools))
@@ -0,0 +1,336 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+from src.commit_files import normalize_path
+
+class ToolArguments(BaseModel):
+    """Base for tool argument models.
+
+    Unknown keys are dropped (LLM output often carries extras) and numbers
+    are accepted where strings are expected, e.g. a cursor of 10.
+    """
+    model_config = ConfigDict(extra="ignore", coerce_numbers_to_str=True, str_strip_whitespace=True)
+
+class InvalidArguments(ValueError):
+    """Tool call rejected before running: unknown tool or arguments not matching its schema"""
+
+def _describe(error):
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'arguments'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+class Tool:
+    """One MCP tool: its schema, handler and in-flight limit.
+
+    `read_only` tools change nothing on GitHub, so identical concurrent calls
+    can share one execution (see GitHubMCPServer.call_tool). `examples` are
+    requests the tool answers, used to pick relevant tools for the parse
+    prompt (see src/tool_index.py). `local_paths` are the arguments naming
+    files on the server, checked against LocalFileAccess before the call.
+    """
+
+    def __init__(self, name, description, arguments, handler, concurrency=None, read_only=False, examples=(),
+                 local_paths=()):
+        self.name = name
+        self.description = description
+        self.arguments = arguments
+        self.handler = handler
+        self.concurrency = concurrency
+        self.read_only = read_only
+        self.examples = tuple(examples)
+        self.local_paths = tuple(local_paths)
+        self.schema = _clean_schema(arguments.model_json_schema())
+
+    def bind(self, parameters):
+        """Validate raw parameters into the argument model, before any I/O happens"""
+        try:
+            return self.arguments.model_validate(parameters or {})
+        except ValidationError as e:
+            raise InvalidArguments(f"Invalid arguments for {self.name}: {_describe(e)}") from None
+
+    def run(self, client, parameters):
+        return self.handler(client, self.bind(parameters))
+
+def _clean_schema(schema):
+    """Plain JSON schema for MCP clients: no pydantic titles, Optional[X] shown as X"""
+    schema.pop("title", None)
+    for definition in schema.get("$defs", {}).values():
+        _clean_schema(definition)
+    for prop in schema.get("properties", {}).values():
+        prop.pop("title", None)
+        options = prop.pop("anyOf", None)
+        if options:
+            prop.update(next(option for option in options if option.get("type") != "null"))
+        if prop.get("default", "") is None:
+            del prop["default"]
+    return schema
+
+class ToolRegistry:
+    """Tools by name. Register with the @registry.tool(...) decorator"""
+
+    def __init__(self):
+        self.tools = {}
+        self._list_payload = None
+
+    def tool(self, name, description, arguments=ToolArguments, concurrency=None, read_only=False, examples=(),
+             local_paths=()):
+        def register(handler):
+            self.tools[name] = Tool(name, description, arguments, handler, concurrency, read_only, examples, local_paths)
+            self._list_payload = None
+            return handler
+        return register
+
+    def get(self, name):
+        return self.tools.get(name)
+
+    def __contains__(self, name):
+        return name in self.tools
+
+    def __iter__(self):
+        return iter(self.tools.values())
+
+    def definitions(self):
+        """{name: {"description", "parameters"}} as used for discovery"""
+        return {tool.name: {"description": tool.description, "parameters": tool.schema} for tool in self}
+
+    def list_payload(self):
+        """tools/list result, built once and reused until a tool is registered"""
+        if self._list_payload is None:
+            self._list_payload = {
+                "tools": [
+                    {"name": tool.name, "description": tool.description, "inputSchema": tool.schema, "parameters": tool.schema}
+                    for tool in self
+                ]
+            }
+        return self._list_payload
+
+    def concurrency_limits(self):
+        return {tool.name: tool.concurrency for tool in self if tool.concurrency}
+
+registry = ToolRegistry()
+
+# -- argument models -------------------------------------------------------
+
+class RepoArgs(ToolArguments):
+    repo_name: str = Field(min_length=1, description="Repository name")
+
+class CreateRepositoryArgs(ToolArguments):
+    name: str = Field(min_length=1, description="Repository name")
+    description: str = Field("", description="Repository description")
+    private: bool = Field(False, description="Make repository private")
+
+class ListRepositoriesArgs(ToolArguments):
+    limit: int = Field(10, ge=1, description="Maximum number of repositories to return (default 10)")
+    cursor: Optional[str] = Field(None, description="next_cursor from a previous call to continue the listing")
+    per_page: Optional[int] = Field(None, ge=1, le=100, description="GitHub page size used while fetching (max 100)")
+
+class CreateIssueArgs(RepoArgs):
+    title: str = Field(min_length=1, description="Issue title")
+    body: str = Field("", description="Issue description")
+
+class ListIssuesArgs(RepoArgs):
+    limit: int = Field(30, ge=1, description="Maximum number of issues to return (default 30)")
+    cursor: Optional[str] = Field(None, description="next_cursor from a previous call to continue the listing")
+    per_page: Optional[int] = Field(None, ge=1, le=100, description="GitHub page size used while fetching (max 100)")
+
+class BulkIssue(ToolArguments):
+    title: str = Field(min_length=1, description="Issue title")
+    body: str = Field("", description="Issue description")
+
+class CreateIssuesBulkArgs(RepoArgs):
+    issues: Optional[List[BulkIssue]] = Field(None, description='Issues to create: [{"title": "...", "body": "..."}] or plain titles')
+    path: Optional[str] = Field(
+        None, description="Local .csv (title, body columns), .jsonl or .json file of issues instead of `issues` (local CLI or MCP_FILE_ROOT only)"
+    )
+    checkpoint: Optional[str] = Field(
+        None, description="Progress file for resuming (default: <path>.<repo>.checkpoint.json; local CLI or MCP_FILE_ROOT only)"
+    )
+
+    @field_validator("issues", mode="before")
+    @classmethod
+    def _titles_as_issues(cls, value):
+        if isinstance(value, list):
+            return [{"title": item} if isinstance(item, str) else item for item in value]
+        return value
+
+    @model_validator(mode="after")
+    def _issues_or_path(self):
+        if not self.issues and not self.path:
+            raise ValueError("give either issues or path")
+        return self
+
+class CreateBranchArgs(RepoArgs):
+    branch_name: str = Field(min_length=1, description="New branch name")
+    source_branch: str = Field("main", description="Source branch (default: main)")
+
+class BulkRepoStatsArgs(ToolArguments):
+    repo_names: Optional[List[str]] = Field(None, description="Repository names (default: all owned repositories)")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of repositories when listing all of them")
+
+class CreatePullRequestArgs(RepoArgs):
+    title: str = Field(min_length=1, description="Pull request title")
+    head: str = Field(min_length=1, description="Branch with your changes")
+    base: str = Field(min_length=1, description="Branch to merge into")
+    body: str = Field("", description="Pull request description (optional)")
+
+class CommitFile(ToolArguments):
+    # File content is committed byte for byte, trailing newline included
+    model_config = ConfigDict(str_strip_whitespace=False)
+
+    path: str = Field(min_length=1, description="Path of the file in the repository")
+    content: str = Field("", description="New file content")
+    encoding: Literal["utf-8", "base64"] = Field("utf-8", description="Encoding of content (base64 for binary files)")
+    delete: bool = Field(False, description="Delete the file instead")
+
+    @field_validator("path")
+    @classmethod
+    def _repository_path(cls, value):
+        return normalize_path(value.strip())
+
+class CommitFilesArgs(RepoArgs):
+    branch: str = Field(min_length=1, description="New branch to commit to and open the pull request from")
+    title: str = Field(min_length=1, description="Pull request title (also the commit message unless message is given)")
+    files: Optional[List[CommitFile]] = Field(
+        None, description='Files to add, update or delete: [{"path": "...", "content": "..."}, {"path": "...", "delete": true}]'
+    )
+    directory: Optional[str] = Field(
+        None, description="Local directory whose files are committed instead of `files` (local CLI or MCP_FILE_ROOT only)"
+    )
+    base: str = Field("main", description="Branch to start from and merge into (default: main)")
+    message: Optional[str] = Field(None, description="Commit message (default: the title)")
+    body: str = Field("", description="Pull request description (optional)")
+    concurrency: int = Field(8, ge=1, le=16, description="Blobs uploaded in parallel (default 8)")
+
+    @model_validator(mode="after")
+    def _files_or_directory(self):
+        if not self.files and not self.directory:
+            raise ValueError("give either files or directory")
+        return self
+
+class ResyncMirrorArgs(ToolArguments):
+    repo_name: Optional[str] = Field(None, description="Only this repository's issues (default: everything mirrored)")
+    full: bool = Field(True, description="Refetch everything instead of only changes (default true)")
+
+# -- tools -------------------------------------------------------------------
+# Content-creating tools get a small number of in-flight calls so a burst of
+# requests doesn't trip GitHub's secondary rate limits. Read tools default to
+# the full worker pool and are marked read_only so identical concurrent calls
+# are coalesced.
+
+@registry.tool(
+    "create_repository", "Create a new GitHub repository", CreateRepositoryArgs, concurrency=1,
+    examples=["create a repository called my-project", "make a new private repo named notes"]
+)
+def create_repository(client, args):
+    return client.create_repository(name=args.name, description=args.description, private=args.private)
+
+@registry.tool(
+    "list_repositories", "List user repositories", ListRepositoriesArgs, read_only=True,
+    examples=["show me my repositories", "what repos do I have", "list my projects"]
+)
+def list_repositories(client, args):
+    return client.list_repositories(limit=args.limit, cursor=args.cursor, per_page=args.per_page)
+
+@registry.tool(
+    "get_repository_info", "Get detailed repository information", RepoArgs, read_only=True,
+    examples=["get information about api-gateway", "tell me about the docs repo", "describe my-project"]
+)
+def get_repository_info(client, args):
+    return client.get_repo_info(args.repo_name)
+
+@registry.tool(
+    "create_issue", "Create an issue in a repository", CreateIssueArgs, concurrency=4,
+    examples=["create an issue in my-project titled 'Fix login'", "file a bug in api about the crash", "report a problem"]
+)
+def create_issue(client, args):
+    return client.create_issue(repo_name=args.repo_name, title=args.title, body=args.body)
+
+@registry.tool(
+    "create_issues_bulk",
+    "Create many issues in a repository at once from a list or a CSV/JSONL file, skipping ones that already exist; "
+    "prefer it over several create_issue steps",
+    CreateIssuesBulkArgs,
+    concurrency=1,
+    local_paths=("path", "checkpoint"),
+    examples=["import issues from backlog.csv into my-project", "create issues A, B and C in repo-x"]
+)
+def create_issues_bulk(client, args):
+    issues = [issue.model_dump() for issue in args.issues] if args.issues else None
+    return client.create_issues_bulk(
+        repo_name=args.repo_name, issues=issues, path=args.path, checkpoint=args.checkpoint
+    )
+
+@registry.tool(
+    "list_issues", "List issues in a repository", ListIssuesArgs, read_only=True,
+    examples=["list open issues in api-gateway", "what bugs are reported in docs", "show the tickets of my-project"]
+)
+def list_issues(client, args):
+    return client.list_issues(repo_name=args.repo_name, limit=args.limit, cursor=args.cursor, per_page=args.per_page)
+
+@registry.tool(
+    "create_branch", "Create a new branch in a repository", CreateBranchArgs, concurrency=4,
+    examples=["create a branch called fix-typo in docs from main", "start a feature branch in api"]
+)
+def create_branch(client, args):
+    return client.create_branch(repo_name=args.repo_name, branch_name=args.branch_name, source_branch=args.source_branch)
+
+@registry.tool(
+    "get_repository_stats", "Get repository statistics", RepoArgs, read_only=True,
+    examples=["show stats for api-gateway", "how many stars and forks does docs have", "how popular is my-project"]
+)
+def get_repository_stats(client, args):
+    return client.get_repo_stats(args.repo_name)
+
+@registry.tool(
+    "get_bulk_repository_stats",
+    "Get statistics for many repositories at once (all of the user's repositories by default); "
+    "prefer it over several get_repository_stats steps",
+    BulkRepoStatsArgs,
+    read_only=True,
+    examples=["show stats for all my repositories", "compare stars of repo-a, repo-b and repo-c"]
+)
+def get_bulk_repository_stats(client, args):
+    return client.get_bulk_repo_stats(repo_names=args.repo_names, limit=args.limit)
+
+@registry.tool(
+    "create_pull_request", "Create a pull request in a repository", CreatePullRequestArgs, concurrency=4,
+    examples=["open a pr in docs from fix-typo into main titled 'Fix typo'", "merge request from feature to main"]
+)
+def create_pull_request(client, args):
+    repo = client.get_repo_object(args.repo_name)
+    if not repo:
+        return {"success": False, "error": f"Repository '{args.repo_name}' not found"}
+    return client.create_pull_request(repo=repo, title=args.title, head=args.head, base=args.base, body=args.body)
+
+@registry.tool(
+    "commit_files_and_open_pr",
+    "Commit many file additions, updates and deletions to a new branch as a single commit and open a pull request; "
+    "prefer it over create_branch followed by create_pull_request when there are file changes",
+    CommitFilesArgs,
+    concurrency=1,
+    local_paths=("directory",),
+    examples=[
+        "commit the files in ./site to docs on branch update-site and open a pr",
+        "add README.md and LICENSE to my-project in a pull request",
+    ]
+)
+def commit_files_and_open_pr(client, args):
+    files = [file.model_dump() for file in args.files] if args.files else None
+    return client.commit_files_and_open_pr(
+        repo_name=args.repo_name, branch=args.branch, title=args.title, files=files, directory=args.directory,
+        base=args.base, message=args.message, body=args.body, concurrency=args.concurrency
+    )
+
+@registry.tool(
+    "resync_mirror", "Re-sync the local mirror of repositories and issues from GitHub now", ResyncMirrorArgs,
+    examples=["refresh the local mirror", "resync my repositories"]
+)
+def resync_mirror(client, args):
+    return client.resync_mirror(repo_name=args.repo_name, full=args.full)
+
+@registry.tool(
+    "get_rate_limit_status", "Show the remaining GitHub API budget and queued requests",
+    examples=["how much rate limit do I have left", "check my api quota"]
+)
+def get_rate_limit_status(client, args):
+    return client.rate_limit_status()
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import shutil
+import sys
+import os
+import tempfile
+import uuid
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import configure_logging
+from src.mcp_server import GitHubMCPServer, call_arguments, caller_token, request_params
+from src.metrics import metrics
+from src.tools import InvalidArguments
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+def _error(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+def _is_stream(message):
+    return isinstance(message, dict) and message.get("method") == "tools/stream" and "id" in message
+
+def _bearer_token(authorization):
+    """Token of an "Authorization: Bearer <token>" (or GitHub-style "token <token>") header"""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() not in ("bearer", "token"):
+        return None
+    return token.strip() or None
+
+class MCPTransportServer:
+    """Long-lived MCP endpoint serving one shared GitHubMCPServer over stdio or streamable HTTP.
+
+    Every connection shares the same GitHubClient, so the GitHub login and
+    caches are paid for once; with MCP_MULTI_TENANT each HTTP request brings
+    its caller's token (Authorization: Bearer) and runs on that token's client
+    from a shared pool. Requests are handled concurrently, JSON-RPC batches
+    are supported and notifications/cancelled stops a pending request.
+
+    The non-standard tools/stream method takes the params of a tools/call of
+    list_repositories or list_issues and answers with a
+    notifications/tools/stream message per item as pages arrive from GitHub,
+    then a response with the item count. It needs stdio or an SSE response.
+    """
+
+    def __init__(self, mcp_server=None):
+        # Only the MCP transports serve other users; the interactive CLI is always single-tenant
+        multi_tenant = os.getenv("MCP_MULTI_TENANT", "false").lower() == "true"
+        self.mcp_server = mcp_server or GitHubMCPServer(multi_tenant=multi_tenant)
+        self._in_flight = {}
+
+    async def dispatch(self, message, session="stdio", credential=None):
+        """Handle a JSON-RPC message or batch and return the response(s), or None if there is nothing to send"""
+        if isinstance(message, list):
+            if not message:
+                return _error(None, INVALID_REQUEST, "Empty batch")
+            responses = await asyncio.gather(*(self._dispatch_one(item, session, credential) for item in message))
+            return [response for response in responses if response is not None] or None
+        return await self._dispatch_one(message, session, credential)
+
+    async def _dispatch_one(self, message, session, credential=None):
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            request_id = message.get("id") if isinstance(message, dict) else None
+            return _error(request_id, INVALID_REQUEST, "Invalid Request")
+
+        if message["method"] == "notifications/cancelled":
+            params = message.get("params")
+            task = self._in_flight.get((session, params.get("requestId"))) if isinstance(params, dict) else None
+            if task:
+                task.cancel()
+            return None
+        if "id" not in message:
+            # Other notifications (e.g. notifications/initialized) need no reply
+            return None
+
+        key = (session, message["id"])
+        task = asyncio.ensure_future(self.mcp_server.handle_mcp_request(message, credential))
+        self._in_flight[key] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                task.cancel()
+                raise
+            # Cancelled by the client: MCP expects no response. A GitHub call
+            # already running on the worker pool finishes in the background.
+            return None
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def stream(self, message, credential=None):
+        """The messages answering a tools/stream request, ending with its response"""
+        count = 0
+        try:
+            params = request_params(message)
+            token = caller_token(params, credential)
+            async for item in self.mcp_server.stream_tool(params.get("name"), call_arguments(params), token=token):
+                count += 1
+                yield {"jsonrpc": "2.0", "method": "notifications/tools/stream", "params": {"requestId": message["id"], "item": item}}
+        except InvalidArguments as e:
+            yield _error(message["id"], INVALID_PARAMS, str(e))
+            return
+        except Exception as e:
+            yield _error(message["id"], INTERNAL_ERROR, f"Internal error: {e}")
+            return
+        yield {"jsonrpc": "2.0", "id": message["id"], "result": {"success": True, "count": count}}
+
+    async def serve_stdio(self, protocol_out=None):
+        """Read newline-delimited JSON-RPC from stdin and write responses to stdout as they complete"""
+        protocol_out = protocol_out or sys.__stdout__.buffer
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=16 * 1024 * 1024)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        def write(response):
+            protocol_out.write(self.mcp_server.encoder.encode_message(response) + b"\n")
+            protocol_out.flush()
+
+        async def handle(line):
+            try:
+                message = json.loads(line)
+            except ValueError:
+                response = _error(None, PARSE_ERROR, "Parse error")
+            else:
+                if _is_stream(message):
+                    async for response in self.stream(message):
+                        write(response)
+                    return
+                response = await self.dispatch(message)
+            if response is not None:
+                write(response)
+
+        pending = set()
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            task = asyncio.ensure_future(handle(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def http_app(self, path="/mcp"):
+        """Starlette app implementing the streamable HTTP transport on `path`"""
+        from starlette.applications import Starlette
+        from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+        from starlette.routing import Route
+
+        async def endpoint(request):
+            if request.method == "GET":
+                # No server-initiated messages, so there is no standalone SSE stream
+                return Response(status_code=405, headers={"Allow": "POST, DELETE"})
+            session = request.headers.get("mcp-session-id") or str(uuid.uuid4())
+            headers = {"Mcp-Session-Id": session}
+            credential = _bearer_token(request.headers.get("authorization"))
+            if request.method == "DELETE":
+                return Response(status_code=200, headers=headers)
+
+            try:
+                message = json.loads(await request.body())
+            except ValueError:
+                return JSONResponse(_error(None, PARSE_ERROR, "Parse error"), status_code=400)
+
+            accept = request.headers.get("accept", "")
+            if "text/event-stream" in accept and "application/json" not in accept:
+                # SSE: send each response of a batch as soon as it is ready
+                async def events():
+                    if _is_stream(message):
+                        async for response in self.stream(message, credential):
+                            yield f"event: message\ndata: {self.mcp_server.encoder.encode_message(response).decode()}\n\n"
+                        return
+                    items = message if isinstance(message, list) else [message]
+                    for next_response in asyncio.as_completed([self._dispatch_one(m, session, credential) for m in items]):
+                        response = await next_response
+                        if response is not None:
+                            yield f"event: message\ndata: {self.mcp_server.encoder.encode_message(response).decode()}\n\n"
+                return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+            response = await self.dispatch(message, session, credential)
+            if response is None:
+                return Response(status_code=202, headers=headers)
+            return Response(self.mcp_server.encoder.encode_message(response), media_type="application/json", headers=headers)
+
+        async def metrics_endpoint(request):
+            # Prometheus scrape target; server-wide numbers, so only for the operator when gated
+            if not self.mcp_server.can_read_metrics(_bearer_token(request.headers.get("authorization"))):
+                return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+            return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+        return Starlette(routes=[
+            Route(path, endpoint, methods=["GET", "POST", "DELETE"]),
+            Route("/metrics", metrics_endpoint, methods=["GET"]),
+        ])
+
+    async def serve_http(self, host="127.0.0.1", port=8000):
+        import uvicorn
+        config = uvicorn.Config(self.http_app(), host=host, port=port, log_level="warning")
+        print(f"🌐 MCP server listening on http://{host}:{port}/mcp")
+        await uvicorn.Server(config).serve()
+
+def worker_app():
+    """App factory run in every worker process of serve_workers"""
+    configure_logging()
+    return MCPTransportServer().http_app()
+
+def serve_workers(host="127.0.0.1", port=8000, workers=2):
+    """Serve HTTP from `workers` processes accepting on one socket.
+
+    Each worker has its own GitHubMCPServer, so JSON encoding, validation and
+    result shaping run in parallel. They share one GitHub rate budget per
+    token (GITHUB_RATE_STATE_PATH, a temporary SQLite file unless set) and,
+    unless GITHUB_HTTP_CACHE says otherwise, the disk HTTP cache, so a
+    response one worker fetched is revalidated (a free 304) by the others.
+    """
+    import uvicorn
+    state_dir = None
+    if not os.getenv("GITHUB_RATE_STATE_PATH"):
+        state_dir = tempfile.mkdtemp(prefix="github-mcp-")
+        os.environ["GITHUB_RATE_STATE_PATH"] = os.path.join(state_dir, "rate-state.sqlite")
+    os.environ.setdefault("GITHUB_HTTP_CACHE", "disk")
+    print(f"🌐 MCP server listening on http://{host}:{port}/mcp with {workers} workers")
+    try:
+        uvicorn.run("src.transport:worker_app", factory=True, host=host, port=port, workers=workers, log_level="warning")
+    finally:
+        if state_dir:
+            shutil.rmtree(state_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the GitHub MCP tools over stdio or streamable HTTP")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("MCP_WORKERS", "1")),
+        help="HTTP worker processes sharing one GitHub rate budget (default: MCP_WORKERS or 1)"
+    )
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.transport == "stdio":
+        # stdout carries the protocol; progress prints go to stderr
+        sys.stdout = sys.stderr
+        server = MCPTransportServer()
+        asyncio.run(server.serve_stdio())
+    elif args.workers > 1:
+        serve_workers(args.host, args.port, args.workers)
+    else:
+        server = MCPTransportServer()
+        asyncio.run(server.serve_http(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from src.intent_matcher import IntentMatcher
+
+matcher = IntentMatcher()
+
+
+def test_repo_names_are_matched():
+    assert matcher.match("show stats for api-gateway") == {
+        "action": "get_repository_stats", "parameters": {"repo_name": "api-gateway"}
+    }
+    assert matcher.match("list issues in the repo docs")["parameters"] == {"repo_name": "docs"}
+    # Names that merely start with a pronoun are still names
+    assert matcher.match("show stats for it-tools")["parameters"] == {"repo_name": "it-tools"}
+    assert matcher.match("show stats for project.site")["parameters"] == {"repo_name": "project.site"}
+
+
+def test_pronouns_and_generic_nouns_fall_through():
+    for text in (
+        "show stats for it",
+        "show stats for the repo",
+        "show me info about the repository",
+        "list issues in that",
+        "list issues in this",
+        "list issues in there",
+        "show stats for the project",
+        "show stats for that repo",
+        "create an issue in it titled 'Bug'",
+    ):
+        assert matcher.match(text) is None, text
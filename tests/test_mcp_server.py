@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from src.mcp_server import GitHubMCPServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    return GitHubMCPServer(max_workers=1)
+
+
+def handle(server, request):
+    return asyncio.run(server.handle_mcp_request({"jsonrpc": "2.0", "id": 1, **request}))
+
+
+def test_params_must_be_an_object(server):
+    for params in (None, [], ["list_repositories"], "x"):
+        response = handle(server, {"method": "tools/call", "params": params})
+        assert response["error"]["code"] == -32602
+
+
+def test_arguments_and_meta_must_be_objects(server):
+    for params in (
+        {"name": "list_repositories", "arguments": None},
+        {"name": "list_repositories", "arguments": [1, 2]},
+        {"name": "list_repositories", "arguments": {}, "_meta": "token"},
+    ):
+        assert handle(server, {"method": "tools/call", "params": params})["error"]["code"] == -32602
+
+
+def test_missing_params_is_fine(server):
+    assert handle(server, {"method": "ping"})["result"] == {}
+    assert "tools" in handle(server, {"method": "tools/list"})["result"]
@@ -0,0 +1,58 @@
+import email.utils
+import time
+
+import pytest
+
+from src.rate_limiter import BULK, INTERACTIVE, RateLimitExhausted, RateLimitScheduler, _retry_after_seconds
+
+
+def scheduler(remaining, resets_in, burst=2):
+    s = RateLimitScheduler(rate=10, burst=burst, reserve=50, max_wait=5)
+    s.budgets["core"] = {"remaining": remaining, "limit": 5000, "reset": int(time.time() + resets_in)}
+    return s
+
+
+def test_interactive_spends_the_reserve():
+    s = scheduler(remaining=40, resets_in=1800)
+    for _ in range(2):
+        assert s.acquire("core", INTERACTIVE) < 1
+    # The bucket is empty now: 40 requests over 1800 s is one every 45 s, more than max_wait
+    with pytest.raises(RateLimitExhausted, match=r"resets in 18\d\d s"):
+        s.acquire("core", INTERACTIVE)
+
+
+def test_interactive_is_not_throttled_to_the_floor_rate():
+    s = scheduler(remaining=40, resets_in=10, burst=1)
+    s.acquire("core", INTERACTIVE)
+    # 40 requests left for 10 s: the next one is due in about 0.25 s, not 100 s
+    assert s._wait_time("core", INTERACTIVE) < 1
+
+
+def test_bulk_stops_at_the_reserve():
+    s = scheduler(remaining=40, resets_in=1800)
+    with pytest.raises(RateLimitExhausted, match=r"resets in 18\d\d s"):
+        s.acquire("core", BULK)
+
+
+def test_bulk_waits_for_a_close_reset():
+    s = scheduler(remaining=40, resets_in=1)
+    assert 0 < s.acquire("core", BULK) < 2
+
+
+def test_interactive_waits_for_reset_when_nothing_is_left():
+    s = scheduler(remaining=0, resets_in=1800)
+    with pytest.raises(RateLimitExhausted, match=r"resets in 18\d\d s"):
+        s.acquire("core", INTERACTIVE)
+
+
+def test_plenty_of_budget_is_not_paced_by_priority():
+    s = scheduler(remaining=4000, resets_in=1800)
+    assert s.acquire("core", BULK) < 1
+    assert s.acquire("core", INTERACTIVE) < 1
+
+
+def test_retry_after_forms():
+    assert _retry_after_seconds("3") == 3.0
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= _retry_after_seconds(date) <= 30
+    assert _retry_after_seconds("soon") == 60.0
@@ -0,0 +1,55 @@
+from src.session import ConversationSession
+
+
+def session(repo="api-gateway", branch=None):
+    s = ConversationSession()
+    s.repo = repo
+    s.branch = branch
+    return s
+
+
+def test_there_after_object_is_the_repo():
+    assert session().resolve("create an issue there titled 'Bug'") == ("create an issue in api-gateway titled 'Bug'", False)
+
+
+def test_there_after_preposition_keeps_it():
+    assert session().resolve("list issues in there") == ("list issues in api-gateway", False)
+
+
+def test_existential_there_is_left_alone():
+    for text in (
+        "are there any open issues in docs?",
+        "is there a branch called main in docs?",
+        "there are no issues in docs, right?",
+        "were there any pull requests in docs?",
+        "there's a bug in docs",
+    ):
+        assert session().resolve(text) == (text, False)
+
+
+def test_that_repo_and_trailing_it():
+    assert session().resolve("create a branch called fix in that repo") == ("create a branch called fix in api-gateway", False)
+    assert session().resolve("show stats for it") == ("show stats for api-gateway", False)
+
+
+def test_branch_references():
+    s = session(branch="fix-login")
+    text, unresolved = s.resolve("open a pr in that repo from that branch into main titled 'Fix'")
+    assert text == "open a pr in api-gateway from fix-login into main titled 'Fix'"
+    assert not unresolved
+
+
+def test_quoted_text_is_not_rewritten():
+    text, _ = session().resolve("create an issue there titled 'Put it there'")
+    assert text == "create an issue in api-gateway titled 'Put it there'"
+
+
+def test_unresolved_references_need_context():
+    assert session().resolve("how many stars does the repo of that pr have?")[1]
+    # Nothing remembered: there is no context to send, so nothing counts as unresolved
+    assert ConversationSession().resolve("create an issue there") == ("create an issue there", False)
+
+
+def test_from_there_into_is_the_branch():
+    text, _ = session(branch="fix-login").resolve("open a pr in that repo from there into main")
+    assert text == "open a pr in api-gateway from fix-login into main"